@@ -1,14 +1,221 @@
+import fs from 'fs';
+import path from 'path';
 import sqlite3 from 'sqlite3';
 import { open } from 'sqlite';
 
+// Filtreli, sıralı ve keyset sayfalı sorgular oyuncekme/game_queries.py ile aynı
+// parametreleri ve imleç biçimini kullanır. Parametresiz istekler eskisi gibi tüm listeyi döndürür.
+const SELECT_COLUMNS = [
+  'oyun_adi', 'steam_fiyati', 'epic_fiyati', 'metascore', 'steam_url', 'epic_url',
+  'steam_fiyati_tutar', 'epic_fiyati_tutar',
+];
+const SORT_COLUMNS = {
+  name: 'oyun_adi',
+  metascore: 'metascore',
+  steam_price: 'steam_fiyati_tutar',
+  epic_price: 'epic_fiyati_tutar',
+};
+const PLATFORM_COLUMNS = { steam: 'steam_fiyati_tutar', epic: 'epic_fiyati_tutar' };
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 100;
+
+const encodeCursor = (phase, value, name) =>
+  Buffer.from(JSON.stringify([phase, value, name]), 'utf8').toString('base64url');
+
+const decodeCursor = (cursor) => {
+  const [phase, value, name] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+  if (phase !== 'value' && phase !== 'null') throw new RangeError(`Geçersiz imleç: ${cursor}`);
+  return [phase, value, name];
+};
+
+// Kullanıcı aramasını her kelimeyi önek olarak arayan güvenli bir FTS5 ifadesine çevirir
+const ftsQuery = (text) => (text.match(/[\p{L}\p{N}_]+/gu) || []).map((word) => `"${word}"*`).join(' ');
+
+// Parametresiz istek (tüm katalog) oyuncekme/catalog_snapshots.py'nin ürettiği hazır dosyadan,
+// istemcinin kabul ettiği önceden sıkıştırılmış sürümle ve veritabanı açılmadan yanıtlanır.
+// Dosyalar yalnızca manifest değiştiğinde yeniden okunur; manifest yoksa eskisi gibi tablo okunur.
+const catalogDir = path.join(process.cwd(), 'public', 'catalog');
+const catalogManifestPath = path.join(catalogDir, 'manifest.json');
+const SNAPSHOT_ENCODINGS = [['br', '.br'], ['gzip', '.gz']];
+let snapshot = { key: null, body: null };
+
+const readSnapshot = () => {
+  if (!fs.existsSync(catalogManifestPath)) return null;
+  const key = fs.statSync(catalogManifestPath).mtimeMs;
+  if (snapshot.key !== key) {
+    const manifest = JSON.parse(fs.readFileSync(catalogManifestPath, 'utf8'));
+    const file = path.join(catalogDir, manifest.catalog.path);
+    const bodies = { identity: fs.readFileSync(file) };
+    for (const [encoding, extension] of SNAPSHOT_ENCODINGS) {
+      if (fs.existsSync(file + extension)) bodies[encoding] = fs.readFileSync(file + extension);
+    }
+    snapshot = { key, body: { etag: `"${manifest.catalog.hash}"`, bodies } };
+  }
+  return snapshot.body;
+};
+
+// Accept-Encoding'de kabul edilen (q=0 olmayan) ve dosyası bulunan ilk sıkıştırma; yoksa sıkıştırmasız
+const pickEncoding = (header, bodies) => {
+  const accepted = new Set(
+    (header || '').split(',')
+      .map((part) => part.trim().split(';'))
+      .filter(([, q]) => !q || parseFloat(q.split('=')[1]) > 0)
+      .map(([name]) => name.trim().toLowerCase())
+  );
+  const found = SNAPSHOT_ENCODINGS.find(([encoding]) => bodies[encoding] && (accepted.has(encoding) || accepted.has('*')));
+  return found ? found[0] : 'identity';
+};
+
+const sendSnapshot = (req, res, { etag, bodies }) => {
+  res.setHeader('ETag', etag);
+  res.setHeader('Vary', 'Accept-Encoding');
+  if (req.headers['if-none-match'] === etag) {
+    res.status(304).end();
+    return;
+  }
+  const encoding = pickEncoding(req.headers['accept-encoding'], bodies);
+  res.setHeader('Content-Type', 'application/json; charset=utf-8');
+  // Sıkıştırılmış yanıt Next.js tarafından yeniden sıkıştırılmaz
+  if (encoding !== 'identity') res.setHeader('Content-Encoding', encoding);
+  res.status(200).send(bodies[encoding]);
+};
+
+const toApiGame = (row) => ({
+  'Game Name': row.oyun_adi,
+  'Steam Price': row.steam_fiyati,
+  'Epic Price': row.epic_fiyati,
+  'Metascore': row.metascore,
+  'Steam URL': row.steam_url,
+  'Epic URL': row.epic_url,
+  'Steam Price Amount': row.steam_fiyati_tutar,
+  'Epic Price Amount': row.epic_fiyati_tutar,
+});
+
+const buildFilters = ({ search, platform, minMetascore, maxPrice }) => {
+  const conditions = [];
+  const params = [];
+  const match = search ? ftsQuery(search) : '';
+  if (match) {
+    conditions.push('rowid IN (SELECT rowid FROM games_fts WHERE games_fts MATCH ?)');
+    params.push(match);
+  }
+  const priceColumn = PLATFORM_COLUMNS[platform];
+  if (priceColumn) conditions.push(`${priceColumn} IS NOT NULL`);
+  if (minMetascore !== undefined) {
+    conditions.push('metascore >= ?');
+    params.push(minMetascore);
+  }
+  if (maxPrice !== undefined) {
+    // Steam USD, Epic TRY listeler; fiyat sınırı yalnızca seçilen platformun tutarına uygulanır
+    if (!priceColumn) throw new RangeError('Fiyat sınırı için platform (steam veya epic) seçilmeli; para birimleri farklı.');
+    conditions.push(`${priceColumn} <= ?`);
+    params.push(maxPrice);
+  }
+  return [conditions, params];
+};
+
+const fetchRows = (db, conditions, params, orderBy, limit) => {
+  const where = conditions.length ? `WHERE ${conditions.join(' AND ')}` : '';
+  return db.all(
+    `SELECT ${SELECT_COLUMNS.join(', ')} FROM games ${where} ORDER BY ${orderBy} LIMIT ?`,
+    [...params, limit]
+  );
+};
+
+const queryGames = async (db, query) => {
+  const sort = query.sort || 'metascore';
+  const order = query.order || 'desc';
+  const sortColumn = SORT_COLUMNS[sort];
+  if (!sortColumn) throw new RangeError(`Geçersiz sıralama: ${sort}`);
+  if (order !== 'asc' && order !== 'desc') throw new RangeError(`Geçersiz sıralama yönü: ${order}`);
+  const limit = Math.max(1, Math.min(parseInt(query.limit, 10) || DEFAULT_LIMIT, MAX_LIMIT));
+  const direction = order.toUpperCase();
+  const comparison = order === 'desc' ? '<' : '>';
+  let [phase, lastValue, lastName] = query.cursor ? decodeCursor(query.cursor) : ['value', null, null];
+
+  const [conditions, params] = buildFilters({
+    search: query.q,
+    platform: query.platform,
+    minMetascore: query.minMetascore !== undefined ? Number(query.minMetascore) : undefined,
+    maxPrice: query.maxPrice !== undefined ? Number(query.maxPrice) : undefined,
+  });
+  let items = [];
+
+  if (phase === 'value') {
+    const valueConditions = [...conditions];
+    const valueParams = [...params];
+    if (sortColumn !== 'oyun_adi') valueConditions.push(`${sortColumn} IS NOT NULL`);
+    if (lastName !== null) {
+      if (sortColumn === 'oyun_adi') {
+        valueConditions.push(`oyun_adi ${comparison} ?`);
+        valueParams.push(lastName);
+      } else {
+        valueConditions.push(`(${sortColumn}, oyun_adi) ${comparison} (?, ?)`);
+        valueParams.push(lastValue, lastName);
+      }
+    }
+    const orderBy = sortColumn === 'oyun_adi' ? 'oyun_adi' : `${sortColumn} ${direction}, oyun_adi`;
+    items = await fetchRows(db, valueConditions, valueParams, `${orderBy} ${direction}`, limit + 1);
+    // Bir sonraki aşamada NULL değerliler baştan okunur
+    lastName = null;
+  }
+
+  if (items.length <= limit && sortColumn !== 'oyun_adi') {
+    const nullConditions = [...conditions, `${sortColumn} IS NULL`];
+    const nullParams = [...params];
+    if (lastName !== null) {
+      nullConditions.push(`oyun_adi ${comparison} ?`);
+      nullParams.push(lastName);
+    }
+    items = items.concat(
+      await fetchRows(db, nullConditions, nullParams, `oyun_adi ${direction}`, limit + 1 - items.length)
+    );
+  }
+
+  let nextCursor = null;
+  if (items.length > limit) {
+    items = items.slice(0, limit);
+    const last = items[items.length - 1];
+    const lastSortValue = last[sortColumn];
+    nextCursor = encodeCursor(lastSortValue === null ? 'null' : 'value', lastSortValue, last.oyun_adi);
+  }
+  return { items: items.map(toApiGame), next_cursor: nextCursor };
+};
+
 export default async function handler(req, res) {
+  if (Object.keys(req.query).length === 0) {
+    try {
+      const catalog = readSnapshot();
+      if (catalog) {
+        sendSnapshot(req, res, catalog);
+        return;
+      }
+    } catch (error) {
+      // Bozuk veya yarım kopyalanmış dosyalar: veritabanından yanıtlanır
+      console.error(error);
+    }
+  }
+
   const db = await open({
     filename: './game_data.db', // Veritabanı dosyası
     driver: sqlite3.Database,
   });
 
-  const games = await db.all('SELECT oyun_adi AS "Game Name", steam_fiyati AS "Steam Price", epic_fiyati AS "Epic Price", metascore AS "Metascore", steam_url AS "Steam URL", epic_url AS "Epic URL" FROM games');
-  await db.close();
-
-  res.status(200).json(games); // Veriyi JSON olarak döndür
+  try {
+    if (Object.keys(req.query).length === 0) {
+      const games = await db.all('SELECT oyun_adi AS "Game Name", steam_fiyati AS "Steam Price", epic_fiyati AS "Epic Price", metascore AS "Metascore", steam_url AS "Steam URL", epic_url AS "Epic URL" FROM games');
+      res.status(200).json(games); // Veriyi JSON olarak döndür
+      return;
+    }
+    res.status(200).json(await queryGames(db, req.query));
+  } catch (error) {
+    if (error instanceof RangeError || error instanceof SyntaxError) {
+      res.status(400).json({ error: error.message });
+      return;
+    }
+    console.error(error);
+    res.status(500).json({ error: 'Oyunlar yüklenemedi' });
+  } finally {
+    await db.close();
+  }
 }
@@ -3,12 +3,46 @@
 import fs from 'fs';
 import path from 'path';
 
+// Görseller oyuncekme/image_store.py ile içerik özetine göre saklanır; manifest.json
+// görünen dosya adını ("Halo 3.jpg") depodaki nesne yoluna ve thumbnails.py'nin ürettiği
+// WebP sürümlerine eşler.
+const imagesDir = path.join(process.cwd(), 'public', 'gorseller');
+const manifestPath = path.join(imagesDir, 'manifest.json');
+const IMAGE_PATTERN = /\.(jpg|jpeg|png|gif|svg)$/i;
+
+// Liste yalnızca manifest (ya da manifest yoksa klasör) değiştiğinde yeniden okunur
+let cache = { key: null, body: null };
+
+const readImages = () => {
+  if (fs.existsSync(manifestPath)) {
+    const key = `manifest:${fs.statSync(manifestPath).mtimeMs}`;
+    if (cache.key !== key) {
+      const manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+      const paths = {};
+      const variants = {};
+      for (const [name, entry] of Object.entries(manifest.images)) {
+        if (!IMAGE_PATTERN.test(name)) continue;
+        paths[name] = entry.path;
+        const webp = (entry.variants || []).filter((variant) => variant.format === 'webp');
+        if (webp.length) variants[name] = webp.map(({ path: variantPath, width }) => ({ path: variantPath, width }));
+      }
+      cache = { key, body: { images: Object.keys(paths), paths, variants } };
+    }
+    return cache.body;
+  }
+
+  // Depoya taşınmamış eski klasörler: dosya adı aynı zamanda yoldur
+  const key = `dir:${fs.statSync(imagesDir).mtimeMs}`;
+  if (cache.key !== key) {
+    const images = fs.readdirSync(imagesDir).filter((file) => IMAGE_PATTERN.test(file));
+    cache = { key, body: { images, paths: Object.fromEntries(images.map((file) => [file, file])), variants: {} } };
+  }
+  return cache.body;
+};
+
 export default function handler(req, res) {
   try {
-    const imagesDir = path.join(process.cwd(), 'public', 'gorseller');
-    const files = fs.readdirSync(imagesDir);
-    const imageFiles = files.filter(file => /\.(jpg|jpeg|png|gif|svg)$/i.test(file));
-    res.status(200).json({ images: imageFiles });
+    res.status(200).json(readImages());
   } catch (error) {
     console.error(error);
     res.status(500).json({ error: 'Görseller yüklenemedi' });
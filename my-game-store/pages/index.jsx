@@ -6,6 +6,9 @@ import { motion } from "framer-motion";
 import { FaArrowLeft, FaArrowRight } from "react-icons/fa";
 import { getPlatformLogo } from "../utils/imageUtils";
 
+// Tablodaki kapaklar w-16 (64px) gösterilir
+const THUMBNAIL_SIZES = "64px";
+
 const HomePage = () => {
   const [games, setGames] = useState([]);
   const [searchQuery, setSearchQuery] = useState("");
@@ -23,10 +26,12 @@ const HomePage = () => {
   const [imagesLoaded, setImagesLoaded] = useState(0);
   const [imagesTotal, setImagesTotal] = useState(0);
 
-  // Orijinal görsel isimlerini sakladığımız dictionary
+  // Görsel yollarını sakladığımız dictionary
   // Key: görsel isminin küçük harfle yazılmış versiyonu
-  // Value: görselin orijinal adı (büyük/küçük harfli olabilir)
+  // Value: görselin /gorseller altındaki yolu
   const [imageDict, setImageDict] = useState({});
+  // Aynı key için WebP küçük resimlerden oluşan srcSet (varsa)
+  const [imageSrcSets, setImageSrcSets] = useState({});
 
   // Oyunları API'den çekmek için fonksiyon
   const fetchGames = async () => {
@@ -62,21 +67,35 @@ const HomePage = () => {
       //    "halo.jpg" -> "Halo.JPG"
       //    "elden ring.jpg" -> "Elden Ring.JPG"
       const tempDict = {};
+      const tempSrcSets = {};
+      //    Değer, içerik adresli depodaki nesne yoludur (manifest yoksa dosya adının kendisi)
       data.images.forEach((originalName) => {
         const lowerKey = originalName.toLowerCase(); 
-        tempDict[lowerKey] = originalName; // Key=küçük harfli, Value=orijinal ad
+        tempDict[lowerKey] = data.paths[originalName]; // Key=küçük harfli, Value=görsel yolu
+        if (data.variants[originalName]) {
+          tempSrcSets[lowerKey] = data.variants[originalName]
+            .map((variant) => `/gorseller/${variant.path} ${variant.width}w`)
+            .join(", ");
+        }
       });
       setImageDict(tempDict);
+      setImageSrcSets(tempSrcSets);
 
       // 2) Preload işlemi
       data.images.forEach((originalName) => {
         const img = new Image();
-        img.src = `/gorseller/${originalName}`;
+        // Tarayıcı tablodaki <img> ile aynı adayı seçsin diye srcset/sizes de verilir
+        const srcSet = tempSrcSets[originalName.toLowerCase()];
+        if (srcSet) {
+          img.sizes = THUMBNAIL_SIZES;
+          img.srcset = srcSet;
+        }
+        img.src = `/gorseller/${data.paths[originalName]}`;
         img.onload = () => {
           setImagesLoaded((prev) => prev + 1);
         };
         img.onerror = () => {
-          console.error(`Görsel yüklenemedi: /gorseller/${originalName}`);
+          console.error(`Görsel yüklenemedi: /gorseller/${data.paths[originalName]}`);
           setImagesLoaded((prev) => prev + 1);
         };
       });
@@ -343,6 +362,7 @@ const HomePage = () => {
                         const sanitizedName = sanitizeGameName(game["Game Name"]);
                         const lowerImgKey = `${sanitizedName}.jpg`.toLowerCase();
                         const originalImageName = imageDict[lowerImgKey]; 
+                        const imageSrcSet = imageSrcSets[lowerImgKey];
                         // Bu noktada originalImageName kesinlikle var
                         // çünkü filter'da olmayanları zaten eledik.
 
@@ -363,6 +383,8 @@ const HomePage = () => {
                             <td className="py-4 px-6 flex items-center space-x-4">
                               <img
                                 src={`/gorseller/${originalImageName}`}
+                                srcSet={imageSrcSet}
+                                sizes={imageSrcSet ? THUMBNAIL_SIZES : undefined}
                                 alt={game["Game Name"]}
                                 className="w-16 h-16 object-cover rounded-lg"
                               />
@@ -0,0 +1,148 @@
+import argparse
+import random
+import string
+import time
+
+from match_cache import cached_fuzzy_match, open_match_cache
+from matcher import build_match_index, find_best_match, find_best_match_bruteforce
+
+# Sentetik katalog üretimi için sabitler
+VOCABULARY_SIZE = 20000
+COMMON_WORDS = ["the", "of", "2", "3", "edition", "deluxe", "simulator", "remastered", ":", "-"]
+EDITION_SUFFIXES = ["deluxe edition", "goty edition", "remastered", "definitive edition"]
+
+
+def build_vocabulary(rng):
+    """
+    Rastgele kelimelerden oluşan bir sözlük üretir; sık kelimeler başa eklenir.
+    """
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))))
+    return COMMON_WORDS + sorted(words)
+
+
+def random_title(rng, vocabulary):
+    """
+    1-5 kelimelik bir oyun adı üretir; kelimelerin bir kısmı sık kelimelerden seçilir.
+    """
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 5))]
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(COMMON_WORDS))
+    return " ".join(words)
+
+
+def mutate_title(rng, title):
+    """
+    Başka bir mağazadaki yazımı taklit eder: yazım hatası, sürüm eki veya kelime düşürme.
+    """
+    roll = rng.random()
+    if roll < 0.3:
+        return title
+    if roll < 0.55:
+        pos = rng.randrange(len(title))
+        return title[:pos] + rng.choice(string.ascii_lowercase) + title[pos + 1:]
+    if roll < 0.8:
+        return f"{title} {rng.choice(EDITION_SUFFIXES)}"
+    words = title.split()
+    rare_positions = [pos for pos, word in enumerate(words) if word not in COMMON_WORDS]
+    if len(rare_positions) > 1:
+        words.pop(rng.choice(rare_positions))
+    return " ".join(words)
+
+
+def generate_catalogs(size, seed):
+    """
+    Yarısı birbirinin türevi olan iki sentetik katalog (hedef, aday) üretir.
+    """
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(rng)
+    shared = [random_title(rng, vocabulary) for _ in range(size // 2)]
+    targets = shared + [random_title(rng, vocabulary) for _ in range(size - len(shared))]
+    candidates = [mutate_title(rng, title) for title in shared]
+    candidates += [random_title(rng, vocabulary) for _ in range(size - len(candidates))]
+    rng.shuffle(targets)
+    rng.shuffle(candidates)
+    return targets, candidates
+
+
+def apply_churn(rng, vocabulary, names, rate):
+    """
+    Günlük değişimi taklit eder: isimlerin rate kadarını silip yerine yenilerini ekler.
+    """
+    names = list(names)
+    for _ in range(int(len(names) * rate)):
+        names.pop(rng.randrange(len(names)))
+        names.insert(rng.randrange(len(names) + 1), random_title(rng, vocabulary))
+    return names
+
+
+def run_incremental(args):
+    """
+    Eşleşme önbelleğinin soğuk ve ılık (churn sonrası) çalıştırma sürelerini karşılaştırır.
+    """
+    targets, candidates = generate_catalogs(args.size, args.seed)
+    rng = random.Random(args.seed + 1)
+    vocabulary = build_vocabulary(random.Random(args.seed))
+    conn = open_match_cache(":memory:")
+
+    start = time.perf_counter()
+    cached_fuzzy_match(conn, "benchmark", targets, candidates, args.threshold, "benchmark")
+    cold_time = time.perf_counter() - start
+
+    targets = apply_churn(rng, vocabulary, targets, args.churn)
+    candidates = apply_churn(rng, vocabulary, candidates, args.churn)
+    start = time.perf_counter()
+    warm_results = cached_fuzzy_match(conn, "benchmark", targets, candidates, args.threshold, "benchmark")
+    warm_time = time.perf_counter() - start
+
+    index = build_match_index(candidates, threshold=args.threshold)
+    mismatches = sum(find_best_match(name, index) != warm_results[name] for name in targets)
+    print(f"[INFO] Soğuk çalıştırma: {cold_time:.2f} s")
+    print(f"[INFO] %{args.churn * 100:g} değişim sonrası: {warm_time:.2f} s ({cold_time / warm_time:.1f}x)")
+    print(f"[INFO] Tam eşleştirmeden farklı sonuç: {mismatches}/{len(targets)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulanık eşleştirme motoru benchmark'ı")
+    parser.add_argument("--size", type=int, default=100_000, help="Her katalogdaki oyun sayısı")
+    parser.add_argument("--sample", type=int, default=200, help="Tam tarama ile ölçülecek hedef sayısı")
+    parser.add_argument("--threshold", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--churn", type=float, default=None,
+                        help="Verilirse önbellekli artımlı eşleştirmeyi bu değişim oranıyla ölçer (örn. 0.02)")
+    args = parser.parse_args()
+
+    if args.churn is not None:
+        run_incremental(args)
+        return
+
+    targets, candidates = generate_catalogs(args.size, args.seed)
+    print(f"[INFO] {len(targets)} hedef x {len(candidates)} aday üretildi.")
+
+    start = time.perf_counter()
+    index = build_match_index(candidates, threshold=args.threshold)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_results = [find_best_match(name, index) for name in targets]
+    indexed_time = time.perf_counter() - start
+    matched = sum(result is not None for result in indexed_results)
+    print(f"[INFO] İndeks oluşturma: {build_time:.2f} s")
+    print(f"[INFO] İndeksli eşleştirme: {indexed_time:.2f} s ({len(targets) / indexed_time:,.0f} hedef/s, {matched} eşleşme)")
+
+    # Tam tarama çok yavaş olduğu için örneklem üzerinde ölçülüp tüm kataloğa ölçeklenir
+    sample = random.Random(args.seed).sample(range(len(targets)), min(args.sample, len(targets)))
+    start = time.perf_counter()
+    mismatches = 0
+    for idx in sample:
+        if find_best_match_bruteforce(targets[idx], candidates, args.threshold) != indexed_results[idx]:
+            mismatches += 1
+    bruteforce_time = (time.perf_counter() - start) / len(sample) * len(targets)
+    print(f"[INFO] Tam tarama (tahmini): {bruteforce_time:.2f} s")
+    print(f"[INFO] Hızlanma: {bruteforce_time / (build_time + indexed_time):.1f}x")
+    print(f"[INFO] Örneklemde farklı sonuç: {mismatches}/{len(sample)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import glob
+import os
+import random
+import time
+
+from steam_parsing import (
+    _PURCHASE_AREA, _SEARCH_ROWS, is_dlc_page, is_dlc_page_bs4, parse_search_page, parse_search_page_bs4
+)
+
+# Kayıtlı HTML örnekleri üzerinde Steam ayrıştırıcılarının sayfa başına süresini karşılaştırır.
+# --fixtures klasöründe search_*.html ve app_*.html dosyaları aranır; yoksa Steam yapısını
+# taklit eden sentetik sayfalar üretilir.
+
+# Gerçek sayfalardaki menü, script ve açıklama gibi ilgisiz içeriğin kabaca miktarı
+FILLER_BLOCKS = 400
+
+
+def filler(rng, blocks):
+    parts = []
+    for block in range(blocks):
+        words = " ".join(rng.choice(["steam", "oyun", "macera", "aksiyon", "indirim", "yorum"]) for _ in range(20))
+        parts.append(
+            f'<div class="block_{block % 17}"><ul><li><a href="/tag/{block}">{words}</a></li></ul>'
+            f'<script>var data_{block} = {{"id": {block}, "text": "{words}"}};</script></div>'
+        )
+    return "".join(parts)
+
+
+def synthetic_search_page(rng, start, count=100):
+    rows = []
+    for index in range(start, start + count):
+        roll = rng.random()
+        if roll < 0.05:
+            price = '<div class="discount_final_price">Ücretsiz</div>'
+        elif roll < 0.1:
+            price = ''
+        else:
+            price = f'<div class="discount_final_price">{rng.randint(20, 2000)},{rng.randint(0, 99):02d} TL</div>'
+        rows.append(
+            f'<a href="https://store.steampowered.com/app/{index}/Game_{index}/" class="search_result_row ds_collapse_flag">'
+            f'<div class="col search_capsule"><img src="/capsule/{index}.jpg"></div>'
+            f'<div class="responsive_search_name_combined"><div class="col search_name ellipsis">'
+            f'<span class="title">Game &amp; {index}</span></div>'
+            f'<div class="col search_price_discount_combined"><div class="discount_block">{price}</div></div></div></a>'
+        )
+    return f"<html><head><title>Steam</title></head><body>{filler(rng, FILLER_BLOCKS // 4)}" \
+           f"<div id=\"search_resultsRows\">{''.join(rows)}</div>{filler(rng, FILLER_BLOCKS // 4)}</body></html>"
+
+
+def synthetic_app_page(rng, is_dlc):
+    bubble = '<div class="game_area_bubble game_area_dlc_bubble"><h1>Downloadable Content</h1></div>' if is_dlc else ''
+    return (
+        f"<html><head><title>Steam</title></head><body>{filler(rng, FILLER_BLOCKS)}"
+        f'<div id="game_area_purchase" class="game_area_purchase">{bubble}'
+        f'<div class="game_area_purchase_game"><h1>Satın al</h1><div class="price">100 TL</div></div></div>'
+        f"{filler(rng, FILLER_BLOCKS)}</body></html>"
+    )
+
+
+def load_fixtures(args):
+    """
+    (arama sayfaları, oyun sayfaları) listelerini döndürür.
+    """
+    if args.fixtures:
+        def read_all(pattern):
+            paths = sorted(glob.glob(os.path.join(args.fixtures, pattern)))
+            return [open(path, encoding='utf-8').read() for path in paths]
+        return read_all("search_*.html"), read_all("app_*.html")
+
+    rng = random.Random(args.seed)
+    search_pages = [synthetic_search_page(rng, page * 100) for page in range(args.pages)]
+    # Steam en çok satanlarında DLC oranı düşüktür
+    app_pages = [synthetic_app_page(rng, rng.random() < 0.1) for _ in range(args.apps)]
+    return search_pages, app_pages
+
+
+def measure(func, pages, repeat):
+    """
+    Fonksiyonu tüm sayfalar üzerinde çalıştırır; (sayfa başına ms, sonuçlar) döndürür.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(page) for page in pages]
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1000, results
+
+
+def report(label, pages, candidates, repeat):
+    if not pages:
+        print(f"[INFO] {label}: örnek sayfa yok, atlandı.")
+        return
+    print(f"[BENCH] {label} ({len(pages)} sayfa, ortalama {sum(map(len, pages)) / len(pages) / 1024:.0f} KB)")
+    baseline_ms, expected = None, None
+    for name, func in candidates:
+        page_ms, results = measure(func, pages, repeat)
+        if baseline_ms is None:
+            # İlk aday (eski yöntem) hem süre hem sonuç için referanstır
+            baseline_ms, expected = page_ms, results
+        status = "aynı" if results == expected else "FARKLI"
+        print(f"[BENCH]   {name:<28} {page_ms:>8.2f} ms/sayfa  {baseline_ms / page_ms:>6.1f}x  sonuç: {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Steam HTML ayrıştırıcıları benchmark'ı")
+    parser.add_argument("--fixtures", default=None, help="search_*.html ve app_*.html içeren klasör")
+    parser.add_argument("--pages", type=int, default=10, help="Sentetik arama sayfası sayısı")
+    parser.add_argument("--apps", type=int, default=100, help="Sentetik oyun sayfası sayısı")
+    parser.add_argument("--repeat", type=int, default=3, help="Her ölçümün tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    search_pages, app_pages = load_fixtures(args)
+    report("Arama sayfaları", search_pages, [
+        ("BeautifulSoup (eski)", parse_search_page_bs4),
+        ("BeautifulSoup + SoupStrainer", lambda page: parse_search_page_bs4(page, _SEARCH_ROWS)),
+        ("parse_search_page", parse_search_page),
+    ], args.repeat)
+    report("Oyun sayfaları", app_pages, [
+        ("BeautifulSoup (eski)", is_dlc_page_bs4),
+        ("BeautifulSoup + SoupStrainer", lambda page: is_dlc_page_bs4(page, _PURCHASE_AREA)),
+        ("is_dlc_page", is_dlc_page),
+    ], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import argparse
+import importlib
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import fixtures
+from soncsv import scale_catalog
+
+try:
+    import resource
+except ImportError:  # Windows'ta tepe bellek ölçülmez
+    resource = None
+
+# Kazıma -> birleştirme (soncsv) -> veritabanı yüklemesi (databasecreater) zincirini canlı sitelere
+# gitmeden, sabit bir kayıt arşivi (fixtures.py) üzerinde ölçer. Her aşama ayrı bir süreçte ve geçici
+# bir çalışma klasöründe çalışır; duvar süresi, CPU süresi (alt süreçler dahil) ve tepe bellek raporlanır.
+#
+# Kazıyıcılar arşivde kaydı olan kaynaklar için oynatılır; kaydı olmayan (veya tarayıcı gerektiren ve
+# --browser verilmeyen) kaynakların klasördeki CSV'si kullanılır. Birleştirme ve yükleme ardından
+# kataloglar --scales katına (isimlere ek getirilerek, soncsv --benchmark gibi) büyütülüp tekrarlanır.
+
+SCRAPE_STAGES = [
+    # (aşama, modül, fonksiyon, çıktı CSV'si)
+    ("steam", "oyuncekme", "scrape_steam", "steamverisi.csv"),
+    ("epic", "oyuncekmeepic", "scrape_epic", "epic_games_results.csv"),
+    ("metacritic", "metacritic", "scrape_metacritic", "metacritic_games.csv"),
+]
+PROCESS_STAGES = [
+    ("merge", "soncsv", "merge_games", {"use_cache": False}),
+    ("database", "databasecreater", "load_database", {}),
+]
+DEFAULT_SCALES = [1, 10]
+
+
+def _cpu_seconds():
+    """
+    Bu sürecin ve beklenmiş alt süreçlerinin (ayrıştırma havuzu, tarayıcı işçileri) toplam CPU süresi.
+    """
+    if resource is None:
+        return time.process_time()
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _peak_rss_mb():
+    """
+    Bu süreç ile alt süreçlerinden en büyüğünün tepe belleği (MB); ölçülemiyorsa None.
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    # Linux KB, macOS bayt cinsinden verir
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _measure(module_name, function_name, kwargs, work_dir, results):
+    """
+    Ayrı süreçte çalışır: aşamanın fonksiyonunu çalışma klasöründe çağırıp ölçümleri kuyruğa koyar.
+    """
+    os.chdir(work_dir)
+    start, cpu_start = time.perf_counter(), _cpu_seconds()
+    try:
+        output = getattr(importlib.import_module(module_name), function_name)(**kwargs)
+        if isinstance(output, pd.DataFrame):
+            rows = len(output)
+        else:
+            # load_database eklenen/güncellenen/değişmeyen/silinen sayaçlarını döndürür
+            rows = output["inserted"] + output["updated"] + output["unchanged"]
+        error = None
+    except Exception as e:
+        rows, error = None, f"{type(e).__name__}: {e}"
+    results.put({
+        "rows": rows,
+        "error": error,
+        "wall": time.perf_counter() - start,
+        "cpu": _cpu_seconds() - cpu_start,
+        "rss": _peak_rss_mb(),
+    })
+
+
+def run_measured(module_name, function_name, kwargs, work_dir):
+    """
+    Aşamayı temiz bir süreçte çalıştırır; böylece tepe bellek ve CPU önceki aşamalardan etkilenmez.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(module_name, function_name, kwargs, work_dir, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def can_replay(stage, archive, browser):
+    """
+    Kaynak arşivden oynatılabilir mi: Steam yanıtları veya Epic katalog yanıtları tarayıcısız,
+    render edilmiş sayfalar yalnızca --browser ile oynatılır.
+    """
+    if stage == "epic" and os.path.isdir(os.path.join(archive, fixtures.EPIC_PAYLOADS_FOLDER)):
+        return True
+    if not os.path.isdir(os.path.join(archive, fixtures.RESPONSES_FOLDER)):
+        return False
+    return stage == "steam" or browser
+
+
+def scrape_kwargs(stage, archive, lean=False):
+    """
+    Kazıyıcının arşivden oynatılması için argümanlar; CSV sayfa sayfa çalışma klasörüne yazılır.
+    lean ise Selenium kazıyıcıları hafif tarayıcı modunda oynatılır.
+    Steam, kayıttaki oyun sayısı ve modla oynatılır; yoksa kaydedilmemiş sayfalar istenirdi.
+    """
+    kwargs = {"fixtures_folder": archive}
+    if stage == "steam":
+        kwargs.update(fixtures.load_run_settings(archive, "steam"))
+    elif stage == "epic":
+        # Katalog yanıtları kaydedildiyse tarayıcı açılmadan ağ modu oynatılır
+        if os.path.isdir(os.path.join(archive, fixtures.EPIC_PAYLOADS_FOLDER)):
+            kwargs["extract"] = "network"
+        kwargs["metrics"] = None
+        kwargs["lean"] = lean
+    elif stage == "metacritic":
+        kwargs["metrics"] = None
+        kwargs["lean"] = lean
+    return kwargs
+
+
+def scale_csv(source, target, factor):
+    """
+    Kazıyıcı CSV'sini (ilk sütun oyun adı) factor katına büyütüp target'a yazar.
+    """
+    data = pd.read_csv(source)
+    name_column = data.columns[0]
+    data = data.rename(columns={name_column: "oyun_adi"})
+    data = scale_catalog(data, factor).rename(columns={"oyun_adi": name_column})
+    data.to_csv(target, index=False)
+    return len(data)
+
+
+def print_report(report):
+    print("[BENCH] Ölçek Aşama        Durum        Satır   Duvar (s)   CPU (s)   Tepe RSS (MB)")
+    for scale, stage, status, result in report:
+        rows = "-" if result.get("rows") is None else f"{result['rows']}"
+        rss = "-" if result.get("rss") is None else f"{result['rss']:.0f}"
+        wall = "-" if result.get("wall") is None else f"{result['wall']:.2f}"
+        cpu = "-" if result.get("cpu") is None else f"{result['cpu']:.2f}"
+        print(f"[BENCH] {scale:>4}x {stage:<12} {status:<10} {rows:>7} {wall:>11} {cpu:>9} {rss:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıt arşivi üzerinde uçtan uca kazıma/birleştirme/yükleme benchmark'ı")
+    parser.add_argument("--archive", default=fixtures.FIXTURES_FOLDER,
+                        help="Kazıyıcıların --record ile oluşturduğu kayıt arşivi")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Birleştirme ve yüklemenin tekrarlanacağı katalog büyütme katları (ör. 1 10 100)")
+    parser.add_argument("--browser", action="store_true",
+                        help="Render edilmiş sayfa kaydı olan Selenium kazıyıcılarını da oynatır (Chrome gerekir)")
+    parser.add_argument("--lean", action="store_true",
+                        help="Selenium kazıyıcılarını headless, ağır kaynakları engellenmiş oynatır (--browser ile)")
+    parser.add_argument("--keep", action="store_true", help="Çalışma klasörünü silmez")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    archive = os.path.abspath(args.archive)
+    work_dir = tempfile.mkdtemp(prefix="benchmark_pipeline_")
+    report = []
+
+    try:
+        scrape_dir = os.path.join(work_dir, "scrape")
+        os.makedirs(scrape_dir)
+        for stage, module_name, function_name, csv_path in SCRAPE_STAGES:
+            if can_replay(stage, archive, args.browser):
+                print(f"[INFO] {stage} arşivden oynatılıyor...")
+                result = run_measured(module_name, function_name, scrape_kwargs(stage, archive, args.lean), scrape_dir)
+                if result["error"] is None and result["rows"]:
+                    report.append((1, stage, "oynatıldı", result))
+                    continue
+                print(f"[WARNING] {stage} oynatılamadı ({result['error'] or 'satır yok'}), CSV kullanılacak.")
+                report.append((1, stage, "hata", result))
+            # Oynatılamayan kaynakların son canlı çalıştırmadaki CSV'si kullanılır
+            shutil.copy(os.path.join(base_dir, csv_path), os.path.join(scrape_dir, csv_path))
+            report.append((1, stage, "csv", {"rows": len(pd.read_csv(os.path.join(scrape_dir, csv_path)))}))
+
+        for scale in args.scales:
+            scale_dir = os.path.join(work_dir, f"scale_{scale}")
+            os.makedirs(scale_dir)
+            for _, _, _, csv_path in SCRAPE_STAGES:
+                scale_csv(os.path.join(scrape_dir, csv_path), os.path.join(scale_dir, csv_path), scale)
+            for stage, module_name, function_name, kwargs in PROCESS_STAGES:
+                print(f"[INFO] {scale}x {stage} çalışıyor...")
+                result = run_measured(module_name, function_name, kwargs, scale_dir)
+                report.append((scale, stage, "hata" if result["error"] else "tamam", result))
+                if result["error"]:
+                    print(f"[ERROR] {scale}x {stage}: {result['error']}")
+                    break
+    finally:
+        if args.keep:
+            print(f"[INFO] Çalışma klasörü: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
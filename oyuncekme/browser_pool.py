@@ -0,0 +1,203 @@
+import atexit
+import multiprocessing
+import queue
+import time
+from functools import partial
+
+from lean_browser import read_page_stats, track_page_stats
+from page_metrics import open_metrics, print_summary, record
+from rate_limit import create_bucket, take
+
+# Sayfa listesini birden fazla tarayıcıya (her biri ayrı süreçte) dağıtan ortak havuz.
+# Sonuçlar çağırana sayfa sırasıyla verilir; böylece CSV çıktısı tek tarayıcılı çalıştırmayla aynı sırada kalır.
+# Hız sınırı tüm işçilerin paylaştığı token bucket'tadır (rate_limit.py); scrape fonksiyonları beklemez.
+# rate ve burst tek tarayıcının temposudur; havuzda kova işçi sayısıyla ölçeklenir, böylece --workers
+# sayfa yüklemeyi gerçekten hızlandırır ve siteye gelen toplam yük workers x rate ile sınırlı kalır.
+
+# Havuz kapanırken bir işçinin tarayıcısını kapatması için beklenen süre (saniye)
+JOIN_TIMEOUT = 60
+# İşçiler tarayıcılarını aynı anda açmasın (undetected_chromedriver sürücü dosyasını paylaşır, siteye ani yük binmez)
+STARTUP_STAGGER = 3
+
+# keep_driver ile açık bırakılan tarayıcılar (setup -> driver). --in-process boru hattında bir kazıyıcının
+# yeniden denemeleri ve sonraki çalıştırmaları Chrome'u yeniden başlatmadan aynı tarayıcıyla sürer.
+_shared_drivers = {}
+
+
+def _start_driver(setup, worker_id):
+    driver = setup(worker_id=worker_id)
+    track_page_stats(driver)
+    return driver
+
+
+def _setup_key(setup):
+    if isinstance(setup, partial):
+        return setup.func, setup.args, tuple(sorted(setup.keywords.items()))
+    return setup
+
+
+def _shared_driver(setup):
+    """
+    Aynı ayarlarla açılmış ve hâlâ yanıt veren tarayıcıyı döndürür, yoksa yenisini açıp saklar.
+    """
+    key = _setup_key(setup)
+    driver = _shared_drivers.get(key)
+    if driver is not None:
+        try:
+            driver.current_url
+            return driver
+        except Exception:
+            print("[WARNING] Açık bırakılan tarayıcı yanıt vermiyor, yeniden başlatılıyor.")
+            _quit(driver)
+    driver = _start_driver(setup, 0)
+    _shared_drivers[key] = driver
+    return driver
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[WARNING] Tarayıcı kapatılamadı: {e}")
+
+
+def close_shared_drivers():
+    """
+    keep_driver ile açık bırakılan tüm tarayıcıları kapatır (süreç sonunda da otomatik çağrılır).
+    """
+    while _shared_drivers:
+        _, driver = _shared_drivers.popitem()
+        _quit(driver)
+
+
+atexit.register(close_shared_drivers)
+
+
+def _scrape_timed(worker_id, driver, scrape, url, bucket):
+    """
+    Hız sınırı jetonunu alıp sayfayı işler; (sonuç, süreler) döndürür.
+    scrape(driver, url, timings) kendi aşamalarını (load, wait, extract) timings'e yazar; sayfanın
+    tarayıcıda ölçülen yükleme süresi ve aktarılan baytı da ardından eklenir. scrape hata verirse
+    sonuç None olur (sayfa yüklenemedi); boş liste ise sayfanın yüklendiğini ama öğe içermediğini gösterir.
+    """
+    timings = {"worker": worker_id, "throttle": take(bucket)}
+    start = time.perf_counter()
+    try:
+        result = scrape(driver, url, timings)
+    except Exception as e:
+        print(f"[ERROR] İşçi {worker_id}: {url} işlenemedi: {e}")
+        result = None
+    timings["elapsed"] = time.perf_counter() - start
+    timings.update(read_page_stats(driver))
+    return result, timings
+
+
+def _worker(worker_id, setup, scrape, jobs, results, stop, bucket):
+    """
+    Kendi tarayıcısını açar ve kuyruktaki (sıra, URL) işlerini stop işaretlenene kadar işler.
+    """
+    time.sleep(worker_id * STARTUP_STAGGER)
+    driver = _start_driver(setup, worker_id)
+    try:
+        while not stop.is_set():
+            job = jobs.get()
+            if job is None:
+                break
+            index, url = job
+            results.put((index,) + _scrape_timed(worker_id, driver, scrape, url, bucket))
+    finally:
+        driver.quit()
+        # Bitti işareti; ana süreç tüm işçilerin kapandığını buradan anlar
+        results.put((None, worker_id, None))
+
+
+def run_pages(setup, scrape, urls, on_page, workers=1, rate=0, burst=1, metrics_file=None, keep_driver=False):
+    """
+    urls listesini scrape(driver, url, timings) ile işler ve on_page(sıra, url, sonuç) fonksiyonunu sayfa
+    sırasıyla çağırır; yüklenemeyen sayfanın sonucu None, yüklenip öğe içermeyeninki boş listedir. on_page False döndürürse sonraki sayfalar işlenmez. Her tarayıcı saniyede ortalama
+    en fazla rate sayfa yükler, yani havuz toplamda workers x rate (rate <= 0 ise sınırsız); sayfa süreleri
+    metrics_file'a yazılır.
+    workers 1 ise her şey bu süreçte, tek tarayıcıyla çalışır (CAPTCHA gibi kullanıcı girdisi isteyen
+    durumlar için). setup(worker_id=...) tarayıcıyı açar; setup ve scrape modül düzeyinde tanımlı (süreçler
+    arasında aktarılabilir) olmalıdır. keep_driver ise tek tarayıcılı çalıştırmanın tarayıcısı kapatılmaz,
+    aynı setup ile sonraki çağrılarda yeniden kullanılır (havuz süreçlerinin tarayıcıları her zaman kapanır).
+    """
+    metrics = open_metrics(metrics_file)
+    try:
+        if workers <= 1:
+            _run_inline(setup, scrape, urls, on_page, create_bucket(rate, burst), metrics, keep_driver)
+        else:
+            _run_pool(setup, scrape, urls, on_page, workers, rate, burst, metrics)
+    finally:
+        print_summary(metrics)
+
+
+def _deliver(on_page, metrics, index, url, result, timings):
+    record(metrics, index, url, timings, len(result or []))
+    return on_page(index, url, result)
+
+
+def _run_inline(setup, scrape, urls, on_page, bucket, metrics, keep_driver=False):
+    driver = _shared_driver(setup) if keep_driver else _start_driver(setup, 0)
+    try:
+        for index, url in enumerate(urls):
+            result, timings = _scrape_timed(0, driver, scrape, url, bucket)
+            if _deliver(on_page, metrics, index, url, result, timings) is False:
+                return
+    finally:
+        if not keep_driver:
+            driver.quit()
+
+
+def _run_pool(setup, scrape, urls, on_page, workers, rate, burst, metrics):
+    context = multiprocessing.get_context("spawn")
+    # Paylaşılan kova tüm havuzun temposudur: workers tarayıcı, her biri rate sayfa/saniye
+    bucket = create_bucket(rate * workers, burst * workers, context)
+    jobs = context.Queue()
+    results = context.Queue()
+    stop = context.Event()
+    for job in enumerate(urls):
+        jobs.put(job)
+    for _ in range(workers):
+        jobs.put(None)
+
+    processes = [
+        context.Process(target=_worker, args=(worker_id, setup, scrape, jobs, results, stop, bucket))
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    pending = {}
+    next_index = 0
+    finished = set()
+    try:
+        while len(finished) < workers:
+            try:
+                index, result, timings = results.get(timeout=1)
+            except queue.Empty:
+                # Beklenmedik şekilde ölen işçiler bitti işareti bırakamaz
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if index is None:
+                finished.add(result)
+                continue
+            if stop.is_set():
+                continue
+            pending[index] = (result, timings)
+            # Önceki sayfaların hepsi geldiyse sırayla teslim et
+            while next_index in pending:
+                if _deliver(on_page, metrics, next_index, urls[next_index], *pending.pop(next_index)) is False:
+                    stop.set()
+                    break
+                next_index += 1
+        if pending and not stop.is_set():
+            print(f"[WARNING] {next_index + 1}. sayfa alınamadığı için sonraki {len(pending)} sayfa yazılmadı.")
+    finally:
+        stop.set()
+        for process in processes:
+            # Hata ile çıkıldıysa okunmamış sonuçlar işçiyi bekletebilir
+            process.join(timeout=JOIN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
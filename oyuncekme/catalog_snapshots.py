@@ -0,0 +1,234 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from functools import partial
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse yalnızca gzip sürümleri yazılır
+    brotli = None
+
+# Veritabanı yüklemesinden sonra mağazanın statik dosya olarak sunabileceği, önceden hesaplanmış katalog
+# dosyaları. Veri günde bir değiştiği için her istekte tüm tabloyu okuyup JSON'a çevirmek yerine:
+#   catalog.<özet>.json              parametresiz /api/games yanıtının aynısı (tüm oyunlar)
+#   <görünüm>-<sayfa>.<özet>.json    sıralı görünümlerin PAGE_SIZE oyunluk sayfaları
+# Her dosyanın .gz ve (brotli kuruluysa) .br sürümü de yazılır. Özet sıkıştırılmamış içeriğin SHA-256'sıdır;
+# değişmeyen sayfa aynı adla kalır ve yeniden yazılmaz, değişen sayfa yeni ad alır (önbellek kırma).
+# manifest.json görünümlerin sayfa listesini tutar ve en son, atomik olarak yazılır. Klasör,
+# game_data.db ve gorseller gibi my-game-store/public/catalog'a kopyalanır.
+
+snapshots_folder = "catalog"
+MANIFEST_FILE = "manifest.json"
+TABLE = "games"
+# game_queries.MAX_LIMIT ile aynı; böylece statik sayfa ile API'nin aynı sıralamadaki sayfası örtüşür
+PAGE_SIZE = 100
+HASH_LENGTH = 16
+GZIP_LEVEL = 9
+# Gecelik yükleme için brotli seviyesi: tüm katalog ~0.2 s, 9'dan yalnızca ~%1 büyük. 11 dosyaları ~%13
+# küçültür ama ~14 s sürer ve veritabanı aşamasını uzatır; yalnızca --max-compression ile kullanılır.
+BROTLI_QUALITY = 7
+MAX_BROTLI_QUALITY = 11
+
+# Parametresiz /api/games yanıtındaki alanlar
+CATALOG_COLUMNS = {
+    "oyun_adi": "Game Name",
+    "steam_fiyati": "Steam Price",
+    "epic_fiyati": "Epic Price",
+    "metascore": "Metascore",
+    "steam_url": "Steam URL",
+    "epic_url": "Epic URL",
+}
+# Sayfalı /api/games yanıtındaki (toApiGame) alanlar
+VIEW_COLUMNS = dict(CATALOG_COLUMNS, steam_fiyati_tutar="Steam Price Amount", epic_fiyati_tutar="Epic Price Amount")
+
+# Görünüm -> ORDER BY. Sıralama değeri boş olanlar sona gelir ve eşitlikler oyun adıyla, game_queries'deki
+# keyset sıralamasıyla aynı yönde çözülür. Platformlar arası "en ucuz" görünümü yoktur: Steam USD, Epic TRY
+# fiyat listeler (steam_para_birimi/epic_para_birimi) ve tutarlar kur çevrimi olmadan karşılaştırılamaz.
+VIEWS = {
+    "metascore": "metascore IS NULL, metascore DESC, oyun_adi DESC",
+    "steam_price": "steam_fiyati_tutar IS NULL, steam_fiyati_tutar ASC, oyun_adi ASC",
+    "epic_price": "epic_fiyati_tutar IS NULL, epic_fiyati_tutar ASC, oyun_adi ASC",
+}
+
+
+def _encode(data):
+    # Aynı veri her gece aynı baytlara (ve aynı özete) dönüşsün
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _write_atomic(path, body):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(body)
+        # mkstemp dosyayı yalnızca sahibine açar; mağazayı sunan kullanıcı da okuyabilmeli
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def encodings(brotli_quality=BROTLI_QUALITY):
+    """
+    Yazılan sıkıştırılmış sürümler: (Content-Encoding adı, dosya uzantısı, sıkıştırma fonksiyonu).
+    """
+    # mtime=0: gzip başlığına zaman yazılmaz, aynı içerik aynı dosyayı üretir
+    result = [("gzip", ".gz", lambda body: gzip.compress(body, GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        result.insert(0, ("br", ".br", lambda body: brotli.compress(body, quality=brotli_quality)))
+    return result
+
+
+def write_snapshot(folder, name, data, stats, brotli_quality=BROTLI_QUALITY, recompress=False):
+    """
+    data'yı <name>.<özet>.json ve sıkıştırılmış sürümleri olarak yazar; aynı özetli dosya varsa yazmaz
+    (recompress ise değişmeyen dosyanın sıkıştırılmış sürümleri de yeniden yazılır).
+    Dosya adını ve özeti döndürür.
+    """
+    body = _encode(data)
+    digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+    file_name = f"{name}.{digest}.json"
+    path = os.path.join(folder, file_name)
+    stats["bytes"] += len(body)
+    compressors = encodings(brotli_quality)
+    if os.path.exists(path) and all(os.path.exists(path + extension) for _, extension, _ in compressors):
+        if not recompress:
+            stats["unchanged"] += 1
+            return file_name, digest
+    for _, extension, compress in compressors:
+        compressed = compress(body)
+        _write_atomic(path + extension, compressed)
+        stats[f"{extension[1:]}_bytes"] += len(compressed)
+    # Sıkıştırılmamış dosya en son yazılır; varlığı tüm sürümlerin tamamlandığını gösterir
+    _write_atomic(path, body)
+    stats["written"] += 1
+    return file_name, digest
+
+
+def _rows(conn, columns, order_by):
+    # metascore CSV'den yüklenince REAL (97.0), Parquet'ten yüklenince INTEGER (97) saklanır; ikisi de
+    # aynı JSON'a (ve özete) dönüşsün diye tamsayıya çevrilir
+    select = ["CAST(metascore AS INTEGER)" if column == "metascore" else column for column in columns]
+    cursor = conn.execute(f"SELECT {', '.join(select)} FROM {TABLE} ORDER BY {order_by}")
+    names = [columns[column] for column in columns]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def load_manifest(folder):
+    path = os.path.join(folder, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def manifest_files(manifest):
+    """
+    Manifestin gösterdiği tüm dosyalar (sıkıştırılmış sürümler dahil).
+    """
+    if not manifest:
+        return set()
+    names = [manifest["catalog"]["path"]]
+    for view in manifest["views"].values():
+        names.extend(view["pages"])
+    return {name + extension for name in names for extension in ["", ".gz", ".br"]}
+
+
+def _remove_stale(folder, keep):
+    """
+    Yeni ve bir önceki manifestte olmayan dosyaları siler. Önceki kuşak korunur; eski manifesti
+    okumuş bir istemci sayfalarını yükleyebilmeye devam eder.
+    """
+    removed = 0
+    for name in os.listdir(folder):
+        if name != MANIFEST_FILE and name not in keep and (name.endswith(".json") or ".json." in name):
+            os.remove(os.path.join(folder, name))
+            removed += 1
+    return removed
+
+
+def export_snapshots(conn, folder=snapshots_folder, page_size=PAGE_SIZE, max_compression=False):
+    """
+    Tüm kataloğu ve sıralı görünümlerin sayfalarını folder'a yazar, manifest.json'u günceller.
+    max_compression ise değişmeyenler dahil tüm dosyalar en yüksek brotli seviyesiyle yeniden sıkıştırılır.
+    Yazılan/değişmeyen dosya ve bayt sayaçlarını döndürür.
+    """
+    brotli_quality = MAX_BROTLI_QUALITY if max_compression else BROTLI_QUALITY
+    write = partial(write_snapshot, brotli_quality=brotli_quality, recompress=max_compression)
+    start = time.perf_counter()
+    os.makedirs(folder, exist_ok=True)
+    stats = {"written": 0, "unchanged": 0, "bytes": 0, "gz_bytes": 0, "br_bytes": 0}
+
+    catalog = _rows(conn, CATALOG_COLUMNS, "rowid")
+    catalog_path, catalog_hash = write(folder, "catalog", catalog, stats)
+    views = {}
+    for view, order_by in VIEWS.items():
+        rows = _rows(conn, VIEW_COLUMNS, order_by)
+        pages = []
+        for page, offset in enumerate(range(0, len(rows), page_size)):
+            data = {"view": view, "page": page, "items": rows[offset:offset + page_size]}
+            pages.append(write(folder, f"{view}-{page:04d}", data, stats)[0])
+        views[view] = {"pages": pages}
+
+    manifest = {
+        "games": len(catalog),
+        "page_size": page_size,
+        "encodings": [name for name, _, _ in encodings()],
+        "catalog": {"path": catalog_path, "hash": catalog_hash},
+        "views": views,
+    }
+    previous = load_manifest(folder)
+    if previous is None or {key: previous.get(key) for key in manifest} != manifest:
+        manifest["generated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        _write_atomic(os.path.join(folder, MANIFEST_FILE), _encode(manifest))
+    else:
+        # İçerik değişmediyse manifest de değişmez; mağazanın bellek önbelleği geçerli kalır
+        manifest = previous
+    stats["removed"] = _remove_stale(folder, manifest_files(manifest) | manifest_files(previous))
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def print_stats(folder, stats):
+    compressed = f"gzip {stats['gz_bytes'] / 1024:.0f} KB"
+    if brotli is not None:
+        compressed += f", brotli {stats['br_bytes'] / 1024:.0f} KB"
+    else:
+        compressed += " (brotli kurulu değil, .br yazılmadı)"
+    print(
+        f"[INFO] Katalog dosyaları -> {folder}: {stats['written']} yazıldı, {stats['unchanged']} değişmedi, "
+        f"{stats['removed']} eski dosya silindi; toplam {stats['bytes'] / 1024:.0f} KB JSON, "
+        f"yazılanlar {compressed} ({stats['elapsed']:.2f} s)."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="game_data.db'den statik, sıkıştırılmış katalog dosyaları üretir")
+    parser.add_argument("--db", default="game_data.db", help="Okunacak veritabanı")
+    parser.add_argument("--output", default=snapshots_folder, help="Dosyaların yazılacağı klasör")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Görünüm sayfası başına oyun")
+    parser.add_argument("--max-compression", action="store_true",
+                        help=f"Brotli seviyesi {MAX_BROTLI_QUALITY} (~%%13 küçük, çok daha yavaş); "
+                             "değişmeyen dosyalar da yeniden sıkıştırılır")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        columns = {column[1] for column in conn.execute(f"PRAGMA table_info({TABLE})")}
+        if not set(VIEW_COLUMNS) <= columns:
+            print(f"[ERROR] {args.db} eski şemada; önce databasecreater.py ile yükleyin (dosyalar da üretilir).")
+            return
+        print_stats(args.output, export_snapshots(conn, args.output, args.page_size, args.max_compression))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import os
+
+# Kazıyıcıların yarıda kalan çalıştırmalarına kaldıkları yerden devam edebilmesi için CSV'nin yanında
+# tutulan ilerleme kaydı (<csv>.checkpoint.json). Her sayfa CSV'ye eklenip diske işlendikten sonra
+# kayıt atomik olarak (tmp + replace) güncellenir; kayıtta CSV'nin o andaki boyutu da tutulur.
+# --resume ile açılışta CSV bu boyuta kısaltılır, böylece çökme anında yarım yazılmış sayfa atılır
+# ve tamamlanan sayfalar ne yeniden çekilir ne de tekrarlanır.
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def checkpoint_path(csv_path):
+    return csv_path + CHECKPOINT_SUFFIX
+
+
+def _save(checkpoint):
+    path = checkpoint_path(checkpoint["csv"])
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file, ensure_ascii=False)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def _csv_size(csv_path):
+    """
+    CSV'yi diske işler ve boyutunu döndürür.
+    """
+    with open(csv_path, "ab") as file:
+        os.fsync(file.fileno())
+        return file.tell()
+
+
+def resume_checkpoint(csv_path, config):
+    """
+    csv_path için aynı ayarlarla (config) alınmış kayıt varsa CSV'yi son tamamlanan sayfanın sonuna
+    kısaltıp kaydı döndürür. Kayıt yoksa, ayarlar farklıysa veya CSV kayıttan kısaysa None döner;
+    çağıran CSV'yi baştan oluşturup new_checkpoint ile yeni kayıt açar.
+    """
+    path = checkpoint_path(csv_path)
+    if not os.path.exists(path) or not os.path.exists(csv_path):
+        print(f"[INFO] {csv_path} için devam kaydı yok, baştan başlanıyor.")
+        return None
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    if checkpoint["config"] != config:
+        print(f"[WARNING] {csv_path} farklı ayarlarla alınmış ({checkpoint['config']}), baştan başlanıyor.")
+        return None
+    if os.path.getsize(csv_path) < checkpoint["csv_size"]:
+        print(f"[WARNING] {csv_path} devam kaydından kısa, baştan başlanıyor.")
+        return None
+    # Son kayıttan sonra yazılmış (tamamlanmamış sayfaya ait) satırları at
+    with open(csv_path, "r+b") as file:
+        file.truncate(checkpoint["csv_size"])
+    state = "tamamlanmış" if checkpoint["finished"] else f"{checkpoint['pages']} sayfa tamamlanmış"
+    print(f"[INFO] {csv_path} kaldığı yerden devam ediyor ({state}, {len(checkpoint['seen'])} oyun).")
+    return checkpoint
+
+
+def new_checkpoint(csv_path, config, **state):
+    """
+    Başlığı yazılmış boş CSV için ilk kaydı oluşturur. state, kazıyıcıya özel imleç alanlarıdır.
+    """
+    checkpoint = {
+        "csv": csv_path,
+        "config": config,
+        "pages": 0,
+        "seen": [],
+        "csv_size": _csv_size(csv_path),
+        "finished": False,
+    }
+    checkpoint.update(state)
+    _save(checkpoint)
+    return checkpoint
+
+
+def commit_page(checkpoint, pages, titles=(), **state):
+    """
+    CSV'ye eklenen sayfayı kalıcı hale getirir: tamamlanan sayfa sayısını, görülen başlıkları ve
+    imleç alanlarını (state) günceller. Çağıran satırları CSV'ye yazıp dosyayı flush etmiş olmalıdır.
+    """
+    checkpoint["pages"] = pages
+    checkpoint["seen"].extend(titles)
+    checkpoint["csv_size"] = _csv_size(checkpoint["csv"])
+    checkpoint.update(state)
+    _save(checkpoint)
+
+
+def finish_checkpoint(checkpoint):
+    """
+    Tarama sonuna ulaşıldığını işaretler; --resume ile tekrar çalıştırılırsa yeni sayfa çekilmez.
+    """
+    checkpoint["finished"] = True
+    _save(checkpoint)
@@ -1,22 +1,256 @@
+import argparse
 import pandas as pd
 import sqlite3
 
-# CSV dosyasını yükle
+from catalog_snapshots import export_snapshots, print_stats, snapshots_folder
+from intermediates import read_parquet
+from prices import price_amount, price_currency
+
+# Dosya ve tablo isimleri
 csv_file = "merged_game_data.csv"
-data = pd.read_csv(csv_file)
+db_name = "game_data.db"
+table_name = "games"
 
-# Steam ve Epic fiyatı null olanları filtrele
-filtered_data = data[~(data["steam_fiyati"].isnull() & data["epic_fiyati"].isnull())]
+# CSV her seferinde bu kadar satır okunarak işlenir
+CHUNK_SIZE = 500
+KEY_COLUMN = "oyun_adi"
+CSV_VALUE_COLUMNS = ["steam_fiyati", "epic_fiyati", "metascore", "steam_url", "epic_url"]
+# Metin fiyatlardan türetilen, sıralama ve filtreleme için sayısal sütunlar
+PRICE_AMOUNT_COLUMNS = {"steam_fiyati_tutar": "steam_fiyati", "epic_fiyati_tutar": "epic_fiyati"}
+# Fiyatın para birimi (Steam USD, Epic TRY); iki platformun tutarı ancak aynı para birimindeyse karşılaştırılır
+PRICE_CURRENCY_COLUMNS = {"steam_para_birimi": "steam_fiyati", "epic_para_birimi": "epic_fiyati"}
+DERIVED_COLUMNS = {**PRICE_AMOUNT_COLUMNS, **PRICE_CURRENCY_COLUMNS}
+VALUE_COLUMNS = CSV_VALUE_COLUMNS + list(DERIVED_COLUMNS)
+COLUMNS = [KEY_COLUMN] + VALUE_COLUMNS
 
-# SQLite veritabanı bağlantısını oluştur
-db_name = "game_data.db"
-conn = sqlite3.connect(db_name)
+CREATE_TABLE_SQL = """
+    CREATE TABLE {name} (
+        oyun_adi TEXT PRIMARY KEY,
+        steam_fiyati TEXT,
+        epic_fiyati TEXT,
+        metascore REAL,
+        steam_url TEXT,
+        epic_url TEXT,
+        steam_fiyati_tutar REAL,
+        epic_fiyati_tutar REAL,
+        steam_para_birimi TEXT,
+        epic_para_birimi TEXT
+    )
+"""
 
-# Filtrelenmiş veriyi SQLite tablosuna yaz
-table_name = "games"
-filtered_data.to_sql(table_name, conn, if_exists="replace", index=False)
+# Sıralanabilir sütunlar; oyun adı ikinci anahtar olduğundan keyset sayfalama doğrudan indeksi kullanır
+INDEX_SQL = [
+    f"CREATE INDEX IF NOT EXISTS idx_{table_name}_metascore ON {table_name} (metascore, oyun_adi)",
+    f"CREATE INDEX IF NOT EXISTS idx_{table_name}_steam_price ON {table_name} (steam_fiyati_tutar, oyun_adi)",
+    f"CREATE INDEX IF NOT EXISTS idx_{table_name}_epic_price ON {table_name} (epic_fiyati_tutar, oyun_adi)",
+]
+
+# Başlık araması için games tablosunu içerik olarak kullanan FTS5 tablosu ve senkron tetikleyicileri
+FTS_TABLE = f"{table_name}_fts"
+FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        oyun_adi, content='{table_name}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER {table_name}_ai AFTER INSERT ON {table_name} BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, oyun_adi) VALUES (new.rowid, new.oyun_adi);
+    END""",
+    f"""CREATE TRIGGER {table_name}_ad AFTER DELETE ON {table_name} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, oyun_adi) VALUES ('delete', old.rowid, old.oyun_adi);
+    END""",
+    f"""CREATE TRIGGER {table_name}_au AFTER UPDATE OF oyun_adi ON {table_name} BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, oyun_adi) VALUES ('delete', old.rowid, old.oyun_adi);
+        INSERT INTO {FTS_TABLE} (rowid, oyun_adi) VALUES (new.rowid, new.oyun_adi);
+    END""",
+]
+
+
+def connect(db_path):
+    """
+    Veritabanına bağlanır; okuyucuların yükleme sırasında engellenmemesi için WAL modunu açar.
+    İşlemler (BEGIN/COMMIT) elle yönetilir.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def ensure_schema(conn):
+    """
+    games tablosunu oyun adı birincil anahtarı, sayısal fiyat ve para birimi sütunları, indeksler ve FTS5
+    arama tablosuyla hazırlar. Eski şemalar verisi korunarak yerinde yükseltilir.
+    """
+    conn.create_function("price_amount", 1, price_amount, deterministic=True)
+    conn.create_function("price_currency", 1, price_currency, deterministic=True)
+    derived_updates = ", ".join(
+        [f"{amount} = price_amount({text})" for amount, text in PRICE_AMOUNT_COLUMNS.items()]
+        + [f"{currency} = price_currency({text})" for currency, text in PRICE_CURRENCY_COLUMNS.items()]
+    )
+
+    table_info = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+    if not table_info:
+        conn.execute(CREATE_TABLE_SQL.format(name=table_name))
+    elif not any(column[5] for column in table_info):
+        # Eski to_sql tablosu (birincil anahtarsız)
+        print(f"[INFO] '{table_name}' tablosu birincil anahtarlı şemaya taşınıyor.")
+        conn.execute(CREATE_TABLE_SQL.format(name=f"{table_name}_new"))
+        legacy_columns = ", ".join([KEY_COLUMN] + CSV_VALUE_COLUMNS)
+        conn.execute(
+            f"INSERT OR IGNORE INTO {table_name}_new ({legacy_columns}) SELECT {legacy_columns} FROM {table_name}"
+        )
+        conn.execute(f"UPDATE {table_name}_new SET {derived_updates}")
+        conn.execute(f"DROP TABLE {table_name}")
+        conn.execute(f"ALTER TABLE {table_name}_new RENAME TO {table_name}")
+    else:
+        existing_columns = {column[1] for column in table_info}
+        missing = [column for column in DERIVED_COLUMNS if column not in existing_columns]
+        for column in missing:
+            column_type = "REAL" if column in PRICE_AMOUNT_COLUMNS else "TEXT"
+            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}")
+        if missing:
+            print(f"[INFO] '{table_name}' tablosuna {', '.join(missing)} sütunları eklendi.")
+            conn.execute(f"UPDATE {table_name} SET {derived_updates}")
+
+    for sql in INDEX_SQL:
+        conn.execute(sql)
+
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    if not has_fts:
+        for sql in FTS_SQL:
+            conn.execute(sql)
+        conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def read_chunks(source):
+    """
+    CSV'yi (ya da bellekteki birleşik DataFrame'i) parça parça okur, iki fiyatı da boş olan
+    satırları atar ve satırları demet olarak döndürür.
+    """
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[start:start + CHUNK_SIZE] for start in range(0, len(source), CHUNK_SIZE))
+    else:
+        chunks = pd.read_csv(source, chunksize=CHUNK_SIZE)
+    for chunk in chunks:
+        # Steam ve Epic fiyatı null olanları filtrele
+        chunk = chunk[~(chunk["steam_fiyati"].isnull() & chunk["epic_fiyati"].isnull())].copy()
+        for column, text in DERIVED_COLUMNS.items():
+            # Parquet'ten gelen tablolarda tutar ve para birimi kazıyıcıda çözülmüştür
+            if column not in chunk.columns:
+                chunk[column] = chunk[text].map(price_amount if column in PRICE_AMOUNT_COLUMNS else price_currency)
+        chunk = chunk[COLUMNS]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield list(chunk.itertuples(index=False, name=None))
+
+
+def upsert_games(conn, source):
+    """
+    CSV'yi (veya DataFrame'i) tek bir işlem içinde tabloya işler. Yalnızca yeni veya değeri değişen satırlara
+    yazılır; CSV'de artık bulunmayan oyunlar silinir. Sayaçları sözlük olarak döndürür.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    seen = set()
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    insert_sql = f"INSERT INTO {table_name} ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+    update_sql = (
+        f"UPDATE {table_name} SET {', '.join(f'{column} = ?' for column in VALUE_COLUMNS)} "
+        f"WHERE {KEY_COLUMN} = ?"
+    )
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        ensure_schema(conn)
+        conn.execute(f"CREATE TEMP TABLE loaded_keys ({KEY_COLUMN} TEXT PRIMARY KEY)")
+
+        for rows in read_chunks(source):
+            # Aynı oyun CSV'de birden fazla kez geçiyorsa ilk satır kullanılır
+            unique_rows = []
+            for row in rows:
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    unique_rows.append(row)
+            rows = unique_rows
+            if not rows:
+                continue
+            keys = [row[0] for row in rows]
+            existing = {
+                record[0]: record[1:]
+                for record in conn.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM {table_name} "
+                    f"WHERE {KEY_COLUMN} IN ({', '.join('?' for _ in keys)})",
+                    keys,
+                )
+            }
+
+            inserts = []
+            updates = []
+            for row in rows:
+                old_values = existing.get(row[0])
+                if old_values is None:
+                    inserts.append(row)
+                elif old_values != row[1:]:
+                    updates.append(row[1:] + (row[0],))
+                else:
+                    counts["unchanged"] += 1
+
+            conn.executemany(insert_sql, inserts)
+            conn.executemany(update_sql, updates)
+            conn.executemany("INSERT INTO temp.loaded_keys VALUES (?)", [(key,) for key in keys])
+            counts["inserted"] += len(inserts)
+            counts["updated"] += len(updates)
+
+        cursor = conn.execute(
+            f"DELETE FROM {table_name} WHERE {KEY_COLUMN} NOT IN (SELECT {KEY_COLUMN} FROM temp.loaded_keys)"
+        )
+        counts["deleted"] = cursor.rowcount
+        conn.execute("DROP TABLE temp.loaded_keys")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return counts
+
+
+def load_database(data=None, db_path=db_name, parquet=False, snapshots=snapshots_folder, max_compression=False):
+    """
+    Veritabanı aşaması: birleşik tabloyu (verilmezse merged_game_data.csv'yi) yükler, sayaçları döndürür.
+    parquet ise tablo merged_game_data.parquet'ten, yalnızca yüklenen sütunlar okunarak alınır
+    (Parquet merged_game_data.csv'den eskiyse CSV okunur).
+    snapshots verilirse yüklemeden sonra mağazanın statik katalog dosyaları (catalog_snapshots.py)
+    o klasöre yazılır; max_compression ise .br dosyaları en yüksek brotli seviyesiyle (yavaş) sıkıştırılır.
+    """
+    if data is None and parquet:
+        data = read_parquet("merged", COLUMNS, csv_path=csv_file)
+    # SQLite veritabanı bağlantısını oluştur
+    conn = connect(db_path)
+    try:
+        counts = upsert_games(conn, csv_file if data is None else data)
+        if snapshots:
+            print_stats(snapshots, export_snapshots(conn, snapshots, max_compression=max_compression))
+        return counts
+    finally:
+        # Veritabanını kapat
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="merged_game_data verisini game_data.db'ye yükler")
+    parser.add_argument("--parquet", action="store_true",
+                        help="CSV yerine merged_game_data.parquet'i okur (sayısal fiyatlar yeniden ayrıştırılmaz)")
+    parser.add_argument("--no-snapshots", action="store_true",
+                        help="Mağazanın statik katalog dosyalarını (catalog/) üretmez")
+    parser.add_argument("--max-compression", action="store_true",
+                        help="Katalog dosyalarının .br sürümlerini en yüksek brotli seviyesiyle yazar (yavaş)")
+    args = parser.parse_args()
+    counts = load_database(parquet=args.parquet, snapshots=None if args.no_snapshots else snapshots_folder,
+                           max_compression=args.max_compression)
+    total = counts["inserted"] + counts["updated"] + counts["unchanged"]
+    print(
+        f"[INFO] Veriler {db_name} veritabanında '{table_name}' tablosuna kaydedildi. Toplam {total} kayıt "
+        f"({counts['inserted']} eklendi, {counts['updated']} güncellendi, "
+        f"{counts['unchanged']} değişmedi, {counts['deleted']} silindi)."
+    )
 
-print(f"[INFO] Veriler {db_name} veritabanında '{table_name}' tablosuna kaydedildi. Toplam {len(filtered_data)} kayıt eklendi.")
 
-# Veritabanını kapat
-conn.close()
+if __name__ == "__main__":
+    main()
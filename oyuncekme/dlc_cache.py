@@ -0,0 +1,88 @@
+import re
+import sqlite3
+import time
+
+# Steam oyun sayfalarının DLC olup olmadığının çalıştırmalar arasında saklandığı veritabanı
+DLC_CACHE_FILE = "dlc_cache.db"
+# Bu süreden yeni kayıtlar için istek atılmaz; eskiler koşullu istekle doğrulanır
+DLC_CACHE_TTL = 7 * 24 * 60 * 60
+# Bu kadar yazmada bir işlem diske işlenir, yarıda kesilen çalıştırmada sonuçlar kaybolmaz
+COMMIT_INTERVAL = 200
+
+_APP_ID_PATTERN = re.compile(r"/app/(\d+)")
+
+
+def open_dlc_cache(path=DLC_CACHE_FILE):
+    """
+    DLC önbelleği veritabanını açar, tablo yoksa oluşturur.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dlc_cache (
+            app_id TEXT PRIMARY KEY,
+            is_dlc INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            etag TEXT,
+            last_modified TEXT
+        )
+    """)
+    return conn
+
+
+def app_id_from_url(url):
+    """
+    Steam mağaza URL'sinden uygulama kimliğini çıkarır; paket/bundle URL'lerinde None döner.
+    """
+    match = _APP_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def get_entry(conn, app_id):
+    row = conn.execute(
+        "SELECT is_dlc, fetched_at, etag, last_modified FROM dlc_cache WHERE app_id = ?", (app_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    return {"is_dlc": bool(row[0]), "fetched_at": row[1], "etag": row[2], "last_modified": row[3]}
+
+
+def is_fresh(entry, now=None):
+    return (now or time.time()) - entry["fetched_at"] < DLC_CACHE_TTL
+
+
+def conditional_headers(entry):
+    """
+    Önceki yanıtın ETag/Last-Modified değerlerinden koşullu istek başlıklarını üretir.
+    """
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def store_entry(conn, stats, app_id, is_dlc, etag=None, last_modified=None):
+    """
+    Sonucu kaydeder ve COMMIT_INTERVAL yazmada bir işlemi tamamlar.
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO dlc_cache (app_id, is_dlc, fetched_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+        (app_id, int(is_dlc), time.time(), etag, last_modified),
+    )
+    stats["stored"] += 1
+    if stats["stored"] % COMMIT_INTERVAL == 0:
+        conn.commit()
+
+
+def new_stats():
+    return {"hits": 0, "revalidated": 0, "misses": 0, "uncached": 0, "stored": 0}
+
+
+def print_stats(stats):
+    total = stats["hits"] + stats["revalidated"] + stats["misses"] + stats["uncached"]
+    print(
+        f"[INFO] DLC önbelleği: {total} kontrol - {stats['hits']} isabet, "
+        f"{stats['revalidated']} doğrulandı (304), {stats['misses']} indirildi, "
+        f"{stats['uncached']} önbelleğe alınamadı."
+    )
@@ -0,0 +1,131 @@
+import glob
+import json
+import os
+import time
+from urllib.parse import parse_qs, urlparse
+
+from lean_browser import read_network_log
+
+# Epic Games Store gözat sayfasını dolduran GraphQL katalog yanıtını (searchStoreQuery) okur.
+# Yanıt, Chrome performans günlüğündeki (goog:loggingPrefs) ağ olaylarından yakalanır ve
+# DOM'daki hash'li CSS sınıflarına bağlı kalmadan başlık, fiyat ve URL çıkarılır.
+# Ayrıştırma selenium gerektirmez; kaydedilmiş yanıtlar (catalog_*.json) üzerinde de çalışır.
+
+GRAPHQL_PATH = "/graphql"
+STORE_URL = "https://store.epicgames.com/tr/{section}/{slug}"
+POLL_FREQUENCY = 0.25
+
+
+def _search_store(payload):
+    try:
+        return payload["data"]["Catalog"]["searchStore"]
+    except (KeyError, TypeError):
+        return None
+
+
+def _page_slug(element):
+    """
+    Ürün sayfasının adresini belirleyen slug; mağaza kartlarındaki href ile aynı kaynaktan seçilir.
+    """
+    for mapping in (element.get("catalogNs") or {}).get("mappings") or []:
+        if mapping.get("pageType") == "productHome" and mapping.get("pageSlug"):
+            return mapping["pageSlug"]
+    for mapping in element.get("offerMappings") or []:
+        if mapping.get("pageSlug"):
+            return mapping["pageSlug"]
+    slug = element.get("productSlug") or element.get("urlSlug") or ""
+    return slug.split("/")[0]
+
+
+def _price(element):
+    """
+    Kartta görünen son fiyat ("₺67,00"); ücretsiz veya fiyatsız ürünlerde None (kartta fiyat etiketi yok).
+    """
+    total_price = (element.get("price") or {}).get("totalPrice") or {}
+    if not total_price.get("discountPrice"):
+        return None
+    return (total_price.get("fmtPrice") or {}).get("discountPrice")
+
+
+def parse_catalog_payload(payload):
+    """
+    searchStore yanıtındaki ürünleri DOM okuyucularıyla aynı ham kart biçiminde
+    (title, aria_label, price, url) sayfa sırasıyla döndürür.
+    """
+    search_store = _search_store(payload)
+    if search_store is None:
+        return []
+    cards = []
+    for element in search_store.get("elements") or []:
+        section = "bundles" if element.get("offerType") == "BUNDLE" else "p"
+        cards.append({
+            "title": element.get("title") or "",
+            "aria_label": None,
+            "price": _price(element),
+            "url": STORE_URL.format(section=section, slug=_page_slug(element)),
+        })
+    return cards
+
+
+def _page_start(page_url):
+    """
+    Gözat sayfası URL'sindeki start değeri (kayıt dosyası adı için).
+    """
+    try:
+        return int(parse_qs(urlparse(page_url).query).get("start", ["0"])[0])
+    except ValueError:
+        return 0
+
+
+def drain_network_log(driver):
+    """
+    Önceki sayfalardan kalan performans günlüğü kayıtlarını atar (aktarılan baytları sayıldıktan sonra).
+    """
+    read_network_log(driver)
+
+
+def wait_for_catalog(driver, timeout=20):
+    """
+    Performans günlüğünde searchStore içeren GraphQL yanıtı tamamlanana kadar bekler.
+    Yanıtı döndürür; süre dolarsa None.
+    """
+    candidates = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for method, params in read_network_log(driver):
+            if method == "Network.responseReceived":
+                if urlparse(params["response"]["url"]).path.endswith(GRAPHQL_PATH):
+                    candidates.add(params["requestId"])
+            elif method == "Network.loadingFinished" and params.get("requestId") in candidates:
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    payload = json.loads(body["body"])
+                except Exception:
+                    # Gövdesi alınamayan (yönlendirilen, önbellekten atılan) yanıtlar atlanır
+                    continue
+                if _search_store(payload) is not None:
+                    return payload
+        time.sleep(POLL_FREQUENCY)
+    return None
+
+
+def save_payload(folder, page_url, payload):
+    """
+    Yakalanan yanıtı catalog_<start>.json olarak kaydeder; --payloads ile yeniden oynatılabilir.
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"catalog_{_page_start(page_url):05d}.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, ensure_ascii=False)
+    return path
+
+
+def load_payloads(folder):
+    """
+    Kaydedilmiş yanıtları dosya adı (start) sırasıyla döndürür.
+    """
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(folder, "catalog_*.json"))):
+        with open(path, encoding="utf-8") as file:
+            payloads.append((path, json.load(file)))
+    return payloads
@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+# Kazıyıcıları canlı siteler yerine kayıtlı yanıtlarla çalıştırmak için kayıt arşivi ve yerel sunucu.
+# Arşivde her yanıt, orijinal URL'nin (sorgu parametreleri sıralanmış) özetiyle adlandırılan tek bir
+# gzip dosyasıdır: ilk satır JSON üst bilgi (url, durum, içerik tipi), kalanı ham gövde. Dizin
+# dosyası olmadığı için paralel tarayıcı süreçleri aynı arşive aynı anda yazabilir.
+#
+# Yerel sunucu http://127.0.0.1:<port>/<host>/<yol>?<sorgu> isteklerini https://<host>/<yol> için
+# kaydedilmiş yanıtla karşılar; kayıt modunda isteği siteye iletir ve yanıtı arşive yazar.
+# aiohttp istekleri (Steam) bu sunucu üzerinden kaydedilir; Selenium sayfalarında ise kazıyıcılar
+# render edilmiş HTML'i (driver.page_source) save_rendered ile aynı arşive yazar.
+
+FIXTURES_FOLDER = "fixtures"
+RESPONSES_FOLDER = "responses"
+# Epic ağ modunun katalog yanıtları (epic_catalog.save_payload) arşivde bu klasöre yazılır
+EPIC_PAYLOADS_FOLDER = "epic_catalog"
+# Kayıt sırasında kullanılan kazıyıcı ayarları (oyun sayısı, mod); oynatma aynı ayarlarla yapılmalı
+RUN_SETTINGS_FILE = "runs.json"
+RECORD_TIMEOUT = 30
+# Kayıtta siteye iletilen istek başlıkları. Koşullu başlıklar (If-None-Match vb.) iletilmez;
+# 304 yanıtı kaydedilirse boş DLC önbelleğiyle oynatmada gövde bulunamazdı.
+FORWARD_HEADERS = ["User-Agent", "Accept", "Accept-Language"]
+# Oynatmada Chrome'un yerel sunucu dışındaki adları çözmesini engeller (görsel, script, analitik istekleri)
+OFFLINE_HOST_RULES = "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"
+
+
+def fixture_key(url):
+    """
+    Arşiv anahtarı: şema olmadan host, yol ve sıralanmış sorgu ("host/yol?a=1&b=2").
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.netloc}{parts.path}" + (f"?{query}" if query else "")
+
+
+def fixture_path(folder, url):
+    digest = hashlib.sha1(fixture_key(url).encode("utf-8")).hexdigest()
+    return os.path.join(folder, RESPONSES_FOLDER, f"{digest}.gz")
+
+
+def save_response(folder, url, status, content_type, body):
+    """
+    Yanıtı arşive yazar; body metin ise UTF-8 olarak saklanır.
+    """
+    path = fixture_path(folder, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    meta = {"url": url, "status": status, "content_type": content_type}
+    # Yarım kalan yazım önceki kaydı bozmasın
+    with gzip.open(path + ".tmp", "wb") as file:
+        file.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + body)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def save_rendered(folder, url, html):
+    """
+    Selenium'un render ettiği sayfa HTML'ini, sayfanın URL'si için kaydedilmiş yanıt olarak yazar.
+    """
+    return save_response(folder, url, 200, "text/html; charset=utf-8", html)
+
+
+def has_response(folder, url):
+    return os.path.exists(fixture_path(folder, url))
+
+
+def load_response(folder, url):
+    """
+    Kaydedilmiş yanıtı (üst bilgi, gövde baytları) olarak döndürür; kayıt yoksa None.
+    """
+    path = fixture_path(folder, url)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rb") as file:
+        meta, _, body = file.read().partition(b"\n")
+    return json.loads(meta), body
+
+
+def save_run_settings(folder, scraper, settings):
+    """
+    Kazıyıcının kayıt ayarlarını arşivin runs.json dosyasına yazar (diğer kazıyıcılarınki korunur).
+    """
+    runs = {}
+    path = os.path.join(folder, RUN_SETTINGS_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            runs = json.load(file)
+    runs[scraper] = settings
+    os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(runs, file, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def load_run_settings(folder, scraper):
+    """
+    Kazıyıcının kayıt ayarlarını döndürür; kaydedilmemişse boş sözlük.
+    """
+    path = os.path.join(folder, RUN_SETTINGS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file).get(scraper, {})
+
+
+def target_url(base, url):
+    """
+    base (yerel sunucu adresi) verilirse URL'yi sunucu üzerinden gidecek şekilde yeniden yazar,
+    verilmezse URL'yi olduğu gibi döndürür.
+    """
+    if not base:
+        return url
+    parts = urlsplit(url)
+    return f"{base}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _original_url(path):
+    # "/host/yol?sorgu" -> "https://host/yol?sorgu"
+    return "https://" + path.lstrip("/")
+
+
+def start_server(folder, record=False, port=0):
+    """
+    Arşivi sunan yerel HTTP sunucusunu arka planda başlatır; record ise her istek siteye iletilir
+    ve yanıtı arşive kaydedilir. Sunucu bilgilerini sözlük olarak döndürür, adresi "base" anahtarındadır.
+    """
+    lock = threading.Lock()
+    stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = _original_url(self.path)
+            if record:
+                headers = {name: self.headers[name] for name in FORWARD_HEADERS if self.headers[name]}
+                try:
+                    response = requests.get(url, headers=headers, timeout=RECORD_TIMEOUT)
+                except requests.RequestException as e:
+                    print(f"[ERROR] Kayıt isteği başarısız ({url}): {e}")
+                    self.send_error(502)
+                    return
+                content_type = response.headers.get("Content-Type", "application/octet-stream")
+                save_response(folder, url, response.status_code, content_type, response.content)
+                status, body = response.status_code, response.content
+                counter = "recorded"
+            else:
+                found = load_response(folder, url)
+                if found is None:
+                    print(f"[WARNING] Arşivde kayıt yok: {fixture_key(url)}")
+                    with lock:
+                        stats["misses"] += 1
+                    self.send_error(404)
+                    return
+                meta, body = found
+                status, content_type = meta["status"], meta["content_type"]
+                counter = "hits"
+            with lock:
+                stats[counter] += 1
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Her istek için erişim günlüğü yazılmaz
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"[INFO] Kayıt sunucusu {'kayıt' if record else 'oynatma'} modunda: {base} ({folder})")
+    return {"server": server, "thread": thread, "base": base, "stats": stats, "record": record}
+
+
+def stop_server(stub):
+    """
+    Sunucuyu kapatır ve istek sayılarını yazdırır.
+    """
+    stub["server"].shutdown()
+    stub["server"].server_close()
+    stub["thread"].join()
+    stats = stub["stats"]
+    if stub["record"]:
+        print(f"[INFO] Kayıt sunucusu: {stats['recorded']} yanıt kaydedildi.")
+    else:
+        print(f"[INFO] Kayıt sunucusu: {stats['hits']} yanıt arşivden verildi, {stats['misses']} istek arşivde yoktu.")
@@ -0,0 +1,137 @@
+import base64
+import json
+import re
+
+# game_data.db üzerinde filtreli, sıralı ve keyset sayfalı oyun sorguları.
+# my-game-store/pages/api/games.js aynı parametreleri ve imleç biçimini kullanır.
+
+TABLE = "games"
+FTS_TABLE = "games_fts"
+SELECT_COLUMNS = ["oyun_adi", "steam_fiyati", "epic_fiyati", "metascore", "steam_url", "epic_url",
+                  "steam_fiyati_tutar", "epic_fiyati_tutar"]
+SORT_COLUMNS = {
+    "name": "oyun_adi",
+    "metascore": "metascore",
+    "steam_price": "steam_fiyati_tutar",
+    "epic_price": "epic_fiyati_tutar",
+}
+PLATFORM_COLUMNS = {"steam": "steam_fiyati_tutar", "epic": "epic_fiyati_tutar"}
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def encode_cursor(phase, value, name):
+    """
+    Sayfanın son satırından bir sonraki sayfanın imlecini üretir.
+    phase: sıralama değeri dolu satırlar için "value", boş (NULL) olanlar için "null".
+    """
+    payload = json.dumps([phase, value, name], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    encode_cursor ile üretilmiş imleci (phase, value, name) olarak çözer.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    phase, value, name = json.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
+    if phase not in ("value", "null"):
+        raise ValueError(f"Geçersiz imleç: {cursor}")
+    return phase, value, name
+
+
+def fts_query(text):
+    """
+    Kullanıcı aramasını her kelimeyi önek olarak arayan güvenli bir FTS5 ifadesine çevirir.
+    """
+    return " ".join(f'"{word}"*' for word in _WORD_PATTERN.findall(text))
+
+
+def _filters(search, platform, min_metascore, max_price):
+    """
+    Filtre parametrelerinden WHERE koşullarını ve parametrelerini üretir.
+    max_price bir platformun fiyatına uygulanır; Steam USD, Epic TRY listelediği için platformsuz verilemez.
+    """
+    conditions = []
+    params = []
+    match = fts_query(search) if search else ""
+    if match:
+        conditions.append(f"rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)")
+        params.append(match)
+    price_column = PLATFORM_COLUMNS.get(platform)
+    if price_column:
+        conditions.append(f"{price_column} IS NOT NULL")
+    if min_metascore is not None:
+        conditions.append("metascore >= ?")
+        params.append(min_metascore)
+    if max_price is not None:
+        if not price_column:
+            raise ValueError("Fiyat sınırı için platform (steam veya epic) seçilmeli; para birimleri farklı.")
+        conditions.append(f"{price_column} <= ?")
+        params.append(max_price)
+    return conditions, params
+
+
+def _fetch(conn, conditions, params, order_by, limit):
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT {', '.join(SELECT_COLUMNS)} FROM {TABLE} {where} ORDER BY {order_by} LIMIT ?"
+    cursor = conn.execute(sql, params + [limit])
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def query_games(conn, search=None, platform="all", min_metascore=None, max_price=None,
+                sort="metascore", order="desc", limit=DEFAULT_LIMIT, cursor=None):
+    """
+    Oyunları filtreleyip sıralar ve tek bir sayfa döndürür: {"items": [...], "next_cursor": ...}.
+
+    Sayfalama OFFSET yerine (sıralama sütunu, oyun adı) anahtarıyla yapılır, böylece her sayfa
+    ilgili indeksten doğrudan okunur. Sıralama değeri boş olan oyunlar her zaman en sona gelir.
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Geçersiz sıralama: {sort}")
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Geçersiz sıralama yönü: {order}")
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    sort_column = SORT_COLUMNS[sort]
+    direction = order.upper()
+    comparison = "<" if order == "desc" else ">"
+    phase, last_value, last_name = decode_cursor(cursor) if cursor else ("value", None, None)
+
+    conditions, params = _filters(search, platform, min_metascore, max_price)
+    items = []
+
+    if phase == "value":
+        value_conditions = list(conditions)
+        value_params = list(params)
+        if sort_column != "oyun_adi":
+            value_conditions.append(f"{sort_column} IS NOT NULL")
+        if last_name is not None:
+            if sort_column == "oyun_adi":
+                value_conditions.append(f"oyun_adi {comparison} ?")
+                value_params.append(last_name)
+            else:
+                value_conditions.append(f"({sort_column}, oyun_adi) {comparison} (?, ?)")
+                value_params.extend([last_value, last_name])
+        order_by = "oyun_adi" if sort_column == "oyun_adi" else f"{sort_column} {direction}, oyun_adi"
+        items = _fetch(conn, value_conditions, value_params, f"{order_by} {direction}", limit + 1)
+        # Bir sonraki aşamada NULL değerliler baştan okunur
+        last_name = None
+
+    if len(items) <= limit and sort_column != "oyun_adi":
+        null_conditions = conditions + [f"{sort_column} IS NULL"]
+        null_params = list(params)
+        if last_name is not None:
+            null_conditions.append(f"oyun_adi {comparison} ?")
+            null_params.append(last_name)
+        items += _fetch(conn, null_conditions, null_params, f"oyun_adi {direction}", limit + 1 - len(items))
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        last_sort_value = last[sort_column]
+        next_cursor = encode_cursor("null" if last_sort_value is None else "value", last_sort_value, last["oyun_adi"])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,198 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+# Steam istemcisi için bağlantı havuzu ve uyarlanır eşzamanlılık sınırı (AIMD).
+# İlk tıkanıklığa kadar sınır her başarılı yanıtta bir artar (yavaş başlangıç), sonrasında yanıtlar hızlı
+# ve başarılı geldikçe her "sınır" kadar başarıda bir artar. 429/5xx veya zaman aşımında yarıya iner ve
+# istek Retry-After'a (yoksa üstel beklemeye) göre yeniden denenir; 429 tüm istekleri durdurur, çünkü
+# Steam sınırı istemci başına uygular. Böylece önce ani yüklenip sonra hatalara düşmek yerine
+# kısıtlanmadan taşınabilen en yüksek hıza oturulur.
+
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 64
+DNS_CACHE_TTL = 300  # saniye
+KEEPALIVE_TIMEOUT = 30  # saniye; boşta kalan bağlantılar bu kadar açık tutulur
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=20)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 60
+
+INITIAL_CONCURRENCY = 16
+MIN_CONCURRENCY = 1
+DECREASE_FACTOR = 0.5
+# Aynı tıkanıklığa ait art arda gelen hatalar sınırı bu süre içinde yalnızca bir kez düşürür
+DECREASE_INTERVAL = 1.0
+# Yanıt süresi gözlenen en iyinin bu katını aşarsa sınır artırılmaz (sunucu yavaşlamaya başlamış)
+SLOW_FACTOR = 3
+# İstek/saniye bu kadar saniyelik kayan pencerede ölçülür
+RATE_WINDOW = 5.0
+STATS_INTERVAL = 0.5
+
+
+def create_client(headers=None, maximum=MAX_CONNECTIONS_PER_HOST, initial=INITIAL_CONCURRENCY):
+    """
+    Ayarlı bağlantı havuzlu oturumu ve uyarlanır sınırlayıcıyı sözlük olarak döndürür.
+    Çalışan olay döngüsü içinde çağrılmalı ve close_client ile kapatılmalıdır.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return {
+        "session": aiohttp.ClientSession(headers=headers, connector=connector, timeout=REQUEST_TIMEOUT),
+        "limit": float(initial),
+        "maximum": maximum,
+        "in_flight": 0,
+        "condition": asyncio.Condition(),
+        "paused_until": 0.0,
+        "last_decrease": 0.0,
+        "best_latency": None,
+        "slow_start": True,
+        "completed": deque(),
+        "stats": {"requests": 0, "throttled": 0, "errors": 0, "retries": 0, "failed": 0},
+    }
+
+
+async def close_client(client):
+    await client["session"].close()
+
+
+def retry_delay(headers, attempt):
+    """
+    Retry-After (saniye veya HTTP tarihi) varsa onu, yoksa titreşimli üstel beklemeyi döndürür.
+    """
+    retry_after = headers.get("Retry-After") if headers else None
+    if retry_after:
+        try:
+            return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(MAX_BACKOFF, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    return min(MAX_BACKOFF, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+async def _acquire(client):
+    # 429 sonrası ortak bekleme bitene kadar yeni istek açılmaz
+    while (pause := client["paused_until"] - time.monotonic()) > 0:
+        await asyncio.sleep(pause)
+    async with client["condition"]:
+        await client["condition"].wait_for(lambda: client["in_flight"] < int(client["limit"]))
+        client["in_flight"] += 1
+
+
+async def _release(client, congested, latency):
+    """
+    İsteğin yuvasını bırakır ve sonucuna göre sınırı ayarlar; congested None ise (istek iptal edildi)
+    sınır ve istatistikler değişmez.
+    """
+    # Sayaç kilit beklenmeden düşer; bırakma sırasında yeniden iptal edilse de yuva sızmaz
+    client["in_flight"] -= 1
+    now = time.monotonic()
+    if congested:
+        if now - client["last_decrease"] > DECREASE_INTERVAL:
+            client["limit"] = max(MIN_CONCURRENCY, client["limit"] * DECREASE_FACTOR)
+            client["last_decrease"] = now
+        client["slow_start"] = False
+    elif congested is not None:
+        best = client["best_latency"]
+        client["best_latency"] = latency if best is None else min(best, latency)
+        if latency <= client["best_latency"] * SLOW_FACTOR:
+            step = 1 if client["slow_start"] else 1 / client["limit"]
+            client["limit"] = min(client["maximum"], client["limit"] + step)
+    if congested is not None:
+        client["completed"].append(now)
+    async with client["condition"]:
+        client["condition"].notify_all()
+
+
+async def fetch(client, url, params=None, headers=None):
+    """
+    GET isteğini sınırlayıcı üzerinden atar; 429/5xx ve bağlantı hatalarında yeniden dener.
+    (durum kodu, yanıt başlıkları, gövde metni) döndürür; gövde yalnızca 200 yanıtlarında okunur.
+    Denemeler tükenirse son durum kodu döner, hiç yanıt alınamadıysa son hata fırlatılır.
+    """
+    stats = client["stats"]
+    for attempt in range(MAX_RETRIES + 1):
+        await _acquire(client)
+        start = time.monotonic()
+        status, response_headers, body, error, congested = None, {}, None, None, None
+        try:
+            try:
+                async with client["session"].get(url, params=params, headers=headers) as response:
+                    status, response_headers = response.status, response.headers
+                    if status == 200:
+                        body = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            congested = error is not None or status in RETRY_STATUS_CODES
+        finally:
+            # İptal edilen istek (CancelledError) de yuvasını bırakır; yoksa sınır kalıcı olarak daralırdı
+            await _release(client, congested, time.monotonic() - start)
+        stats["requests"] += 1
+        if not congested:
+            return status, response_headers, body
+
+        if status == 429:
+            stats["throttled"] += 1
+        else:
+            stats["errors"] += 1
+        if attempt == MAX_RETRIES:
+            break
+        delay = retry_delay(response_headers, attempt)
+        if status == 429:
+            client["paused_until"] = max(client["paused_until"], time.monotonic() + delay)
+        stats["retries"] += 1
+        await asyncio.sleep(delay)
+
+    stats["failed"] += 1
+    if error is not None:
+        raise error
+    return status, response_headers, body
+
+
+def live_stats(client):
+    """
+    tqdm çubuğunda gösterilecek anlık değerler: açık istek, sınır, istek/saniye, hata oranı.
+    """
+    now = time.monotonic()
+    completed = client["completed"]
+    while completed and completed[0] < now - RATE_WINDOW:
+        completed.popleft()
+    stats = client["stats"]
+    failures = stats["throttled"] + stats["errors"]
+    return {
+        "açık": client["in_flight"],
+        "sınır": int(client["limit"]),
+        "rps": f"{len(completed) / RATE_WINDOW:.1f}",
+        "hata": f"{failures / stats['requests']:.1%}" if stats["requests"] else "0.0%",
+    }
+
+
+async def report_stats(client, pbar):
+    """
+    İstatistikleri tarama boyunca tqdm çubuğunda günceller; iptal edilene kadar çalışır.
+    """
+    while True:
+        pbar.set_postfix(live_stats(client), refresh=True)
+        await asyncio.sleep(STATS_INTERVAL)
+
+
+def print_stats(client):
+    stats = client["stats"]
+    print(
+        f"[INFO] HTTP: {stats['requests']} istek, {stats['throttled']} kısıtlama (429), {stats['errors']} hata, "
+        f"{stats['retries']} yeniden deneme; son eşzamanlılık sınırı {int(client['limit'])}."
+    )
+    if stats["failed"]:
+        print(f"[WARNING] {stats['failed']} istek yeniden denemelere rağmen başarısız oldu.")
@@ -0,0 +1,249 @@
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from image_store import IMAGE_EXTENSIONS, load_manifest, save_manifest, store_chunks
+from thumbnails import generate_thumbnails
+
+# Metacritic kapak görsellerini sayfa taramasından bağımsız, paralel ve kaldığı yerden devam
+# edebilen bir aşama olarak indirir. Görseller image_store deposuna içerik özetiyle yazılır.
+
+metacritic_file = "metacritic_games.csv"
+images_folder = "gorseller"
+
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 6
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+REQUEST_TIMEOUT = 15
+STREAM_CHUNK_SIZE = 64 * 1024
+# Bu kadar indirmede bir manifest diske yazılır; yarıda kalan çalıştırmalar buradan devam eder
+MANIFEST_SAVE_INTERVAL = 50
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.5938.62 Safari/537.36',
+    'Referer': 'https://www.metacritic.com/'
+}
+
+_thread_local = threading.local()
+
+
+def sanitize_filename(name):
+    """
+    Dosya adında kullanılmaması gereken karakterleri temizler.
+    """
+    return re.sub(r'[\\/*?:"<>|]', "", name)
+
+
+def absolute_image_url(image_url):
+    """
+    Relatif görsel URL'lerini mutlak URL'ye çevirir; geçersiz biçimlerde None döner.
+    """
+    if not image_url:
+        return None
+    if image_url.startswith('//'):
+        return 'https:' + image_url
+    if image_url.startswith('/'):
+        return 'https://www.metacritic.com' + image_url
+    if not image_url.startswith('http'):
+        return None
+    return image_url
+
+
+def plan_downloads(games, used_names):
+    """
+    Oyun listesinden (oyun adı, URL, görsel adı, uzantı) görevlerini üretir.
+    Görsel adları oyun adından belirlenir, böylece tekrar çalıştırmada manifest kaydı bulunur.
+    Aynı ada sahip farklı görseller geliş sıralarına göre _1, _2 ekini alır (bellekte, diske sormadan).
+    """
+    tasks = []
+    for game in games:
+        game_name = game['Game Name']
+        image_url = absolute_image_url(game.get('Image URL'))
+        if not image_url:
+            print(f"Görsel URL'si mevcut değil veya geçersiz, indirilmeyecek: {game_name}")
+            continue
+
+        ext = os.path.splitext(urlsplit(image_url).path)[1]
+        if ext.lower() not in IMAGE_EXTENSIONS:
+            ext = '.jpg'
+        safe_game_name = sanitize_filename(game_name)
+        image_name = f"{safe_game_name}{ext}"
+        counter = 1
+        while image_name in used_names:
+            image_name = f"{safe_game_name}_{counter}{ext}"
+            counter += 1
+        used_names.add(image_name)
+        tasks.append((game_name, image_url, image_name, ext))
+    return tasks
+
+
+def save_progress(downloader):
+    with downloader["lock"]:
+        manifest = {"images": dict(downloader["manifest"]["images"])}
+    save_manifest(downloader["folder"], manifest)
+
+
+def start_downloader(folder_path, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT):
+    """
+    İndirme havuzunu başlatır. Görevler submit_downloads ile eklenir, finish_downloader ile beklenir.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    return {
+        "folder": folder_path,
+        "executor": ThreadPoolExecutor(max_workers=max_workers),
+        "per_host_limit": per_host_limit,
+        "host_limits": {},
+        "lock": threading.Lock(),
+        "manifest": load_manifest(folder_path),
+        "planned_names": set(),
+        "stats": {"downloaded": 0, "duplicates": 0, "skipped": 0, "failed": 0, "bytes": 0},
+        "completed": 0,
+        "started": time.perf_counter(),
+    }
+
+
+def _session():
+    # requests.Session iş parçacıkları arasında paylaşılmaz
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
+def _host_limit(downloader, url):
+    host = urlsplit(url).netloc
+    with downloader["lock"]:
+        if host not in downloader["host_limits"]:
+            downloader["host_limits"][host] = threading.BoundedSemaphore(downloader["per_host_limit"])
+        return downloader["host_limits"][host]
+
+
+def _is_current(downloader, entry, image_url):
+    return (entry is not None and entry.get("url") == image_url
+            and os.path.exists(os.path.join(downloader["folder"], entry["path"])))
+
+
+def _fetch(downloader, image_url, ext, entry):
+    """
+    Görseli indirip depoya yazar. (sonuç, bayt, manifest kaydı) döndürür.
+    Sunucu ETag ile değişmediğini bildirirse mevcut kayıt korunur.
+    """
+    headers = dict(HEADERS)
+    if _is_current(downloader, entry, image_url) and entry.get("etag"):
+        headers['If-None-Match'] = entry["etag"]
+
+    with _host_limit(downloader, image_url):
+        with _session().get(image_url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 304:
+                return "skipped", 0, entry
+            response.raise_for_status()
+            relative_path, digest, size, written = store_chunks(
+                downloader["folder"], response.iter_content(STREAM_CHUNK_SIZE), ext
+            )
+            record = {"path": relative_path, "hash": digest, "ext": ext.lower(), "size": size,
+                      "url": image_url, "etag": response.headers.get('ETag')}
+            return "downloaded" if written else "duplicates", size, record
+
+
+def download_image(downloader, game_name, image_url, image_name, ext):
+    """
+    Tek bir görseli yeniden deneme ve üstel geri çekilme ile indirir.
+    """
+    with downloader["lock"]:
+        entry = downloader["manifest"]["images"].get(image_name)
+    if _is_current(downloader, entry, image_url) and not entry.get("etag"):
+        outcome, size, record = "skipped", 0, entry
+    else:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                outcome, size, record = _fetch(downloader, image_url, ext, entry)
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                status = getattr(e.response, 'status_code', None)
+                retryable = status is None or status in RETRY_STATUS_CODES
+                if not retryable or attempt == MAX_RETRIES:
+                    print(f"Görsel indirilemedi ({game_name}): {e}")
+                    outcome, size, record = "failed", 0, None
+                    break
+                # Geri çekilme süresinde host sınırı tutulmaz
+                time.sleep(BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE))
+            except Exception as e:
+                print(f"Görsel indirilemedi ({game_name}): {e}")
+                outcome, size, record = "failed", 0, None
+                break
+
+    with downloader["lock"]:
+        stats = downloader["stats"]
+        stats[outcome] += 1
+        stats["bytes"] += size
+        if record is not None:
+            downloader["manifest"]["images"][image_name] = record
+        downloader["completed"] += 1
+        save_now = downloader["completed"] % MANIFEST_SAVE_INTERVAL == 0
+    if outcome == "downloaded":
+        print(f"Görsel indirildi: {image_name} -> {record['path']}")
+    if save_now:
+        save_progress(downloader)
+    return outcome
+
+
+def submit_downloads(downloader, games):
+    """
+    Oyunların görsellerini havuza ekler; çağıran (ör. Selenium döngüsü) beklemeden devam eder.
+    """
+    tasks = plan_downloads(games, downloader["planned_names"])
+    for game_name, image_url, image_name, ext in tasks:
+        downloader["executor"].submit(download_image, downloader, game_name, image_url, image_name, ext)
+
+
+def finish_downloader(downloader):
+    """
+    Tüm görevlerin bitmesini bekler, durumu kaydeder ve verim raporunu yazdırır.
+    """
+    downloader["executor"].shutdown(wait=True)
+    save_progress(downloader)
+    stats = downloader["stats"]
+    elapsed = time.perf_counter() - downloader["started"]
+    total = stats["downloaded"] + stats["duplicates"] + stats["skipped"] + stats["failed"]
+    megabytes = stats["bytes"] / (1024 * 1024)
+    rate = total / elapsed if elapsed > 0 else float("inf")
+    throughput = megabytes / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"[INFO] {total} görsel işlendi ({stats['downloaded']} indirildi, {stats['duplicates']} mevcut nesneyle aynı, "
+        f"{stats['skipped']} zaten güncel, {stats['failed']} başarısız) - {elapsed:.1f} s, {rate:.1f} görsel/s, "
+        f"{megabytes:.1f} MB, {throughput:.2f} MB/s"
+    )
+    return stats
+
+
+def load_games(path):
+    """
+    metacritic.py çıktısını okur; dosyada başlık satırı olsa da olmasa da çalışır.
+    """
+    games = pd.read_csv(path, header=None, names=['Game Name', 'Metascore', 'Image URL'], encoding='utf-8-sig')
+    games = games[games['Game Name'] != 'Game Name']
+    games = games.astype(object).where(games.notna(), None)
+    return games.to_dict('records')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metacritic kapak görsellerini paralel indirir")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Eşzamanlı indirme sayısı")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT, help="Aynı sunucuya eşzamanlı istek sınırı")
+    args = parser.parse_args()
+
+    downloader = start_downloader(images_folder, args.workers, args.per_host)
+    submit_downloads(downloader, load_games(metacritic_file))
+    finish_downloader(downloader)
+    generate_thumbnails(images_folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+# Görselleri içerik özetine (SHA-256) göre saklayan depo.
+# Aynı bayt dizisi yalnızca bir kez yazılır; manifest.json görünen dosya adını
+# ("Halo 3.jpg") depodaki nesneye eşler, böylece aramalar dosya sistemine dokunmadan yapılır.
+
+images_folder = "gorseller"
+MANIFEST_FILE = "manifest.json"
+OBJECTS_DIR = "objects"
+READ_CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
+
+
+def object_path(digest, ext):
+    """
+    Nesnenin görsel klasörüne göre yolunu döndürür (ör. objects/ab/ab12...ef.jpg).
+    İlk iki karakter alt klasör olduğundan tek bir klasörde binlerce dosya birikmez.
+    """
+    return f"{OBJECTS_DIR}/{digest[:2]}/{digest}{ext.lower()}"
+
+
+def load_manifest(folder_path):
+    manifest_path = os.path.join(folder_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {"images": {}}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(folder_path, manifest):
+    """
+    Manifesti geçici dosyaya yazıp atomik olarak yerine taşır; okuyucular yarım dosya görmez.
+    """
+    manifest_path = os.path.join(folder_path, MANIFEST_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=folder_path, prefix=".manifest-", suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    # mkstemp dosyayı yalnızca sahibine açar; mağazayı sunan kullanıcı da okuyabilmeli
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, manifest_path)
+
+
+def store_chunks(folder_path, chunks, ext):
+    """
+    Bayt parçalarını özet hesaplanırken geçici dosyaya akıtır.
+    Nesne zaten varsa geçici dosya silinir (yazma maliyeti yok), yoksa atomik olarak yerine taşınır.
+    (nesne yolu, özet, bayt, yeni yazıldı mı) döndürür.
+    """
+    objects_root = os.path.join(folder_path, OBJECTS_DIR)
+    os.makedirs(objects_root, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=objects_root, suffix=".part")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        relative_path = object_path(digest.hexdigest(), ext)
+        final_path = os.path.join(folder_path, relative_path)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            return relative_path, digest.hexdigest(), size, False
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return relative_path, digest.hexdigest(), size, True
+
+
+def _read_chunks(path):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def import_loose_images(folder_path, remove_loose=False):
+    """
+    Klasörün kökündeki eski (ada göre kaydedilmiş) görselleri depoya taşır ve manifeste ekler.
+    Aynı içerikli dosyalar tek nesneye iner. remove_loose verilirse kök dosyalar silinir.
+    """
+    manifest = load_manifest(folder_path)
+    counts = {"imported": 0, "duplicates": 0, "bytes_saved": 0}
+    for file_name in sorted(os.listdir(folder_path)):
+        source_path = os.path.join(folder_path, file_name)
+        ext = os.path.splitext(file_name)[1]
+        if ext.lower() not in IMAGE_EXTENSIONS or not os.path.isfile(source_path):
+            continue
+        relative_path, digest, size, written = store_chunks(folder_path, _read_chunks(source_path), ext)
+        manifest["images"][file_name] = {"path": relative_path, "hash": digest, "ext": ext.lower(), "size": size}
+        counts["imported"] += 1
+        if not written:
+            counts["duplicates"] += 1
+            counts["bytes_saved"] += size
+        if remove_loose:
+            os.remove(source_path)
+    save_manifest(folder_path, manifest)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ada göre kaydedilmiş görselleri içerik adresli depoya taşır")
+    parser.add_argument("--folder", default=images_folder, help="Görsel klasörü")
+    parser.add_argument("--remove-loose", action="store_true", help="Depoya alınan kök dosyaları siler")
+    args = parser.parse_args()
+
+    counts = import_loose_images(args.folder, args.remove_loose)
+    print(
+        f"[INFO] {counts['imported']} görsel depoya alındı; {counts['duplicates']} kopya tek nesneye indirildi "
+        f"({counts['bytes_saved'] / 1024:.0f} KB kazanç)."
+    )
+
+
+if __name__ == "__main__":
+    main()
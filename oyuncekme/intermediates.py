@@ -0,0 +1,131 @@
+import os
+
+import pandas as pd
+
+from prices import parse_price
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow yoksa aşamalar arasında yalnızca CSV kullanılır
+    pa = None
+
+# Aşamalar arası sabit şemalı Parquet ara dosyaları. Fiyat metni bir kez (kazıyıcıda) tutar ve
+# para birimine çözülür; birleştirme ve veritabanı yüklemesi dosyaları bellek eşlemeli açıp
+# yalnızca ihtiyaç duydukları sütunları okur. CSV dosyaları yazılmaya devam eder.
+
+PARQUET_FILES = {
+    "steam": "steamverisi.parquet",
+    "epic": "epic_games_results.parquet",
+    "metacritic": "metacritic_games.parquet",
+    "merged": "merged_game_data.parquet",
+}
+SOURCES = ["steam", "epic", "metacritic"]
+
+if pa is not None:
+    # Üç kazıyıcının ortak şeması; kaynakta olmayan alanlar boş kalır
+    SOURCE_SCHEMA = pa.schema([
+        ("oyun_adi", pa.string()),
+        ("fiyat", pa.string()),
+        ("fiyat_tutar", pa.float64()),
+        ("para_birimi", pa.dictionary(pa.int8(), pa.string())),
+        ("url", pa.string()),
+        ("metascore", pa.int16()),
+        ("gorsel_url", pa.string()),
+        ("kaynak", pa.dictionary(pa.int8(), pa.string())),
+    ])
+    MERGED_SCHEMA = pa.schema([
+        ("oyun_adi", pa.string()),
+        ("steam_fiyati", pa.string()),
+        ("epic_fiyati", pa.string()),
+        ("metascore", pa.int16()),
+        ("steam_url", pa.string()),
+        ("epic_url", pa.string()),
+        ("steam_fiyati_tutar", pa.float64()),
+        ("epic_fiyati_tutar", pa.float64()),
+        # Steam USD, Epic TRY listeler; tutarlar ancak para birimi aynıysa karşılaştırılabilir
+        ("steam_para_birimi", pa.dictionary(pa.int8(), pa.string())),
+        ("epic_para_birimi", pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet ara dosyaları için pyarrow kurulu olmalı (pip install pyarrow).")
+
+
+def typed_source(frame, source):
+    """
+    Kazıyıcının CSV düzenindeki DataFrame'ini (ad, fiyat/metascore, URL) ortak tipli şemaya çevirir.
+    """
+    rows = len(frame)
+    empty = pd.Series([None] * rows, dtype="string")
+    if source == "metacritic":
+        price_text, url, image_url = empty, empty, frame.iloc[:, 2].astype("string")
+        # "tbd" gibi puanı olmayan satırlar boş kalır
+        metascore = pd.to_numeric(frame.iloc[:, 1], errors="coerce").round().astype("Int16")
+    else:
+        price_text, url, image_url = frame.iloc[:, 1].astype("string"), frame.iloc[:, 2].astype("string"), empty
+        metascore = pd.Series([None] * rows, dtype="Int16")
+
+    parsed = [parse_price(text if isinstance(text, str) else None) for text in price_text.tolist()]
+    return pd.DataFrame({
+        "oyun_adi": frame.iloc[:, 0].astype("string").reset_index(drop=True),
+        "fiyat": price_text.reset_index(drop=True),
+        "fiyat_tutar": pd.Series([amount for amount, _ in parsed], dtype="float64"),
+        "para_birimi": pd.Categorical([currency for _, currency in parsed]),
+        "url": url.reset_index(drop=True),
+        "metascore": metascore.reset_index(drop=True),
+        "gorsel_url": image_url.reset_index(drop=True),
+        "kaynak": pd.Categorical([source] * rows, categories=SOURCES),
+    })
+
+
+def _write(frame, schema, path):
+    table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+    # Yarım kalan yazım önceki dosyayı bozmasın
+    pq.write_table(table, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def write_source(frame, source, path=None):
+    """
+    Kazıyıcı çıktısını tipli Parquet olarak yazar ve dosya yolunu döndürür.
+    """
+    _require_pyarrow()
+    return _write(typed_source(frame, source), SOURCE_SCHEMA, path or PARQUET_FILES[source])
+
+
+def write_merged(frame, path=None):
+    """
+    Birleşik tabloyu tipli Parquet olarak yazar; tutar ve para birimi sütunları yoksa metinden hesaplanır.
+    """
+    _require_pyarrow()
+    frame = frame.copy()
+    for platform in ("steam", "epic"):
+        text = f"{platform}_fiyati"
+        if f"{text}_tutar" not in frame.columns:
+            frame[f"{text}_tutar"] = frame[text].map(lambda value: parse_price(value)[0])
+        if f"{platform}_para_birimi" not in frame.columns:
+            frame[f"{platform}_para_birimi"] = frame[text].map(lambda value: parse_price(value)[1])
+    frame["metascore"] = pd.to_numeric(frame["metascore"], errors="coerce").round().astype("Int16")
+    return _write(frame[MERGED_SCHEMA.names], MERGED_SCHEMA, path or PARQUET_FILES["merged"])
+
+
+def read_parquet(name, columns=None, path=None, csv_path=None):
+    """
+    Ara dosyayı bellek eşlemeli açar ve yalnızca istenen sütunları DataFrame olarak okur.
+    Dosya yoksa ya da aynı aşamanın CSV'si (csv_path) ondan yeniyse None döner (çağıran CSV'ye düşer);
+    örneğin kazıyıcı --parquet olmadan yeniden çalıştırıldıysa eski Parquet okunmaz.
+    """
+    _require_pyarrow()
+    path = path or PARQUET_FILES[name]
+    if not os.path.exists(path):
+        return None
+    if csv_path and os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+        print(f"[WARNING] {path}, {csv_path} dosyasından eski; CSV okunuyor.")
+        return None
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    # metascore boşlukları float yerine pandas nullable Int16 olarak kalır
+    return table.to_pandas(types_mapper={pa.int16(): pd.Int16Dtype()}.get)
@@ -0,0 +1,135 @@
+import json
+import os
+
+# Selenium kazıyıcıları için hafif tarayıcı modu (--lean). Kazıyıcılar yalnızca DOM metnini ve img
+# src özniteliklerini okuduğu için görsel, yazı tipi, video ve takip istekleri CDP Network.setBlockedURLs
+# ile hiç yapılmaz (öznitelikler yine okunur), tarayıcı headless çalışır ve disk önbelleği çalıştırmalar
+# arasında saklanır. Her sayfanın yükleme süresi ve istek sayısı, mod açık olsun olmasın Resource
+# Timing API'sinden, ağdan aktarılan baytı ise Chrome performans günlüğündeki Network.loadingFinished
+# olaylarından okunur (read_page_stats) ve sayfa ölçümlerine (page_metrics.py) yazılır. Resource Timing'in
+# transferSize değeri Timing-Allow-Origin göndermeyen CDN'lerde 0 olduğundan bayt için kullanılmaz.
+
+# Disk önbelleği (ör. browser_cache/metacritic_0); aynı önbelleği iki Chrome aynı anda kullanamaz,
+# bu yüzden havuzdaki her işçinin ayrı klasörü vardır
+CACHE_FOLDER = "browser_cache"
+DISK_CACHE_SIZE = 512 * 1024 * 1024  # bayt
+
+BLOCKED_RESOURCES = [
+    # Görseller (kapak URL'leri src/data-src özniteliklerinden okunur, ayrıca image_downloader indirir)
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    # Yazı tipleri
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    # Video ve ses
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.mp3*",
+]
+BLOCKED_TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*amazon-adsystem.com*", "*adsrvr.org*", "*facebook.net*", "*connect.facebook.com*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*chartbeat.com*", "*chartbeat.net*", "*hotjar.com*",
+    "*segment.io*", "*cdn.segment.com*", "*nr-data.net*", "*js-agent.newrelic.com*", "*bat.bing.com*",
+    "*cdn.cookielaw.org*", "*onetrust.com*",
+]
+
+# Resource Timing tamponu varsayılan olarak 250 kayıtta dolar; ağır sayfalarda sonraki istekler sayılmazdı
+_TIMING_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(10000);"
+
+# Belgenin kendisi ve yüklediği kaynaklar için ağdan aktarılan bayt (önbellekten gelenler 0) ve
+# load olayının bittiği an (navigasyon başlangıcından, ms). Farklı kökenden gelen ve
+# Timing-Allow-Origin göndermeyen kaynakların boyutu 0 görünür; bayt yalnızca performans günlüğü
+# açık değilse kullanılan alt sınırdır.
+# Sürücü (id) -> son read_page_stats çağrısından beri performans günlüğünde sayılan ağ baytı
+_network_bytes = {}
+
+_PAGE_STATS_SCRIPT = """
+const navigation = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+let bytes = navigation ? navigation.transferSize : 0;
+for (const resource of resources) {
+    bytes += resource.transferSize;
+}
+return {
+    bytes: bytes,
+    requests: resources.length + (navigation ? 1 : 0),
+    page_load: navigation && navigation.loadEventEnd ? navigation.loadEventEnd / 1000 : null,
+};
+"""
+
+
+def add_lean_options(options, name, worker_id=0, headless=True):
+    """
+    Chrome seçeneklerine headless modu ve kalıcı disk önbelleğini ekler. undetected_chromedriver
+    headless'ı kendi parametresiyle açtığı için headless=False verilip uc.Chrome(headless=True) kullanılır.
+    """
+    if headless:
+        options.add_argument("--headless=new")
+    cache_dir = os.path.abspath(os.path.join(CACHE_FOLDER, f"{name}_{worker_id}"))
+    os.makedirs(cache_dir, exist_ok=True)
+    options.add_argument(f"--disk-cache-dir={cache_dir}")
+    options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
+    options.add_argument("--mute-audio")
+    options.add_argument("--autoplay-policy=user-gesture-required")
+    return options
+
+
+def enable_network_log(options):
+    """
+    Chrome performans günlüğünü (ağ olayları) açar; sayfa baytları ve Epic network modu buradan okunur.
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def read_network_log(driver):
+    """
+    Performans günlüğündeki yeni olayları (method, params) olarak döndürür. Günlük okundukça boşaldığı
+    için tüm okuyucular bu fonksiyonu kullanır; Network.loadingFinished olaylarının encodedDataLength
+    değeri (ağdan gelen, başlıklar dahil sıkıştırılmış bayt; önbellekten gelenlerde 0) okunurken
+    sayfanın toplamına eklenir.
+    """
+    events = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.loadingFinished":
+            _network_bytes[id(driver)] = _network_bytes.get(id(driver), 0) + params.get("encodedDataLength", 0)
+        events.append((method, params))
+    return events
+
+
+def block_heavy_resources(driver):
+    """
+    Görsel, yazı tipi, medya ve takip isteklerini tarayıcı düzeyinde engeller; ayar sürücü kapanana kadar geçerlidir.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES + BLOCKED_TRACKERS})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+
+
+def track_page_stats(driver):
+    """
+    Her yeni belgede Resource Timing tamponunu büyütür; sayfa istatistikleri tam sayılır.
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _TIMING_BUFFER_SCRIPT})
+    except Exception as e:
+        print(f"[WARNING] Sayfa istatistikleri için tampon büyütülemedi: {e}")
+
+
+def read_page_stats(driver):
+    """
+    Açık sayfanın aktarılan bayt, istek sayısı ve yükleme süresini (saniye) döndürür; okunamazsa boş sözlük.
+    Bayt, performans günlüğünden son çağrıdan beri sayılan toplamdır; günlük açık değilse Resource Timing
+    toplamı (alt sınır) kalır.
+    """
+    try:
+        read_network_log(driver)
+        network_bytes = _network_bytes.pop(id(driver), 0)
+    except Exception:
+        network_bytes = None
+    try:
+        stats = driver.execute_script(_PAGE_STATS_SCRIPT) or {}
+    except Exception:
+        return {}
+    if network_bytes is not None and stats:
+        stats["bytes"] = network_bytes
+    return stats
@@ -1,27 +1,326 @@
+import argparse
+import ast
+import importlib
+import json
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+from browser_pool import close_shared_drivers
+
+# Betiklerin bulunduğu klasör; tüm aşamalar buradan, göreli dosya yollarıyla çalışır
+base_dir = os.path.dirname(os.path.abspath(__file__))
+state_file = "pipeline_state.json"
+
+# Bir kazıyıcının çıktısı bu süreden yeniyse (ve girdileri değişmediyse) aşama yeniden çalıştırılmaz
+SCRAPE_MAX_AGE_HOURS = 20
+MAX_RETRIES = 2
+RETRY_DELAY = 30  # saniye; her denemede bu kadar artar
+
+# Aşamalar ve bağımlılıkları: üç kazıyıcı birbirinden bağımsızdır, birleştirme hepsini,
+# veritabanı yüklemesi birleştirmeyi bekler. Betik, bu klasörden (dolaylı da olsa) içe aktardığı modüller
+# (local_modules) veya inputs'taki veri dosyaları değişirse aşama yeniden çalışır. --parquet ile
+# parquet_inputs/parquet_outputs'taki tipli ara dosyalar da girdi ve çıktı sayılır.
+# --in-process ile betik yerine function çağrılır; data_from'daki aşamaların DataFrame'leri
+# CSV'den yeniden okunmadan verilen argüman adıyla aktarılır (atlanan aşamalarınki CSV'den okunur).
+# resumable aşamalar (kazıyıcılar) yeniden denemelerde devam kaydından (checkpoints.py) sürer.
+# browser aşamaları Selenium kullanır: --lean ile hafif tarayıcı modunda çalışır, --in-process ile
+# tarayıcıları yeniden denemeler ve sonraki çağrılar için boru hattı bitene kadar açık kalır.
+STAGES = [
+    {
+        "name": "epic",
+        "script": "oyuncekmeepic.py",
+        "function": ("oyuncekmeepic", "scrape_epic"),
+        "data_from": {},
+        "after": [],
+        "inputs": [],
+        "outputs": ["epic_games_results.csv"],
+        "parquet_inputs": [],
+        "parquet_outputs": ["epic_games_results.parquet"],
+        "max_age_hours": SCRAPE_MAX_AGE_HOURS,
+        "resumable": True,
+        "browser": True,
+    },
+    {
+        "name": "steam",
+        "script": "oyuncekme.py",
+        "function": ("oyuncekme", "scrape_steam"),
+        "data_from": {},
+        "after": [],
+        "inputs": [],
+        "outputs": ["steamverisi.csv"],
+        "parquet_inputs": [],
+        "parquet_outputs": ["steamverisi.parquet"],
+        "max_age_hours": SCRAPE_MAX_AGE_HOURS,
+        "resumable": True,
+        "browser": False,
+    },
+    {
+        "name": "metacritic",
+        "script": "metacritic.py",
+        "function": ("metacritic", "scrape_metacritic"),
+        "data_from": {},
+        "after": [],
+        "inputs": [],
+        "outputs": ["metacritic_games.csv"],
+        "parquet_inputs": [],
+        "parquet_outputs": ["metacritic_games.parquet"],
+        "max_age_hours": SCRAPE_MAX_AGE_HOURS,
+        "resumable": True,
+        "browser": True,
+    },
+    {
+        "name": "merge",
+        "script": "soncsv.py",
+        "function": ("soncsv", "merge_games"),
+        "data_from": {"steam": "steam_data", "metacritic": "metacritic_data", "epic": "epic_data"},
+        "after": ["epic", "steam", "metacritic"],
+        "inputs": ["steamverisi.csv", "metacritic_games.csv", "epic_games_results.csv"],
+        "outputs": ["merged_game_data.csv"],
+        "parquet_inputs": ["steamverisi.parquet", "metacritic_games.parquet", "epic_games_results.parquet"],
+        "parquet_outputs": ["merged_game_data.parquet"],
+        "max_age_hours": None,
+        "resumable": False,
+        "browser": False,
+    },
+    {
+        "name": "database",
+        "script": "databasecreater.py",
+        "function": ("databasecreater", "load_database"),
+        "data_from": {"merge": "data"},
+        "after": ["merge"],
+        "inputs": ["merged_game_data.csv"],
+        "outputs": ["game_data.db", "catalog/manifest.json"],
+        "parquet_inputs": ["merged_game_data.parquet"],
+        "parquet_outputs": [],
+        "max_age_hours": None,
+        "resumable": False,
+        "browser": False,
+    },
+]
+
+
+def load_state():
+    path = os.path.join(base_dir, state_file)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_state(state):
+    path = os.path.join(base_dir, state_file)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def local_modules(script, found=None):
+    """
+    Betiği ve bu klasörden doğrudan veya dolaylı içe aktardığı tüm modül dosyalarını döndürür.
+    Kurulu paketler (pandas, selenium...) klasörde dosyası olmadığı için sayılmaz.
+    """
+    found = set() if found is None else found
+    if script in found:
+        return found
+    found.add(script)
+    with open(os.path.join(base_dir, script), encoding="utf-8") as file:
+        tree = ast.parse(file.read(), script)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            path = name.split(".")[0] + ".py"
+            if os.path.exists(os.path.join(base_dir, path)):
+                local_modules(path, found)
+    return found
+
+
+def stage_files(stage, parquet=False):
+    """
+    Aşamanın (girdiler, çıktılar) dosya listeleri; girdiler betiğin yerel modüllerini de içerir.
+    """
+    inputs = sorted(local_modules(stage["script"])) + stage["inputs"]
+    outputs = list(stage["outputs"])
+    if parquet:
+        inputs += stage["parquet_inputs"]
+        outputs += stage["parquet_outputs"]
+    return inputs, outputs
+
+
+def is_fresh(stage, state, now=None, parquet=False):
+    """
+    Aşamanın son çalışması başarılıysa, çıktıları girdilerinden yeniyse ve (kazıyıcılarda)
+    max_age_hours dolmadıysa True döner. Yarıda kalan bir çalışmanın yazdığı çıktı taze sayılmaz.
+    parquet ise Parquet ara dosyaları da girdi ve çıktılara eklenir.
+    """
+    last_run = state.get(stage["name"])
+    if not last_run or not last_run.get("ok"):
+        return False
+    inputs, outputs = stage_files(stage, parquet)
+    outputs = [os.path.join(base_dir, path) for path in outputs]
+    if not all(os.path.exists(path) for path in outputs):
+        return False
+    inputs = [os.path.join(base_dir, path) for path in inputs]
+    newest_input = max((os.path.getmtime(path) for path in inputs if os.path.exists(path)), default=0)
+    if min(os.path.getmtime(path) for path in outputs) < newest_input:
+        return False
+    max_age = stage["max_age_hours"]
+    return max_age is None or (now or time.time()) - last_run["finished_at"] < max_age * 3600
+
+
+def run_script(stage, parquet=False, resume=False, lean=False):
+    # subprocess.run kullanarak betiği çalıştırır; betik hata veya yarıda kalan tarama yüzünden sıfırdan
+    # farklı kodla çıkarsa CalledProcessError verilir ve run_stage bunu başarısız deneme sayar
+    arguments = (["--parquet"] if parquet else []) + (["--resume"] if resume else [])
+    if lean and stage["browser"]:
+        arguments.append("--lean")
+    subprocess.run([sys.executable, stage["script"]] + arguments, cwd=base_dir, check=True)
+
+
+def call_function(stage, data, parquet=False, resume=False, lean=False):
+    """
+    Aşamanın fonksiyonunu bu süreçte çağırır; bağımlı olduğu aşamaların sonuçlarını argüman olarak verir.
+    Tarayıcılı aşamaların tarayıcısı açık bırakılır; yeniden denemede Chrome yeniden başlatılmaz.
+    """
+    module_name, function_name = stage["function"]
+    function = getattr(importlib.import_module(module_name), function_name)
+    kwargs = {argument: data[name] for name, argument in stage["data_from"].items() if name in data}
+    if resume:
+        kwargs["resume"] = True
+    if stage["browser"]:
+        kwargs["lean"] = lean
+        kwargs["keep_browser"] = True
+    return function(parquet=parquet, **kwargs)
+
+
+def run_stage(stage, retries, call, resume=False):
+    """
+    call(stage, resume) ile aşamayı çalıştırır, hata verirse artan beklemeyle tekrar dener. Kazıyıcılar
+    tarama yarıda kaldığında betik olarak sıfırdan farklı kodla çıkar, fonksiyon olarak RuntimeError verir.
+    Devam edebilen aşamalar yeniden denemelerde (resume ise ilk denemede de) kaldıkları sayfadan sürer.
+    (başarılı mı, sonuç, deneme sayısı, süre) döndürür.
+    """
+    start = time.perf_counter()
+    for attempt in range(1, retries + 2):
+        try:
+            result = call(stage, resume=stage["resumable"] and (resume or attempt > 1))
+            print(f"{stage['script']} başarıyla tamamlandı.")
+            return True, result, attempt, time.perf_counter() - start
+        except subprocess.CalledProcessError as e:
+            print(f"{stage['script']} çalıştırılırken bir hata oluştu: {e}")
+        except FileNotFoundError as e:
+            print(f"{stage['script']} bulunamadı: {e}")
+            break
+        except Exception as e:
+            print(f"{stage['name']} aşamasında hata oluştu: {e}")
+        if attempt <= retries:
+            delay = RETRY_DELAY * attempt
+            print(f"[INFO] {stage['name']} {delay} saniye sonra yeniden denenecek ({attempt}/{retries}).")
+            time.sleep(delay)
+    return False, None, attempt, time.perf_counter() - start
+
+
+def run_pipeline(stages, force=False, retries=MAX_RETRIES, max_parallel=None, in_process=False, parquet=False,
+                 resume=False, lean=False):
+    """
+    Bağımlılıkları tamamlanan aşamaları paralel çalıştırır. Taze aşamalar atlanır (force hariç);
+    bir aşama başarısız olursa ona bağlı aşamalar çalıştırılmaz. Aşama başına sonuçları döndürür.
+    in_process ise aşamalar ayrı yorumlayıcı yerine bu süreçte fonksiyon olarak çalışır;
+    parquet ise aşamalar arasında tipli Parquet ara dosyaları da kullanılır; resume ise kazıyıcılar
+    önceki (yarıda kalmış) çalıştırmanın devam kaydından başlar; lean ise Selenium kazıyıcıları hafif
+    tarayıcı modunda (lean_browser.py) çalışır.
+    """
+    if in_process:
+        # Betikler göreli dosya yollarıyla ve kendi klasörlerinden içe aktarılarak çalışır
+        os.chdir(base_dir)
+        if base_dir not in sys.path:
+            sys.path.insert(0, base_dir)
+    state = load_state()
+    data = {}
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_parallel or len(stages)) as executor:
+        while len(results) < len(stages):
+            for stage in stages:
+                name = stage["name"]
+                if name in results or name in running:
+                    continue
+                if any(results.get(dependency, {}).get("status") in ("failed", "blocked")
+                       for dependency in stage["after"]):
+                    results[name] = {"status": "blocked", "attempts": 0, "elapsed": 0.0}
+                    print(f"[WARNING] {name} atlandı: bağımlı olduğu aşama başarısız oldu.")
+                    continue
+                if not all(dependency in results for dependency in stage["after"]):
+                    continue
+                # Bağımlılıklardan biri yeniden çalıştıysa çıktıları zaten değişmiştir; tazelik yine dosyalardan ölçülür
+                if not force and is_fresh(stage, state, parquet=parquet):
+                    results[name] = {"status": "fresh", "attempts": 0, "elapsed": 0.0}
+                    print(f"[INFO] {name} atlandı: çıktıları güncel.")
+                    continue
+                print(f"[INFO] {name} başlatılıyor ({stage['script']}).")
+                if in_process:
+                    call = partial(call_function, data=data, parquet=parquet, lean=lean)
+                else:
+                    call = partial(run_script, parquet=parquet, lean=lean)
+                running[name] = executor.submit(run_stage, stage, retries, call, resume)
+
+            if not running:
+                continue
+            done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name, future in list(running.items()):
+                if future not in done:
+                    continue
+                ok, output, attempts, elapsed = future.result()
+                del running[name]
+                if ok and in_process:
+                    data[name] = output
+                results[name] = {"status": "ok" if ok else "failed", "attempts": attempts, "elapsed": elapsed}
+                state[name] = {"ok": ok, "finished_at": time.time()}
+                save_state(state)
+    if in_process:
+        # Yeniden denemeler için açık bırakılan tarayıcılar
+        close_shared_drivers()
+    return results
+
+
+def print_summary(stages, results, wall_time):
+    print("[INFO] Aşama          Durum      Deneme   Süre (s)")
+    for stage in stages:
+        result = results[stage["name"]]
+        print(f"[INFO] {stage['name']:<14} {result['status']:<10} {result['attempts']:>6} {result['elapsed']:>10.1f}")
+    total = sum(result["elapsed"] for result in results.values())
+    print(f"[INFO] Toplam süre {wall_time:.1f} s (aşamalar sırayla çalışsaydı {total:.1f} s).")
 
-def run_script(script_name):
-    try:
-        # subprocess.run kullanarak betiği çalıştırır
-        result = subprocess.run([sys.executable, script_name], check=True)
-        print(f"{script_name} başarıyla tamamlandı.")
-    except subprocess.CalledProcessError as e:
-        print(f"{script_name} çalıştırılırken bir hata oluştu: {e}")
-    except FileNotFoundError:
-        print(f"{script_name} bulunamadı.")
 
 def main():
-    scripts = [
-        "oyuncekmeepic.py",
-        "oyuncekme.py",
-        "metacritic.py",
-        "soncsv.py"
-        "databasecreater.py"
-    ]
-    
-    for script in scripts:
-        run_script(script)
+    parser = argparse.ArgumentParser(description="Kazıma, birleştirme ve veritabanı aşamalarını çalıştırır")
+    parser.add_argument("--force", action="store_true", help="Çıktısı güncel olan aşamaları da çalıştırır")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES, help="Başarısız bir aşamanın tekrar deneme sayısı")
+    parser.add_argument("--max-parallel", type=int, default=None, help="Aynı anda çalışacak en fazla aşama")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Aşamaları tek süreçte fonksiyon olarak çalıştırır, verileri bellekte aktarır")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Aşamalar arasında fiyatları çözülmüş tipli Parquet ara dosyaları da kullanır")
+    parser.add_argument("--resume", action="store_true",
+                        help="Kazıyıcılar yarıda kalan önceki çalıştırmanın kaldığı sayfadan devam eder")
+    parser.add_argument("--lean", action="store_true",
+                        help="Selenium kazıyıcıları headless, görsel/yazı tipi/medya/takip istekleri engellenmiş çalışır")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_pipeline(STAGES, args.force, args.retries, args.max_parallel, args.in_process, args.parquet,
+                           args.resume, args.lean)
+    print_summary(STAGES, results, time.perf_counter() - start)
+    if any(result["status"] in ("failed", "blocked") for result in results.values()):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
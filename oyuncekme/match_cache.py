@@ -0,0 +1,145 @@
+import hashlib
+import inspect
+import sqlite3
+
+from matcher import build_match_index, match_details
+
+# Bulanık eşleşme sonuçlarının çalıştırmalar arasında saklandığı veritabanı
+MATCH_CACHE_FILE = "match_cache.db"
+
+
+def open_match_cache(path=MATCH_CACHE_FILE):
+    """
+    Eşleşme önbelleği veritabanını açar, tablolar yoksa oluşturur.
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            source TEXT PRIMARY KEY,
+            config_hash TEXT NOT NULL,
+            source_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS source_names (
+            source TEXT NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (source, name)
+        );
+        CREATE TABLE IF NOT EXISTS match_cache (
+            source TEXT NOT NULL,
+            steam_name TEXT NOT NULL,
+            partner TEXT,
+            score REAL NOT NULL,
+            tied INTEGER NOT NULL,
+            PRIMARY KEY (source, steam_name)
+        );
+    """)
+    return conn
+
+
+def config_hash(threshold, normalizer):
+    """
+    Eşik değeri ve normalizasyon fonksiyonunun tanımlandığı modülün kaynak kodundan önbellek sürüm
+    anahtarı üretir. İkisinden biri değişirse önceki sonuçlar geçersiz sayılır.
+    """
+    payload = f"{threshold}\n{inspect.getsource(inspect.getmodule(normalizer))}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def source_hash(names):
+    """
+    Aday isim listesinin (sırası dahil) özetini döndürür.
+    """
+    return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()
+
+
+def _is_stale(name, entry, removed, added_index):
+    """
+    Aday listesi değiştiğinde önbellekteki sonucun yeniden hesaplanması gerekip gerekmediğine karar verir.
+    """
+    partner, score, tied = entry
+    # Eşit puanlı adaylar varsa sonuç aday sırasına bağlıdır
+    if tied or partner in removed:
+        return True
+    if added_index is None:
+        return False
+    # Yeni adaylardan biri mevcut puana ulaşıyorsa sonuç değişebilir
+    added_partner, added_score, _ = match_details(name, added_index)
+    return added_partner is not None and added_score >= score
+
+
+def cached_fuzzy_match(conn, source, target_names, candidate_names, threshold, config_key):
+    """
+    Hedef isimleri aday isimlerle bulanık eşleştirir ve {hedef: eşleşen aday veya None} döndürür.
+    Önceki çalıştırmadan geçerliliğini koruyan sonuçlar önbellekten alınır; yalnızca yeni
+    hedefler ve eklenen/silinen adaylardan etkilenebilecek hedefler yeniden eşleştirilir.
+    """
+    candidates = list(dict.fromkeys(name for name in candidate_names if isinstance(name, str)))
+    current_hash = source_hash(candidates)
+
+    meta = conn.execute(
+        "SELECT config_hash, source_hash FROM cache_meta WHERE source = ?", (source,)
+    ).fetchone()
+    if meta is None or meta[0] != config_key:
+        # Eşik veya normalizasyon değişti: bu kaynağın tüm önbelleği geçersiz
+        with conn:
+            conn.execute("DELETE FROM match_cache WHERE source = ?", (source,))
+            conn.execute("DELETE FROM source_names WHERE source = ?", (source,))
+        previous_hash = None
+        previous_names = set()
+    else:
+        previous_hash = meta[1]
+        previous_names = {
+            row[0] for row in conn.execute("SELECT name FROM source_names WHERE source = ?", (source,))
+        }
+
+    changed = previous_hash != current_hash
+    cached = {
+        row[0]: (row[1], row[2], bool(row[3]))
+        for row in conn.execute(
+            "SELECT steam_name, partner, score, tied FROM match_cache WHERE source = ?", (source,)
+        )
+    }
+    added_index = None
+    removed = set()
+    if changed:
+        current_names = set(candidates)
+        added = [name for name in candidates if name not in previous_names]
+        removed = previous_names - current_names
+        if added:
+            added_index = build_match_index(added, threshold=threshold)
+
+    entries = {}
+    pending = []
+    for name in dict.fromkeys(target_names):
+        entry = cached.get(name)
+        if entry is None or (changed and _is_stale(name, entry, removed, added_index)):
+            pending.append(name)
+        else:
+            entries[name] = entry
+
+    if pending:
+        index = build_match_index(candidates, threshold=threshold)
+        for name in pending:
+            entries[name] = match_details(name, index)
+
+    rows = [(source, name, partner, score, int(tied)) for name, (partner, score, tied) in entries.items()]
+    with conn:
+        if changed:
+            # Bu çalıştırmada doğrulanmayan kayıtlar silinir; aksi halde aradaki aday değişiklikleri kaçırılır
+            conn.execute("DELETE FROM match_cache WHERE source = ?", (source,))
+            conn.execute("DELETE FROM source_names WHERE source = ?", (source,))
+            conn.executemany(
+                "INSERT INTO source_names (source, name) VALUES (?, ?)",
+                [(source, name) for name in candidates],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_meta (source, config_hash, source_hash) VALUES (?, ?, ?)",
+                (source, config_key, current_hash),
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO match_cache (source, steam_name, partner, score, tied) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    print(f"[INFO] {source} önbelleği: {len(entries) - len(pending)} isabet, {len(pending)} yeniden eşleştirme.")
+    return {name: entry[0] for name, entry in entries.items()}
@@ -0,0 +1,261 @@
+import math
+from collections import defaultdict
+
+from rapidfuzz import fuzz, process
+
+# token_set_ratio ile bulanık eşleştirme için aday bloklama (blocking) motoru.
+#
+# Eski find_best_match her hedef isim için tüm adayları saf Python döngüsünde
+# puanlıyordu (O(N×M)). Burada adaylar bir kez indekslenir ve her hedef için
+# yalnızca eşik değerini geçebilecek adaylar rapidfuzz ile (C tarafında) puanlanır.
+#
+# Bloklama kayıpsızdır: token_set_ratio >= eşik olan her aday şu üç filtreden
+# en az birine takılır, bu yüzden sonuçlar tam tarama ile birebir aynıdır.
+#   1) Hedefin ortak olmayan kelimeleri kısa -> hedefin nadir kelimelerinden
+#      oluşan "önek" kümesinden en az biri adayda da geçmek zorunda.
+#   2) Adayın ortak olmayan kelimeleri kısa -> aynı kural adayın öneki için.
+#   3) Farklı kelimeler karakter bazında benzer -> kelime içi 3-gram çoklu
+#      kümeleri büyük oranda örtüşür (uzunluk filtresi + q-gram önek filtresi).
+
+# Kayan nokta yuvarlamalarına karşı filtreleri biraz gevşek tutan pay
+_EPSILON = 1e-9
+
+# rapidfuzz score_cutoff karşılaştırmalarında eşit puanları kaçırmamak için pay
+_SCORE_TOLERANCE = 1e-6
+
+# Karakter filtresinde kullanılan q-gram uzunluğu
+_Q = 3
+
+
+def _tokens(name):
+    """
+    token_set_ratio ile aynı şekilde (boşluklardan bölerek) kelime kümesini döndürür.
+    """
+    return set(name.split())
+
+
+def _canonical_length(tokens):
+    """
+    Kelimelerin sıralanıp boşlukla birleştirilmiş halinin uzunluğu.
+    """
+    return sum(len(token) for token in tokens) + len(tokens) - 1
+
+
+def _gram_elements(tokens):
+    """
+    Her kelimenin başı/sonu işaretlenmiş q-gramlarını (q-gram, kaçıncı tekrar) çiftleri olarak döndürür.
+    Kelime sırasından bağımsızdır, bu yüzden aday başına bir kez hesaplanabilir.
+    """
+    counts = defaultdict(int)
+    elements = []
+    for token in tokens:
+        padded = "^" * (_Q - 1) + token + "$" * (_Q - 1)
+        for i in range(len(padded) - _Q + 1):
+            gram = padded[i:i + _Q]
+            counts[gram] += 1
+            elements.append((gram, counts[gram]))
+    return elements
+
+
+def _max_unshared_weight(length, ratio):
+    """
+    Tek taraftaki ortak olmayan kelimelerin (boşluk dahil) alabileceği en büyük ağırlık.
+    """
+    return 2 * (1 - ratio) * length / (2 - ratio) + _EPSILON
+
+
+def _gram_prefix_length(length, gram_count, ratio):
+    """
+    q-gram önek filtresi için gereken önek uzunluğunu döndürür.
+    Eşik için garanti edilebilecek ortak q-gram sayısı 1'in altındaysa None döner.
+    """
+    # Her silme en fazla max(q, 2(q-1)), her ekleme en fazla q-1 q-gramı bozar
+    damage = (max(_Q, 2 * (_Q - 1)) + _Q - 1) * (1 - ratio)
+    other_length = length * ratio / (2 - ratio) if damage <= 1 else length * (2 - ratio) / ratio
+    min_overlap = math.floor((gram_count + other_length * (1 - damage) + 1 - damage * length) / 2 + _EPSILON)
+    if min_overlap < 1:
+        return None
+    return gram_count - min_overlap + 1
+
+
+def _token_prefix(tokens, token_order, max_weight):
+    """
+    Nadirden sıka sıralanmış kelimelerden, ağırlığı max_weight'i aşan en kısa öneki döndürür.
+    """
+    prefix = []
+    weight = 0
+    for token in sorted(tokens, key=token_order):
+        prefix.append(token)
+        weight += len(token) + 1
+        if weight > max_weight:
+            break
+    return prefix
+
+
+def _frequency_order(freq):
+    """
+    Nadir öğeleri öne alan, tüm indeks için sabit sıralama anahtarı.
+    """
+    return lambda item: (freq.get(item, 0), item)
+
+
+def build_match_index(candidates, threshold=90):
+    """
+    Aday isim listesinden bulanık eşleştirme indeksini oluşturur.
+    Aynı isim birden fazla kez geçiyorsa ilk geçtiği sıra korunur.
+    """
+    ratio = threshold / 100
+    names = []
+    token_sets = []
+    seen = set()
+    for name in candidates:
+        if not isinstance(name, str) or name in seen:
+            continue
+        seen.add(name)
+        tokens = _tokens(name)
+        if not tokens:
+            # Boş isimler token_set_ratio'da her zaman 0 puan alır
+            continue
+        names.append(name)
+        token_sets.append(tokens)
+
+    token_freq = defaultdict(int)
+    gram_freq = defaultdict(int)
+    gram_sets = []
+    for tokens in token_sets:
+        for token in tokens:
+            token_freq[token] += 1
+        elements = _gram_elements(tokens)
+        gram_sets.append(elements)
+        for element in elements:
+            gram_freq[element] += 1
+
+    index = {
+        "names": names,
+        "threshold": threshold,
+        "token_order": _frequency_order(token_freq),
+        "gram_order": _frequency_order(gram_freq),
+        "token_postings": defaultdict(list),
+        "token_prefix_postings": defaultdict(list),
+        # q-gram -> {kanonik uzunluk: aday listesi}; uzunluk filtresi kova bazında uygulanır
+        "gram_prefix_postings": defaultdict(lambda: defaultdict(list)),
+        "length_buckets": defaultdict(list),
+        # q-gram filtresinin garanti veremediği (çok kısa) adaylar
+        "unfiltered": defaultdict(list),
+    }
+
+    for idx, (tokens, elements) in enumerate(zip(token_sets, gram_sets)):
+        length = _canonical_length(tokens)
+        index["length_buckets"][length].append(idx)
+        for token in tokens:
+            index["token_postings"][token].append(idx)
+        for token in _token_prefix(tokens, index["token_order"], _max_unshared_weight(length, ratio)):
+            index["token_prefix_postings"][token].append(idx)
+        prefix_length = _gram_prefix_length(length, len(elements), ratio)
+        if prefix_length is None:
+            index["unfiltered"][length].append(idx)
+            continue
+        for element in sorted(elements, key=index["gram_order"])[:prefix_length]:
+            index["gram_prefix_postings"][element][length].append(idx)
+
+    return index
+
+
+def candidate_ids(target_name, index):
+    """
+    Hedef isimle eşik değerini geçebilecek adayların sıra numaralarını döndürür.
+    """
+    tokens = _tokens(target_name)
+    if not tokens:
+        return []
+
+    ratio = index["threshold"] / 100
+    length = _canonical_length(tokens)
+    candidates = set()
+
+    # 1) Hedefin nadir kelimelerinden en az biri adayda geçmeli
+    for token in _token_prefix(tokens, index["token_order"], _max_unshared_weight(length, ratio)):
+        candidates.update(index["token_postings"].get(token, ()))
+
+    # 2) Adayın önek kelimelerinden en az biri hedefte geçmeli
+    for token in tokens:
+        candidates.update(index["token_prefix_postings"].get(token, ()))
+
+    # 3) q-gram bazında benzer, uzunlukları yakın adaylar.
+    # Indel mesafesi en az uzunluk farkı kadar olduğundan yalnızca bu aralıktaki kovalara bakılır.
+    allowed_lengths = range(
+        math.ceil(length * ratio / (2 - ratio) - _EPSILON),
+        math.floor(length * (2 - ratio) / ratio + _EPSILON) + 1,
+    )
+    elements = _gram_elements(tokens)
+    prefix_length = _gram_prefix_length(length, len(elements), ratio)
+    if prefix_length is None:
+        buckets = [index["length_buckets"]]
+    else:
+        buckets = [index["unfiltered"]]
+        for element in sorted(elements, key=index["gram_order"])[:prefix_length]:
+            if element in index["gram_prefix_postings"]:
+                buckets.append(index["gram_prefix_postings"][element])
+    for bucket in buckets:
+        for other_length in allowed_lengths:
+            candidates.update(bucket.get(other_length, ()))
+
+    return sorted(candidates)
+
+
+def _extract_best(target_name, index):
+    """
+    Blok adaylarını puanlar; (aday isimleri, extractOne sonucu) döndürür.
+    """
+    ids = candidate_ids(target_name, index)
+    if not ids:
+        return [], None
+    names = [index["names"][idx] for idx in ids]
+    # rapidfuzz score_cutoff'u mesafeye çevirirken tam eşik puanını kaçırabilir; karşılaştırma burada yapılır
+    result = process.extractOne(
+        target_name,
+        names,
+        scorer=fuzz.token_set_ratio,
+        score_cutoff=index["threshold"] - _SCORE_TOLERANCE,
+    )
+    if result and result[1] < index["threshold"]:
+        result = None
+    return names, result
+
+
+def find_best_match(target_name, index):
+    """
+    Hedef isim için en yüksek token_set_ratio puanlı adayı döndürür.
+    Puan eşik değerin altındaysa None döner; eşit puanlarda listedeki ilk aday seçilir.
+    """
+    _, result = _extract_best(target_name, index)
+    return result[0] if result else None
+
+
+def match_details(target_name, index):
+    """
+    find_best_match ile aynı eşleşmeyi (isim, puan, eşitlik var mı) olarak döndürür.
+    Eşitlik bilgisi, aday sırası değiştiğinde sonucun değişebileceğini gösterir.
+    Eşleşme yoksa (None, 0, False) döner.
+    """
+    names, result = _extract_best(target_name, index)
+    if not result:
+        return None, 0, False
+    top = process.extract(
+        target_name, names, scorer=fuzz.token_set_ratio, score_cutoff=result[1] - _SCORE_TOLERANCE, limit=2
+    )
+    return result[0], result[1], len(top) > 1 and top[1][1] == result[1]
+
+
+def find_best_match_bruteforce(target_name, candidates, threshold=90):
+    """
+    Eski tam tarama yöntemi; doğrulama ve benchmark karşılaştırması için tutulur.
+    """
+    best_match = None
+    best_score = 0
+    for candidate in candidates:
+        score = fuzz.token_set_ratio(target_name, candidate)
+        if score > best_score:
+            best_score = score
+            best_match = candidate
+    return best_match if best_score >= threshold else None
@@ -1,18 +1,57 @@
+import argparse
+import sys
 import time
+from functools import partial
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import os
-import requests
-import re
 
-def setup_driver(chromedriver_path):
+import checkpoints
+import fixtures
+from browser_pool import run_pages
+from image_downloader import finish_downloader, start_downloader, submit_downloads
+from intermediates import write_source
+from lean_browser import add_lean_options, block_heavy_resources, enable_network_log
+from page_waits import loaded_without_cards, wait_for_cards, wait_for_network_idle
+from thumbnails import generate_thumbnails
+
+base_url = "https://www.metacritic.com/browse/game/?releaseYearMin=2003&releaseYearMax=2024&page={page_number}"
+file_name = 'metacritic_games.csv'
+images_folder = 'gorseller'
+# ChromeDriver'ın tam yolu
+chromedriver_path = r'C:\Users\Oğuzhan\steamoyuncekme\chromedriver.exe'  # ChromeDriver yolunuz
+CSV_COLUMNS = ['Game Name', 'Metascore', 'Image URL']
+
+CARD_SELECTOR = 'div.c-finderProductCard'
+NAME_SELECTOR = 'div[data-title]'
+METASCORE_SELECTOR = 'div.c-siteReviewScore span'
+EXTRACT_MODES = ["js", "elements"]
+
+# Tüm kartların alanlarını tek execute_script çağrısıyla okur (kart başına 5-6 WebDriver isteği yerine).
+# Bulunamayan öğe için alan null döner; kart Python tarafında eski yöntemdeki gibi atlanır.
+CARDS_SCRIPT = """
+const [cardSelector, nameSelector, metascoreSelector] = arguments;
+return Array.from(document.querySelectorAll(cardSelector), card => {
+    const name = card.querySelector(nameSelector);
+    const metascore = card.querySelector(metascoreSelector);
+    const image = card.querySelector("img");
+    return {
+        name: name ? name.getAttribute("data-title") : null,
+        metascore: metascore ? metascore.innerText : null,
+        image: image ? {src: image.src, data_src: image.getAttribute("data-src")} : null,
+    };
+});
+"""
+
+def setup_driver(chromedriver_path, offline=False, lean=False, worker_id=0):
     """
     Selenium WebDriver'ı kurar ve başlatır (tarayıcı görünür şekilde çalışır).
+    offline ise tarayıcı yerel kayıt sunucusu dışındaki hiçbir adrese bağlanamaz; lean ise tarayıcı
+    headless çalışır, görsel/yazı tipi/medya/takip istekleri engellenir ve disk önbelleği saklanır.
     """
     chrome_options = Options()
     chrome_options.add_argument("--disable-gpu")
@@ -23,109 +62,111 @@ def setup_driver(chromedriver_path):
     chrome_options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.5938.62 Safari/537.36"
     )
-    # Headless modu kaldırıldı, böylece tarayıcı görünür çalışacak
+    if offline:
+        chrome_options.add_argument(fixtures.OFFLINE_HOST_RULES)
+    # Sayfa ölçümlerindeki aktarılan bayt performans günlüğünden okunur
+    enable_network_log(chrome_options)
+    # Varsayılan olarak headless değil, tarayıcı görünür çalışır; --lean ile headless
+    if lean:
+        add_lean_options(chrome_options, "metacritic", worker_id)
     service = Service(executable_path=chromedriver_path)
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.set_page_load_timeout(30)  # Sayfanın yüklenme süresi sınırı
+    if lean:
+        block_heavy_resources(driver)
     return driver
 
-def sanitize_filename(name):
+def read_cards_js(driver):
+    """
+    Sayfadaki kartların ham alanlarını tek JavaScript çağrısıyla sözlük listesi olarak döndürür.
+    """
+    return driver.execute_script(CARDS_SCRIPT, CARD_SELECTOR, NAME_SELECTOR, METASCORE_SELECTOR)
+
+def read_cards_elements(driver):
     """
-    Dosya adında kullanılmaması gereken karakterleri temizler.
+    read_cards_js ile aynı alanları eski yöntemle, her kart için ayrı WebDriver çağrılarıyla okur.
     """
-    return re.sub(r'[\\/*?:"<>|]', "", name)
+    def first(card, selector):
+        found = card.find_elements(By.CSS_SELECTOR, selector)
+        return found[0] if found else None
+
+    cards = []
+    for card in driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR):
+        name = first(card, NAME_SELECTOR)
+        metascore = first(card, METASCORE_SELECTOR)
+        image = first(card, 'img')
+        cards.append({
+            'name': name.get_attribute("data-title") if name else None,
+            'metascore': metascore.text if metascore else None,
+            'image': {'src': image.get_attribute("src"), 'data_src': image.get_attribute("data-src")} if image else None,
+        })
+    return cards
 
-def download_image(image_url, game_name, folder_path, session):
+def game_from_card(card):
     """
-    Verilen URL'den resmi indirir ve belirtilen klasöre kaydeder.
+    Ham kart alanlarından oyun kaydını üretir; eksik alan varsa hata fırlatır.
     """
+    # Oyun adı
+    game_name = card['name'].strip()
+
+    # Metascore
+    metascore = card['metascore'].strip()
+
+    # Görsel URL'si
+    image_url = card['image']['src']
     if not image_url:
-        print(f"Görsel URL'si boş olduğu için indirilmeyecek: {game_name}")
-        return
-    try:
-        # Eğer image_url relatif bir URL ise, mutlak URL'ye dönüştür
-        if image_url.startswith('//'):
-            image_url = 'https:' + image_url
-        elif image_url.startswith('/'):
-            image_url = 'https://www.metacritic.com' + image_url
-        elif not image_url.startswith('http'):
-            print(f"Geçersiz URL formatı ({game_name}): {image_url}")
-            return
-
-        # Başlıkları ekleyin
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.5938.62 Safari/537.36',
-            'Referer': 'https://www.metacritic.com/'
-        }
-
-        # İsteği yapın
-        response = session.get(image_url, headers=headers, stream=True, timeout=15)
-        response.raise_for_status()
-
-        # Dosya uzantısını al
-        ext = os.path.splitext(image_url)[1].split('?')[0]
-        if ext.lower() not in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']:
-            ext = '.jpg'
-
-        safe_game_name = sanitize_filename(game_name)
-        file_path = os.path.join(folder_path, f"{safe_game_name}{ext}")
-
-        # Benzersiz dosya adı için oyun adının sonuna rastgele sayı ekleyebiliriz
-        counter = 1
-        original_file_path = file_path
-        while os.path.exists(file_path):
-            file_path = os.path.join(folder_path, f"{safe_game_name}_{counter}{ext}")
-            counter += 1
-            if counter > 100:
-                print(f"Çok fazla dosya çakışması ({game_name}), görsel indirilmiyor.")
-                return
-
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(1024):
-                f.write(chunk)
-        print(f"Görsel indirildi: {file_path}")
-    except Exception as e:
-        print(f"Görsel indirilemedi ({game_name}): {e}")
+        image_url = card['image']['data_src']
+    if not image_url:
+        print(f"Görsel URL'si bulunamadı ({game_name})")
 
-def scrape_metacritic_page(page_url, driver):
+    return {'Game Name': game_name, 'Metascore': metascore, 'Image URL': image_url}
+
+def scrape_metacritic_page(page_url, driver, timings=None, extract="js", fixture_base=None, record_folder=None):
     """
     Bir sayfadaki oyunların adlarını, Metascore değerlerini ve görsel URL'lerini çeker.
+    extract "js" ise kartlar tek execute_script çağrısıyla, "elements" ise kart kart okunur.
+    timings verilirse yükleme, bekleme ve veri çıkarma süreleri (saniye) içine yazılır.
+    fixture_base verilirse sayfa yerel kayıt sunucusundan yüklenir; record_folder verilirse
+    render edilmiş HTML o kayıt arşivine yazılır.
+    Sayfa yüklendiği halde hiç kart yoksa (listenin sonu) boş liste, yüklenemezse None döner.
     """
-    driver.get(page_url)
-    time.sleep(5)  # Sayfa yüklenmesi için 5 saniye bekleme
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    driver.get(fixtures.target_url(fixture_base, page_url))
+    timings["load"] = time.perf_counter() - start
     games = []
 
+    # Kartlar render edilip sayıları sabitlenene kadar bekle; ardından görsel URL'leri için kısa ağ sessizliği
+    start = time.perf_counter()
+    try:
+        wait_for_cards(driver, CARD_SELECTOR, timeout=15)
+        wait_for_network_idle(driver)
+        if record_folder:
+            fixtures.save_rendered(record_folder, page_url, driver.page_source)
+    except TimeoutException:
+        if loaded_without_cards(driver, CARD_SELECTOR):
+            print(f"Sayfa {page_url} oyun içermiyor; liste sona erdi.")
+            return []
+        print(f"Sayfa {page_url} zamanında yüklenemedi.")
+        return None
+    finally:
+        timings["wait"] = time.perf_counter() - start
+
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.c-finderProductCard'))
-        )
-        game_cards = driver.find_elements(By.CSS_SELECTOR, 'div.c-finderProductCard')
+        start = time.perf_counter()
+        game_cards = read_cards_js(driver) if extract == "js" else read_cards_elements(driver)
 
         for card in game_cards:
             try:
-                # Oyun adı
-                game_name_element = card.find_element(By.CSS_SELECTOR, 'div[data-title]')
-                game_name = game_name_element.get_attribute("data-title").strip()
-
-                # Metascore
-                metascore_element = card.find_element(By.CSS_SELECTOR, 'div.c-siteReviewScore span')
-                metascore = metascore_element.text.strip()
-
-                # Görsel URL'si
-                image_element = card.find_element(By.CSS_SELECTOR, 'img')
-                image_url = image_element.get_attribute("src")
-                if not image_url:
-                    image_url = image_element.get_attribute("data-src")
-                if not image_url:
-                    print(f"Görsel URL'si bulunamadı ({game_name})")
-
-                games.append({'Game Name': game_name, 'Metascore': metascore, 'Image URL': image_url})
+                games.append(game_from_card(card))
             except Exception as e:
-                print(f"Bir hata oluştu ({game_name}): {e}")
+                print(f"Bir hata oluştu ({card.get('name')}): {e}")
                 continue
+        timings["extract"] = time.perf_counter() - start
 
     except Exception as e:
         print(f"Sayfa {page_url} için oyun bilgileri bulunamadı: {e}")
+        return None
 
     return games
 
@@ -140,59 +181,162 @@ def save_to_csv(games, file_name):
         df.to_csv(file_name, index=False, encoding='utf-8-sig', mode='a', header=False)  # Dosya varsa ekle
     print(f"{len(games)} oyun '{file_name}' dosyasına kaydedildi.")
 
-def main():
-    base_url = "https://www.metacritic.com/browse/game/?releaseYearMin=2003&releaseYearMax=2024&page={page_number}"
-    total_pages = 100  # Toplam sayfa sayısı
-    all_games = []
-    file_name = 'metacritic_games.csv'
-    images_folder = 'gorseller'
-
-    # Görselleri kaydedeceğimiz klasörü oluştur
-    if not os.path.exists(images_folder):
-        os.makedirs(images_folder)
-        print(f"'{images_folder}' klasörü oluşturuldu.")
-
-    # ChromeDriver'ın tam yolu
-    chromedriver_path = r'C:\Users\Oğuzhan\steamoyuncekme\chromedriver.exe'  # ChromeDriver yolunuz
+def scrape_page(driver, page_url, timings, extract="js", fixture_base=None, record_folder=None):
+    """
+    Havuz işçileri için sayfa tarama adımı; sunucuyu yormamak için bekleme browser_pool'un hız sınırındadır.
+    """
+    print(f"Fetching games from: {page_url}")
+    return scrape_metacritic_page(page_url, driver, timings, extract, fixture_base, record_folder)
 
+def scrape_metacritic(csv_path=file_name, images_folder=images_folder, workers=1, rate=0.2, burst=1,
+                      pages=100, metrics="metacritic_page_metrics.csv", extract="js", parquet=False,
+                      fixtures_folder=None, record=False, resume=False, lean=False, keep_browser=False):
+    """
+    Metacritic sayfalarını tarar, kapak görsellerini indirir ve oyunları DataFrame olarak döndürür.
+    csv_path verilirse satırlar sayfa sayfa CSV'ye de yazılır (None: yalnızca bellekte);
+    parquet ise metascore'u tamsayı olan tipli ara dosya da yazılır.
+    fixtures_folder verilirse sayfalar o kayıt arşivinden, hız sınırı olmadan ve görseller indirilmeden
+    oynatılır; record ise canlı sayfaların render edilmiş HTML'i arşive kaydedilir.
+    resume ise CSV'nin devam kaydındaki son tamamlanan sayfadan devam edilir. Yüklenemeyen sayfalar
+    devam kaydının failed_pages listesine yazılır ve tarama sonraki sayfalarla sürer; böyle sayfa kaldıysa
+    sonda RuntimeError verilir ve --resume önce bu sayfaları yeniden dener. Yüklenip hiç oyun içermeyen
+    sayfa listenin sonudur: tarama orada başarıyla biter.
+    lean ise hafif tarayıcı modu (lean_browser.py) kullanılır; keep_browser ise tek tarayıcılı
+    çalıştırmanın tarayıcısı bu süreçteki sonraki çağrılar için açık bırakılır.
+    """
     # ChromeDriver dosyasının mevcut olup olmadığını kontrol edin
     if not os.path.exists(chromedriver_path):
-        print(f"Hata: '{chromedriver_path}' dosyası bulunamadı. Lütfen yolu kontrol edin.")
-        return
+        raise FileNotFoundError(f"'{chromedriver_path}' dosyası bulunamadı. Lütfen yolu kontrol edin.")
 
-    driver = setup_driver(chromedriver_path)
+    all_games = []
+    checkpoint = None
+    seen_names = set()
 
-    # Requests session oluşturun
-    session = requests.Session()
+    if csv_path:
+        config = {"url": base_url}
+        checkpoint = checkpoints.resume_checkpoint(csv_path, config) if resume else None
+        if checkpoint is None:
+            # Önceki çalıştırmanın satırlarına eklenmesin (yeniden denemelerde satırlar tekrarlanırdı)
+            pd.DataFrame(columns=CSV_COLUMNS).to_csv(csv_path, index=False, encoding='utf-8-sig')
+            checkpoint = checkpoints.new_checkpoint(csv_path, config, failed_pages=[])
+        else:
+            all_games = pd.read_csv(csv_path, dtype=str, keep_default_na=False).to_dict("records")
+            seen_names = set(checkpoint["seen"])
+    first_page = checkpoint["pages"] if checkpoint else 0
+    failed_pages = list(checkpoint.get("failed_pages", [])) if checkpoint else []
 
-    try:
-        for page_number in range(1, total_pages + 1):  # page=1'den başla
-            page_url = base_url.format(page_number=page_number)
-            print(f"Fetching games from page: {page_number}")
-            games = scrape_metacritic_page(page_url, driver)
+    replay = fixtures_folder and not record
+    stub = fixtures.start_server(fixtures_folder) if replay else None
+    if replay:
+        # Kayıttan oynatmada siteye istek gitmez; görsel URL'leri canlı sunucuları gösterdiği için indirilmez
+        rate = 0
+        images_folder = None
+
+    # Görseller ayrı bir iş parçacığı havuzunda, sayfa taraması sürerken indirilir
+    downloader = start_downloader(images_folder) if images_folder else None
 
+    # Önceki çalıştırmada alınamayan sayfalar önce yeniden denenir; page=1'den başla
+    page_numbers = failed_pages + list(range(first_page + 1, pages + 1))
+    if checkpoint and checkpoint["finished"]:
+        page_numbers = []
+    if replay:
+        # Kaydedilmemiş sayfalar boş yüklenip kart beklemesinde zaman aşımına uğrardı
+        page_numbers = [page_number for page_number in page_numbers
+                        if fixtures.has_response(fixtures_folder, base_url.format(page_number=page_number))]
+    page_urls = [base_url.format(page_number=page_number) for page_number in page_numbers]
+
+    def on_page(index, page_url, games):
+        # Sayfalar paralel taransa da CSV'ye sırayla yazılır
+        page_number = page_numbers[index]
+        # Önceki çalıştırmadan yeniden denenen sayfa listenin sonunu göstermez
+        retried = page_number in failed_pages
+        if games is None:
+            print(f"Sayfa {page_number} yüklenemedi; --resume ile yeniden denenecek.")
+            if not retried:
+                failed_pages.append(page_number)
+            games = []
+        elif retried:
+            failed_pages.remove(page_number)
+        listing_ended = not games and not retried and page_number not in failed_pages
+        # Devam edilen çalıştırmada sıralama kaydığı için yeniden görünen oyunlar atlanır
+        games = [game for game in games if game['Game Name'] not in seen_names]
+        all_games.extend(games)
+        if csv_path:
             if games:
-                all_games.extend(games)
-                save_to_csv(games, file_name)  # Her sayfa sonunda CSV'ye ekleme
-
-                # Görselleri indir
-                for game in games:
-                    game_name = game['Game Name']
-                    image_url = game['Image URL']
-                    if image_url:
-                        download_image(image_url, game_name, images_folder, session)
-                    else:
-                        print(f"Görsel URL'si mevcut değil, indirilmeyecek: {game_name}")
-
-            else:
-                print(f"Sayfa {page_number} boş veya yüklenemedi.")
-
-            # Sunucuyu yormamak için bekleme
-            time.sleep(3)
+                save_to_csv(games, csv_path)  # Her sayfa sonunda CSV'ye ekleme
+            # Alınamayan sayfa da devam kaydına işlenir, tarama sonraki sayfalarla sürer;
+            # yeniden denenen eski sayfalar tamamlanan sayfa sayısını geri almaz
+            checkpoints.commit_page(checkpoint, max(checkpoint["pages"], page_number),
+                                    [game['Game Name'] for game in games], failed_pages=sorted(failed_pages))
+
+        # Görselleri indirme kuyruğuna ekle
+        if downloader and games:
+            submit_downloads(downloader, games)
+        if listing_ended:
+            print(f"Sayfa {page_number} oyun içermiyor; sonraki sayfalar taranmayacak.")
+            return False
+
+    setup = partial(setup_driver, chromedriver_path, offline=bool(replay), lean=lean)
+    scrape = partial(scrape_page, extract=extract, fixture_base=stub["base"] if stub else None,
+                     record_folder=fixtures_folder if record else None)
+    try:
+        run_pages(setup, scrape, page_urls, on_page, workers, rate, burst, metrics, keep_browser)
     finally:
-        driver.quit()
+        if downloader:
+            finish_downloader(downloader)
+        if stub:
+            fixtures.stop_server(stub)
+
+    if checkpoint and not failed_pages and not checkpoint["finished"]:
+        checkpoints.finish_checkpoint(checkpoint)
+
+    # İndirme bittikten sonra yeni veya değişen kapakların küçük resimlerini üret
+    if images_folder:
+        generate_thumbnails(images_folder)
+    if failed_pages:
+        # Boru hattı aşamayı başarısız sayıp --resume ile yeniden denesin
+        raise RuntimeError(f"Metacritic'te {len(failed_pages)} sayfa alınamadı: {sorted(failed_pages)}.")
+    games = pd.DataFrame(all_games, columns=CSV_COLUMNS)
+    if parquet:
+        print(f"[INFO] Tipli ara dosya yazıldı -> {write_source(games, 'metacritic')}")
+    return games
+
+def main():
+    parser = argparse.ArgumentParser(description="Metacritic oyunlarını ve kapak görsellerini çeker")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel tarayıcı (süreç) sayısı")
+    parser.add_argument("--rate", type=float, default=0.2,
+                        help="Tarayıcı başına saniyede en fazla yüklenecek sayfa; havuzun toplamı workers x rate (0: sınırsız)")
+    parser.add_argument("--burst", type=int, default=1,
+                        help="Tarayıcı başına art arda beklemeden yüklenebilecek sayfa sayısı")
+    parser.add_argument("--pages", type=int, default=100, help="Taranacak sayfa sayısı")
+    parser.add_argument("--metrics", default="metacritic_page_metrics.csv",
+                        help="Sayfa başına süre ölçümlerinin yazılacağı CSV")
+    parser.add_argument("--extract", choices=EXTRACT_MODES, default="js",
+                        help="js: kartlar tek execute_script çağrısıyla okunur, elements: kart kart WebDriver çağrıları")
+    parser.add_argument("--parquet", action="store_true", help="Metascore'u tamsayı olan Parquet ara dosyası da yazar")
+    fixture_mode = parser.add_mutually_exclusive_group()
+    fixture_mode.add_argument("--record", metavar="ARŞİV", default=None,
+                              help="Render edilmiş sayfaları bu kayıt arşivine de yazar (fixtures.py)")
+    fixture_mode.add_argument("--replay", metavar="ARŞİV", default=None,
+                              help="Sayfaları siteye gitmeden bu kayıt arşivinden yükler")
+    parser.add_argument("--resume", action="store_true",
+                        help="Yarıda kalan çalıştırmaya metacritic_games.csv'nin devam kaydından devam eder")
+    parser.add_argument("--lean", action="store_true",
+                        help="Headless tarayıcı; görsel, yazı tipi, medya ve takip istekleri engellenir")
+    args = parser.parse_args()
+
+    try:
+        games = scrape_metacritic(file_name, images_folder, args.workers, args.rate, args.burst, args.pages,
+                                  args.metrics, args.extract, args.parquet, args.record or args.replay,
+                                  bool(args.record), args.resume, args.lean)
+    except FileNotFoundError as e:
+        print(f"Hata: {e}")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"[ERROR] {e} --resume bu sayfaları yeniden dener.")
+        sys.exit(1)
 
-    print(f"Toplam {len(all_games)} oyun '{file_name}' dosyasına kaydedildi.")
+    print(f"Toplam {len(games)} oyun '{file_name}' dosyasına kaydedildi.")
     print(f"Görseller '{images_folder}' klasörüne indirildi.")
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+# Tüm aşamaların ortak oyun adı temizleme ve eşleştirme anahtarı kuralları.
+# Skaler fonksiyonlar kazıyıcılarda satır satır (LRU önbellekli), *_titles fonksiyonları
+# birleştirmede pandas .str işlemleriyle tüm sütuna uygulanır; ikisi aynı sonucu verir.
+
+# 'word edition' şeklindeki ifadeler (case insensitive); 'word' alfasayısal, apostrof ve tire içerebilir
+_EDITION_PATTERN = re.compile(r"\b[\w'\-]+\s+edition\b", re.IGNORECASE)
+_TRADEMARK_PATTERN = re.compile(r"[™®©℠]")
+_COMBINING_PATTERN = re.compile(r"[̀-ͯ]")
+_APOSTROPHE_PATTERN = re.compile(r"['’`´]")
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s]|_")
+_SPACE_PATTERN = re.compile(r"\s+")
+# Türkçe büyük/küçük i harfleri casefold'dan önce düz i'ye indirilir ("İ".casefold() noktalı i üretir)
+_TURKISH_I = str.maketrans({"İ": "i", "ı": "i"})
+
+CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title(title):
+    """
+    Eğer 'edition' kelimesi başlıkta geçiyorsa, 'edition' ve ondan önceki kelimeyi kaldırır.
+    """
+    cleaned_title = _EDITION_PATTERN.sub("", title).strip()
+    # Eğer "edition" ifadesi birden fazla kez geçiyorsa, tekrar temizleme yapar
+    while _EDITION_PATTERN.search(cleaned_title):
+        cleaned_title = _EDITION_PATTERN.sub("", cleaned_title).strip()
+    return cleaned_title
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fold_title(title):
+    """
+    Karşılaştırma için büyük/küçük harf, Türkçe i, aksan, ticari marka işareti, noktalama ve
+    boşluk farklarını siler: "Pokémon™: Let's Go" -> "pokemon lets go".
+    """
+    title = _TRADEMARK_PATTERN.sub("", title.translate(_TURKISH_I))
+    title = _COMBINING_PATTERN.sub("", unicodedata.normalize("NFKD", title)).casefold()
+    title = _PUNCTUATION_PATTERN.sub(" ", _APOSTROPHE_PATTERN.sub("", title))
+    return _SPACE_PATTERN.sub(" ", title).strip()
+
+
+def normalize_title(title):
+    """
+    Mağazalar arası eşleştirme anahtarı: sürüm ekleri atılmış ve katlanmış başlık.
+    """
+    return fold_title(clean_title(title))
+
+
+def clean_titles(titles):
+    """
+    clean_title'ın pandas Series üzerindeki karşılığı.
+    """
+    titles = titles.str.replace(_EDITION_PATTERN, "", regex=True).str.strip()
+    while titles.str.contains(_EDITION_PATTERN, regex=True).any():
+        titles = titles.str.replace(_EDITION_PATTERN, "", regex=True).str.strip()
+    return titles
+
+
+def fold_titles(titles):
+    """
+    fold_title'ın pandas Series üzerindeki karşılığı.
+    """
+    titles = titles.str.translate(_TURKISH_I).str.replace(_TRADEMARK_PATTERN, "", regex=True)
+    titles = titles.str.normalize("NFKD").str.replace(_COMBINING_PATTERN, "", regex=True).str.casefold()
+    titles = titles.str.replace(_APOSTROPHE_PATTERN, "", regex=True).str.replace(_PUNCTUATION_PATTERN, " ", regex=True)
+    return titles.str.replace(_SPACE_PATTERN, " ", regex=True).str.strip()
+
+
+def normalize_titles(titles):
+    """
+    normalize_title'ın pandas Series üzerindeki karşılığı; boş başlıklar boş anahtar olur.
+    """
+    return fold_titles(clean_titles(pd.Series(titles).fillna("").astype(str)))
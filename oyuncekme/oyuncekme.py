@@ -1,11 +1,27 @@
-import aiohttp
+import argparse
 import asyncio
-from bs4 import BeautifulSoup
 import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import pandas as pd
 from tqdm import tqdm
 
+import checkpoints
+import dlc_cache
+import fixtures
+import http_client
+from intermediates import write_source
+from normalization import fold_title
+from steam_parsing import DLC_MARKER, is_dlc_page, parse_search_page
+
 # Hedef URL Şablonu
 base_url = "https://store.steampowered.com/search/"
+# JSON modu: arama sonuçları sayfa iskeleti olmadan, tür bilgisi oyun sayfası yerine appdetails'ten alınır
+json_search_url = "https://store.steampowered.com/search/results/"
+appdetails_url = "https://store.steampowered.com/api/appdetails"
 params = {
     "filter": "topsellers",
     "os": "win",
@@ -16,124 +32,353 @@ params = {
 # CSV Dosyasını Hazırlama
 csv_file = "steamverisi.csv"
 csv_headers = ["Oyun", "Fiyat", "URL"]  # URL sütunu eklendi
+json_csv_headers = csv_headers + ["AppID"]
 
 # Toplam Oyun Sayısı ve Hedef
 total_games = 8000
 collected_games = 0
-start = 0
-collected_titles = set()  # Yinelenen oyunları önlemek için başlıkları takip eden set
-buffer = []  # Verileri geçici olarak burada tutacağız
+collected_titles = set()  # Yinelenen oyunları önlemek için katlanmış başlıkları takip eden set
+
+# Önden çekilen arama sayfası ve DLC kontrolü yapan görev sayıları. Aynı anda gerçekten açık olan
+# istek sayısını http_client'ın uyarlanır sınırı belirler; görevler sınır dolunca sırada bekler.
+PAGE_CONCURRENCY = 4
+DLC_WORKERS = 100
+# HTML ayrıştırma olay döngüsünü bloklamasın diye ayrı süreçlerde yapılır (None: çekirdek sayısı)
+PARSE_WORKERS = None
+parse_pool = None
+# "html": arama sayfası + her oyunun mağaza sayfası, "json": arama sonuçları JSON'u + appdetails
+fetch_mode = "html"
+# Kayıt/oynatma modunda isteklerin gideceği yerel sunucunun adresi (fixtures.py); None: canlı site
+fixture_base = None
+
+
+async def parse_in_pool(func, content):
+    """Ayrıştırma fonksiyonunu süreç havuzunda çalıştırır."""
+    return await asyncio.get_running_loop().run_in_executor(parse_pool, func, content)
 
-# CSV Dosyasını Başlatma
-with open(csv_file, mode='w', encoding='utf-8', newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(csv_headers)
 
 # DLC Kontrol Fonksiyonu
-async def check_dlc(session, url):
-    """Bir oyun sayfasının DLC olup olmadığını kontrol eder."""
+async def check_dlc(client, row, cache, cache_stats):
+    """
+    Bir oyun sayfasının DLC olup olmadığını kontrol eder; sayfa alınamazsa tür bilinmediği için None döner.
+    Sonuç uygulama kimliğiyle önbelleğe alınır: süresi dolmamış kayıtlar için istek atılmaz,
+    dolmuş olanlar ETag/Last-Modified ile koşullu istenir.
+    """
+    url = row[2]
+    app_id = dlc_cache.app_id_from_url(url)
+    entry = dlc_cache.get_entry(cache, app_id) if app_id else None
+    if entry and dlc_cache.is_fresh(entry):
+        cache_stats["hits"] += 1
+        return entry["is_dlc"]
     try:
-        async with session.get(url) as response:
-            if response.status != 200:
-                return False
-            content = await response.text()
-            soup = BeautifulSoup(content, 'html.parser')
-            purchase_area = soup.find('div', class_='game_area_purchase')
-            if purchase_area and purchase_area.find('div', class_='game_area_bubble game_area_dlc_bubble'):
-                return True  # DLC ise True döner
-            return False
+        status, headers, content = await http_client.fetch(
+            client, fixtures.target_url(fixture_base, url), headers=dlc_cache.conditional_headers(entry)
+        )
+        if status == 304 and entry:
+            cache_stats["revalidated"] += 1
+            dlc_cache.store_entry(cache, cache_stats, app_id, entry["is_dlc"], entry["etag"], entry["last_modified"])
+            return entry["is_dlc"]
+        if status != 200:
+            # Yeniden denemelere rağmen alınamayan sayfa önbelleğe yazılmaz, sonraki çalıştırmada tekrar denenir
+            return None
+        # DLC etiketi hiç geçmeyen sayfalar süreç havuzuna gönderilmeden elenir
+        is_dlc = DLC_MARKER in content and await parse_in_pool(is_dlc_page, content)  # DLC ise True döner
+        if app_id is None:
+            cache_stats["uncached"] += 1
+        else:
+            cache_stats["misses"] += 1
+            dlc_cache.store_entry(cache, cache_stats, app_id, is_dlc, headers.get("ETag"), headers.get("Last-Modified"))
+        return is_dlc
     except Exception as e:
         print(f"[ERROR] DLC kontrolü sırasında hata oluştu: {e}")
+        return None
+
+async def check_dlc_json(client, row, cache, cache_stats):
+    """
+    JSON modunda DLC kontrolü: mağaza sayfası yerine appdetails'in tür alanına bakar.
+    Uygulama kimliği olmayan paket/bundle satırları DLC sayılmaz. Sonuçlar aynı önbelleği kullanır.
+    appdetails alınamazsa veya tür bildirmezse (success false) None döner.
+    """
+    app_id = row[3]
+    if not app_id:
+        cache_stats["uncached"] += 1
         return False
+    entry = dlc_cache.get_entry(cache, app_id)
+    if entry and dlc_cache.is_fresh(entry):
+        cache_stats["hits"] += 1
+        return entry["is_dlc"]
+    try:
+        status, _, content = await http_client.fetch(
+            client, fixtures.target_url(fixture_base, appdetails_url),
+            params={"appids": app_id, "filters": "basic", "cc": params["cc"]},
+        )
+        if status != 200:
+            return None
+        details = (json.loads(content) or {}).get(app_id) or {}
+    except Exception as e:
+        print(f"[ERROR] DLC kontrolü sırasında hata oluştu: {e}")
+        return None
+    app_type = (details.get("data") or {}).get("type") if details.get("success") else None
+    if not app_type:
+        return None
+    is_dlc = app_type == "dlc"
+    cache_stats["misses"] += 1
+    dlc_cache.store_entry(cache, cache_stats, app_id, is_dlc)
+    return is_dlc
+
+async def fetch_page(client, offset):
+    """Bir arama sayfasını çeker; (durum kodu, sonuç HTML'i) döndürür."""
+    if fetch_mode == "json":
+        # infinite=1 yalnızca sonuç satırlarını JSON içinde döndürür
+        json_params = {**params, "start": offset, "infinite": 1}
+        status, _, content = await http_client.fetch(client, fixtures.target_url(fixture_base, json_search_url), json_params)
+        if status != 200:
+            return status, None
+        return status, json.loads(content).get("results_html", "")
+    status, _, content = await http_client.fetch(
+        client, fixtures.target_url(fixture_base, base_url), {**params, "start": offset}
+    )
+    return status, content
+
+
+async def produce_rows(client, queue, pbar, page_ends, next_offset=0):
+    """
+    Arama sayfalarını PAGE_CONCURRENCY kadar önden çeker, ancak sırayla işler.
+    Kabul edilen her oyun sıra numarasıyla DLC kuyruğuna konur; böylece yinelenen
+    kontrolü ve çıktı sırası sayfalar paralel çekilse de değişmez.
+    İşlenen her sayfanın sonu (son sıra numarası, sonraki offset, yeni başlıklar) page_ends'e eklenir.
+    Listenin sonuna veya hedef oyun sayısına ulaşılırsa True, sayfa alınamazsa False döndürür.
+    """
+    global collected_games
+    pages = {}
+    sequence = 0
+    try:
+        while collected_games < total_games:
+            # Pencereyi doldur: sıradaki sayfalar arka planda inmeye devam eder
+            while len(pages) < PAGE_CONCURRENCY:
+                pages[next_offset] = asyncio.create_task(fetch_page(client, next_offset))
+                next_offset += params["count"]
+
+            offset = min(pages)
+            status, content = await pages.pop(offset)
+            if content is None:
+                print(f"Sayfa alınamadı, durum kodu: {status}")
+                return False
+
+            parser = partial(parse_search_page, with_app_id=fetch_mode == "json")
+            result_count, rows = await parse_in_pool(parser, content)
+            # Eğer sonuç yoksa, döngüyü kır
+            if not result_count:
+                print("Daha fazla oyun bulunamadı.")
+                return True
+
+            page_titles = []
+            for row in rows:
+                if collected_games >= total_games:
+                    break
+                # Yinelenen Oyunu Kontrol Etme; yalnızca büyük/küçük harf, ™ veya boşlukla ayrışan başlıklar da aynı sayılır
+                title_key = fold_title(row[0])
+                if title_key in collected_titles:
+                    continue
+                collected_titles.add(title_key)  # Yinelenenleri engelle
+                page_titles.append(title_key)
+                collected_games += 1
+                pbar.update(1)
+                await queue.put((sequence, row))
+                sequence += 1
+            page_ends.append({
+                "end": sequence, "next_offset": offset + params["count"],
+                "collected": collected_games, "titles": page_titles,
+            })
+        return True
+    finally:
+        for task in pages.values():
+            task.cancel()
+        await asyncio.gather(*pages.values(), return_exceptions=True)
+
+
+def commit_pages(results, file):
+    """
+    Tüm oyunları CSV'ye yazılmış sayfaları devam kaydına işler.
+    """
+    while results["page_ends"] and results["page_ends"][0]["end"] <= results["next"]:
+        page = results["page_ends"].popleft()
+        file.flush()
+        checkpoint = results["checkpoint"]
+        checkpoints.commit_page(checkpoint, checkpoint["pages"] + 1, page["titles"],
+                                next_offset=page["next_offset"], collected=page["collected"])
+
+
+async def check_worker(client, queue, results, writer, cache, cache_stats):
+    """
+    Kuyruktaki oyunların DLC kontrolünü yapar; sırası gelen sonuçları listeye ekler ve (varsa) CSV'ye yazar.
+    Türü doğrulanamayan (kontrol None döndüren) satırlar oyun sayılmaz, yazılmaz ve sayılıp raporlanır.
+    """
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        sequence, row = item
+        check = check_dlc_json if fetch_mode == "json" else check_dlc
+        results["pending"][sequence] = (row, await check(client, row, cache, cache_stats))
+        # Sonuçlar sıra numarasına göre, önceki oyunların hepsi bitince yazılır
+        while results["next"] in results["pending"]:
+            ready_row, is_dlc = results["pending"].pop(results["next"])
+            if is_dlc is None:
+                results["unverified"].append(ready_row[0])
+            elif not is_dlc:
+                results["rows"].append(ready_row)
+                if writer is not None:
+                    writer.writerow(ready_row)
+            results["next"] += 1
+        if results["checkpoint"]:
+            commit_pages(results, results["file"])
+
 
 # Oyunları Çekme ve İşleme Fonksiyonu
-async def fetch_games():
-    global collected_games, start, buffer
-    async with aiohttp.ClientSession(headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}) as session:
-        with tqdm(total=total_games, desc="Toplanan Oyun Sayısı") as pbar:
-            while collected_games < total_games:
-                # URL'yi Oluşturma
-                params["start"] = start
-                async with session.get(base_url, params=params) as response:
-                    if response.status != 200:
-                        print(f"Sayfa alınamadı, durum kodu: {response.status_code}")
-                        break
-
-                    # Sayfa İçeriğini Parse Etme
-                    content = await response.text()
-                    soup = BeautifulSoup(content, 'html.parser')
-
-                    # Oyun Kartlarını Bulma
-                    search_results = soup.find_all('a', class_='search_result_row')
-
-                    # Eğer sonuç yoksa, döngüyü kır
-                    if not search_results:
-                        print("Daha fazla oyun bulunamadı.")
-                        break
-
-                    # DLC Kontrolleri İçin Görevler
-                    buffer.clear()  # Yeni buffer temizlenir
-                    tasks = []
-                    for game in search_results:
-                        if collected_games >= total_games:
-                            break
-
-                        # Başlık
-                        title_tag = game.find('span', class_='title')
-                        title = title_tag.text.strip() if title_tag else "Başlık Bulunamadı"
-
-                        # Yinelenen Oyunu Kontrol Etme
-                        if title in collected_titles:
-                            continue
-
-                        # Güncel Fiyat
-                        price_tag = game.find('div', class_='discount_final_price')
-                        price = price_tag.text.strip() if price_tag else "Fiyat Bilgisi Yok"
-
-                        # Ücretsiz Oyunları Hariç Tutma
-                        if price.lower() == "ücretsiz":
-                            continue
-
-                        # Fiyatın Geçerli Olduğunu Kontrol Etme
-                        if price == "Fiyat Bilgisi Yok":
-                            continue
-
-                        # URL
-                        url = game['href'] if game.has_attr('href') else "URL Bulunamadı"
-
-                        # DLC Kontrolü için görev oluştur
-                        tasks.append(asyncio.create_task(check_dlc(session, url)))
-
-                        # Geçici olarak başlık, fiyat ve URL ekle
-                        buffer.append([title, price, url])
-                        collected_titles.add(title)  # Yinelenenleri engelle
-                        collected_games += 1
-                        pbar.update(1)
-
-                    # DLC Kontrollerini Yap ve Buffer'ı Filtrele
-                    dlc_results = await asyncio.gather(*tasks)
-                    filtered_buffer = [
-                        buffer[idx] for idx, is_dlc in enumerate(dlc_results) if not is_dlc
-                    ]
-
-                    # CSV'ye Yaz
-                    with open(csv_file, mode='a', encoding='utf-8', newline='') as file:
-                        writer = csv.writer(file)
-                        writer.writerows(filtered_buffer)
-
-                # Sonraki Sayfaya Geçmek İçin 'start' Parametresini Güncelleme
-                start += params["count"]
-
-# Ana Fonksiyon
-async def main():
-    await fetch_games()
-    # Kalan Veriyi CSV'ye Yaz
-    if buffer:
-        with open(csv_file, mode='a', encoding='utf-8', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerows(buffer)
-
-# Asyncio Çalıştır
-asyncio.run(main())
-
-print(f"\nToplam {collected_games} oyun verisi 'steamverisi.csv' dosyasına kaydedildi.")
+async def fetch_games(csv_path=csv_file, cache_path=dlc_cache.DLC_CACHE_FILE, checkpoint=None):
+    """
+    Oyunları çeker ve DLC olmayan satırları sırasıyla döndürür; csv_path verilirse CSV'ye de ekler.
+    checkpoint verilirse tarama kayıttaki offset'ten başlar ve her tamamlanan sayfa kayda işlenir.
+    Bir arama sayfası alınamazsa (tamamlanan sayfalar yazıldıktan sonra) RuntimeError verilir.
+    """
+    queue = asyncio.Queue(maxsize=DLC_WORKERS * 4)
+    results = {"next": 0, "pending": {}, "rows": [], "unverified": [], "page_ends": deque(), "checkpoint": checkpoint}
+    cache = dlc_cache.open_dlc_cache(cache_path)
+    cache_stats = dlc_cache.new_stats()
+    client = http_client.create_client(headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"})
+    try:
+        with open(csv_path or os.devnull, mode='a', encoding='utf-8', newline='') as file, \
+                tqdm(total=total_games, initial=collected_games, desc="Toplanan Oyun Sayısı") as pbar:
+            writer = csv.writer(file) if csv_path else None
+            results["file"] = file
+            workers = [
+                asyncio.create_task(check_worker(client, queue, results, writer, cache, cache_stats))
+                for _ in range(DLC_WORKERS)
+            ]
+            # Açık istek, eşzamanlılık sınırı, istek/saniye ve hata oranı çubukta canlı gösterilir
+            reporter = asyncio.create_task(http_client.report_stats(client, pbar))
+            completed = False
+            try:
+                next_offset = checkpoint["next_offset"] if checkpoint else 0
+                completed = await produce_rows(client, queue, pbar, results["page_ends"], next_offset)
+            finally:
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+                reporter.cancel()
+                cache.commit()
+                cache.close()
+                if checkpoint:
+                    # Son oyunu yeni oyun içermeyen sayfalar da işlenir; liste bittiyse kayıt tamamlanır
+                    commit_pages(results, file)
+                    if completed:
+                        checkpoints.finish_checkpoint(checkpoint)
+    finally:
+        await http_client.close_client(client)
+    http_client.print_stats(client)
+    dlc_cache.print_stats(cache_stats)
+    if results["unverified"]:
+        print(f"[WARNING] {len(results['unverified'])} satırın DLC olup olmadığı doğrulanamadı, CSV'ye yazılmadı "
+              f"(ör. {', '.join(results['unverified'][:5])}).")
+    if not completed:
+        # Boru hattı aşamayı başarısız sayıp --resume ile yeniden denesin
+        raise RuntimeError("Steam taraması yarıda kaldı; --resume ile devam edilebilir.")
+    return results["rows"]
+
+def read_committed_rows(csv_path):
+    """
+    Devam edilen çalıştırmada CSV'ye önceden yazılmış satırları (başlık hariç) döndürür.
+    """
+    with open(csv_path, encoding='utf-8', newline='') as file:
+        return list(csv.reader(file))[1:]
+
+def fetch_with_pool(csv_path, fixtures_folder, record, checkpoint):
+    """
+    Ayrıştırma süreç havuzunu ve (varsa) kayıt sunucusunu açıp fetch_games'i çalıştırır.
+    """
+    global parse_pool, fixture_base
+    # Kayıt ve oynatmada DLC önbelleği kullanılmaz: her oyun sayfası istenir, böylece arşiv eksiksiz olur
+    cache_path = ":memory:" if fixtures_folder else dlc_cache.DLC_CACHE_FILE
+    stub = fixtures.start_server(fixtures_folder, record) if fixtures_folder else None
+    fixture_base = stub["base"] if stub else None
+    try:
+        with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+            # Asyncio Çalıştır
+            return asyncio.run(fetch_games(csv_path, cache_path, checkpoint))
+    finally:
+        parse_pool = None
+        fixture_base = None
+        if stub:
+            fixtures.stop_server(stub)
+
+def scrape_steam(mode="html", csv_path=csv_file, parquet=False, fixtures_folder=None, record=False, resume=False,
+                 games=None):
+    """
+    Steam en çok satanlarını çeker ve DLC olmayan oyunları DataFrame olarak döndürür.
+    csv_path verilirse satırlar çekilirken CSV'ye de yazılır (None: yalnızca bellekte);
+    parquet ise fiyatları çözülmüş tipli ara dosya da yazılır.
+    fixtures_folder verilirse istekler o arşivden oynatılır (record ise siteye gidip arşive kaydedilir).
+    resume ise CSV'nin devam kaydındaki son tamamlanan sayfadan devam edilir.
+    games verilirse toplanacak oyun sayısı olarak kullanılır; kayıtta arşive yazılır ki oynatma
+    kaydedilmemiş sayfalara gitmesin.
+    Aynı süreçte tekrar çağrılabilir; sayaçlar her çağrıda sıfırlanır.
+    """
+    global fetch_mode, collected_games, total_games
+    fetch_mode = mode
+    if games is not None:
+        total_games = games
+    if fixtures_folder and record:
+        fixtures.save_run_settings(fixtures_folder, "steam", {"games": total_games, "mode": fetch_mode})
+    collected_games = 0
+    collected_titles.clear()
+    headers = json_csv_headers if fetch_mode == "json" else csv_headers
+
+    checkpoint = None
+    committed_rows = []
+    if csv_path:
+        config = {"mode": fetch_mode}
+        checkpoint = checkpoints.resume_checkpoint(csv_path, config) if resume else None
+        if checkpoint is None:
+            # CSV Dosyasını Başlatma
+            with open(csv_path, mode='w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(headers)
+            checkpoint = checkpoints.new_checkpoint(csv_path, config, next_offset=0, collected=0)
+        else:
+            committed_rows = read_committed_rows(csv_path)
+            collected_games = checkpoint["collected"]
+            collected_titles.update(checkpoint["seen"])
+
+    if checkpoint and checkpoint["finished"]:
+        rows = committed_rows
+    else:
+        rows = committed_rows + fetch_with_pool(csv_path, fixtures_folder, record, checkpoint)
+    games = pd.DataFrame(rows, columns=headers)
+    if parquet:
+        print(f"[INFO] Tipli ara dosya yazıldı -> {write_source(games, 'steam')}")
+    return games
+
+def main():
+    parser = argparse.ArgumentParser(description="Steam en çok satanlar listesini steamverisi.csv'ye çeker")
+    parser.add_argument("--mode", choices=["html", "json"], default="html",
+                        help="json: oyun sayfaları yerine Steam JSON uçlarını kullanır ve AppID sütunu ekler")
+    parser.add_argument("--parquet", action="store_true", help="Fiyatları çözülmüş Parquet ara dosyası da yazar")
+    parser.add_argument("--games", type=int, default=total_games, help="Toplanacak oyun sayısı")
+    parser.add_argument("--resume", action="store_true",
+                        help="Yarıda kalan çalıştırmaya steamverisi.csv'nin devam kaydından devam eder")
+    fixture_mode = parser.add_mutually_exclusive_group()
+    fixture_mode.add_argument("--record", metavar="ARŞİV", default=None,
+                              help="Steam yanıtlarını bu kayıt arşivine de yazar (fixtures.py)")
+    fixture_mode.add_argument("--replay", metavar="ARŞİV", default=None,
+                              help="Siteye gitmeden yanıtları bu kayıt arşivinden oynatır")
+    args = parser.parse_args()
+    scrape_steam(args.mode, parquet=args.parquet, fixtures_folder=args.record or args.replay, record=bool(args.record),
+                 resume=args.resume, games=args.games)
+
+    print(f"\nToplam {collected_games} oyun verisi 'steamverisi.csv' dosyasına kaydedildi.")
+
+
+# Süreç havuzu işçileri bu dosyayı yeniden içe aktardığında tarama tekrar başlamamalı
+if __name__ == "__main__":
+    main()
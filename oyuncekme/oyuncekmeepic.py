@@ -1,13 +1,14 @@
+import argparse
 import os
 import csv
+import sys
 import time
+from functools import partial
 import random
-import re  # Regex kullanımı için ekledik
+import pandas as pd
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     ElementClickInterceptedException,
@@ -16,21 +17,61 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium_stealth import stealth
 
+import checkpoints
+import fixtures
+from browser_pool import run_pages
+from epic_catalog import drain_network_log, load_payloads, parse_catalog_payload, save_payload, wait_for_catalog
+from intermediates import write_source
+from lean_browser import add_lean_options, block_heavy_resources, enable_network_log
+from normalization import clean_title
+from page_waits import loaded_without_cards, wait_for_cards, wait_for_network_idle
+
 # Base URL ve diğer ayarlar
 BASE_URL_TEMPLATE = "https://store.epicgames.com/tr/browse?sortBy=releaseDate&sortDir=DESC&category=Game&count=40&start={start}"
 CSV_FILE = "epic_games_results.csv"
+CSV_COLUMNS = ["Oyun Adı", "Fiyat", "URL"]
 EXCLUDE_KEYWORDS = ["+18", "pack"]
 START_INCREMENT = 40  # Her sayfada ilerleme miktarı
+CARD_SELECTOR = "a.css-g3jcms"
+TITLE_SELECTOR = "span.css-1ljj0lu"  # Doğru sınıfı kontrol edin
+PRICE_SELECTOR = "span.css-12s1vua"
+# network: kartlar DOM yerine mağazanın GraphQL katalog yanıtından okunur (epic_catalog.py)
+EXTRACT_MODES = ["js", "elements", "network"]
+
+# Tüm kartların alanlarını tek execute_script çağrısıyla okur (kart başına 4-5 WebDriver isteği yerine).
+# Başlık elementi yoksa title null döner ve Python tarafında aria-label'a düşülür.
+CARDS_SCRIPT = """
+const [cardSelector, titleSelector, priceSelector] = arguments;
+return Array.from(document.querySelectorAll(cardSelector), card => {
+    const title = card.querySelector(titleSelector);
+    const price = card.querySelector(priceSelector);
+    return {
+        title: title ? title.innerText : null,
+        aria_label: card.getAttribute("aria-label"),
+        price: price ? price.innerText : null,
+        url: card.href,
+    };
+});
+"""
 
-def setup_driver():
+def setup_driver(offline=False, lean=False, worker_id=0):
     """
-    Selenium tarayıcı ayarlarını yapılandırır ve mevcut Chrome profilini kullanır.
+    Selenium tarayıcı ayarlarını yapılandırır ve mevcut Chrome profilini kullanır. Performans günlüğü
+    her zaman açıktır: network modu katalog yanıtını, sayfa ölçümleri aktarılan baytı buradan okur.
+    offline ise tarayıcı yerel kayıt sunucusu dışındaki hiçbir adrese bağlanamaz; lean ise tarayıcı
+    headless çalışır, görsel/yazı tipi/medya/takip istekleri engellenir ve disk önbelleği saklanır.
     """
     options = Options()
+    enable_network_log(options)
+    if offline:
+        options.add_argument(fixtures.OFFLINE_HOST_RULES)
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/114.0.0.0 Safari/537.36")
-    driver = uc.Chrome(options=options)
+    if lean:
+        # Headless'ı undetected_chromedriver kendisi açar (tespit edilen işaretleri de gizleyerek)
+        add_lean_options(options, "epic", worker_id, headless=False)
+    driver = uc.Chrome(options=options, headless=lean)
 
     stealth(driver,
             languages=["tr-TR", "tr"],
@@ -40,6 +81,8 @@ def setup_driver():
             renderer="Intel Iris OpenGL Engine",
             fix_hairline=True,
             )
+    if lean:
+        block_heavy_resources(driver)
 
     return driver
 
@@ -51,73 +94,107 @@ def clear_csv_file(file_path):
         os.remove(file_path)
     print(f"[INFO] '{file_path}' dosyası silindi ve yeniden oluşturulacak.")
 
-def clean_title(title):
+def read_cards_js(driver):
     """
-    Eğer 'edition' kelimesi başlıkta geçiyorsa, 'edition' ve ondan önceki kelimeyi kaldırır.
+    Sayfadaki kartların ham alanlarını tek JavaScript çağrısıyla sözlük listesi olarak döndürür.
     """
-    try:
-        # 'word edition' şeklindeki ifadeleri (case insensitive) bulur ve kaldırır
-        # Burada 'word' alfasayısal, apostrof ve tire içerebilir
-        pattern = re.compile(r'\b[\w\'\-]+\s+edition\b', re.IGNORECASE)
-        cleaned_title = pattern.sub('', title).strip()
-        
-        # Eğer "edition" ifadesi birden fazla kez geçiyorsa, tekrar temizleme yapar
-        while re.search(pattern, cleaned_title):
-            cleaned_title = pattern.sub('', cleaned_title).strip()
-        
-        return cleaned_title
-    except Exception as e:
-        print(f"[ERROR] Başlık temizleme hatası: {e}")
-        return title
+    return driver.execute_script(CARDS_SCRIPT, CARD_SELECTOR, TITLE_SELECTOR, PRICE_SELECTOR)
+
+def read_cards_elements(driver):
+    """
+    read_cards_js ile aynı alanları eski yöntemle, her kart için ayrı WebDriver çağrılarıyla okur.
+    """
+    cards = []
+    for element in driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR):
+        try:
+            try:
+                title = element.find_element(By.CSS_SELECTOR, TITLE_SELECTOR).text
+            except NoSuchElementException:
+                title = None
+            try:
+                price = element.find_element(By.CSS_SELECTOR, PRICE_SELECTOR).text
+            except NoSuchElementException:
+                price = None
+            cards.append({
+                "title": title,
+                "aria_label": element.get_attribute("aria-label"),
+                "price": price,
+                "url": element.get_attribute("href"),
+            })
+        except Exception as e:
+            print(f"[ERROR] Veri işleme hatası: {e}")
+    return cards
 
-def fetch_epic_games_data(driver):
+def game_from_card(card):
+    """
+    Ham kart alanlarından oyun kaydını üretir; başlığı temizler, dışlanan oyunlarda None döner.
+    """
+    # İlk olarak daha spesifik bir elementten oyun adını almaya çalış
+    if card["title"] is not None:
+        title = card["title"].strip()
+    else:
+        print("[WARNING] Oyun adı elementi bulunamadı, aria-label'dan deniyor.")
+        # Eğer spesifik element bulunamazsa, aria-label'dan oyun adını al
+        title = extract_title_from_aria_label(card["aria_label"].strip())
+
+    # Oyun adını temizle
+    title = clean_title(title)
+
+    if not title or any(kw in title.lower() for kw in EXCLUDE_KEYWORDS):
+        return None
+
+    price = card["price"].strip() if card["price"] is not None else "Ücretsiz"
+
+    # Oyun URL'sini al
+    game_url = card["url"].strip()
+
+    print(f"[DATA] {title} - Fiyat: {price} - URL: {game_url}")
+    return {"Oyun Adı": title, "Fiyat": price, "URL": game_url}
+
+def games_from_cards(cards):
+    """
+    Ham kartları sırayla oyun kayıtlarına çevirir; işlenemeyen kartlar atlanır.
+    """
+    games = []
+    for card in cards:
+        try:
+            game = game_from_card(card)
+            if game:
+                games.append(game)
+        except Exception as e:
+            print(f"[ERROR] Veri işleme hatası: {e}")
+    return games
+
+def fetch_epic_games_data(driver, timings=None, extract="js"):
     """
     Selenium kullanarak Epic Games Store'dan veri çeker.
+    extract "js" ise kartlar tek execute_script çağrısıyla, "elements" ise kart kart okunur.
+    timings verilirse bekleme ve veri çıkarma süreleri (saniye) içine yazılır.
+    Sayfa yüklendiği halde hiç kart yoksa (katalogun sonu) boş liste, yüklenemezse None döner.
     """
+    timings = {} if timings is None else timings
     games = []
     try:
-        # Timeout süresini random bir aralıkta ayarlayın (örneğin 10-20 saniye)
-        min_timeout = 10
-        max_timeout = 20
-        timeout_duration = random.randint(min_timeout, max_timeout)
-        WebDriverWait(driver, timeout_duration).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.css-g3jcms"))
-        )
-        game_elements = driver.find_elements(By.CSS_SELECTOR, "a.css-g3jcms")
-        for element in game_elements:
-            try:
-                # İlk olarak daha spesifik bir elementten oyun adını almaya çalış
-                try:
-                    title_element = element.find_element(By.CSS_SELECTOR, "span.css-1ljj0lu")  # Doğru sınıfı kontrol edin
-                    title = title_element.text.strip()
-                except NoSuchElementException:
-                    print("[WARNING] Oyun adı elementi bulunamadı, aria-label'dan deniyor.")
-                    # Eğer spesifik element bulunamazsa, aria-label'dan oyun adını al
-                    aria_label = element.get_attribute("aria-label").strip()
-                    title = extract_title_from_aria_label(aria_label)
-
-                # Oyun adını temizle
-                title = clean_title(title)
-
-                if not title or any(kw in title.lower() for kw in EXCLUDE_KEYWORDS):
-                    continue
-
-                try:
-                    price_element = element.find_element(By.CSS_SELECTOR, "span.css-12s1vua")
-                    price = price_element.text.strip() if price_element else "Ücretsiz"
-                except NoSuchElementException:
-                    price = "Ücretsiz"
-
-                # Oyun URL'sini al
-                game_url = element.get_attribute("href").strip()
-
-                print(f"[DATA] {title} - Fiyat: {price} - URL: {game_url}")
-                games.append({"Oyun Adı": title, "Fiyat": price, "URL": game_url})
-            except Exception as e:
-                print(f"[ERROR] Veri işleme hatası: {e}")
+        # Sabit bekleme yerine kartların render edilip sayılarının sabitlenmesini,
+        # ardından fiyatları getiren isteklerin bitmesini bekle
+        start = time.perf_counter()
+        try:
+            wait_for_cards(driver, CARD_SELECTOR, timeout=20)
+            wait_for_network_idle(driver)
+        finally:
+            timings["wait"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cards = read_cards_js(driver) if extract == "js" else read_cards_elements(driver)
+        games = games_from_cards(cards)
+        timings["extract"] = time.perf_counter() - start
     except TimeoutException:
+        if loaded_without_cards(driver, CARD_SELECTOR):
+            print("[INFO] Sayfada oyun yok; katalogun sonuna ulaşıldı.")
+            return []
         print("[ERROR] Sayfa yükleme zaman aşımına uğradı.")
         driver.save_screenshot("page_load_timeout.png")
+        return None
     return games
 
 def extract_title_from_aria_label(aria_label):
@@ -169,7 +246,7 @@ def save_to_csv(games, file_path, write_header=False):
     """
     write_mode = "w" if write_header else "a"
     with open(file_path, mode=write_mode, newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=["Oyun Adı", "Fiyat", "URL"])
+        writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
         if write_header:
             writer.writeheader()
         writer.writerows(games)
@@ -189,45 +266,201 @@ def human_like_actions(driver):
     except Exception as e:
         print(f"[ERROR] Human-like actions sırasında hata: {e}")
 
-def main():
-    driver = setup_driver()
+def fetch_epic_catalog_data(driver, url, timings, payloads_folder=None):
+    """
+    Oyunları DOM yerine sayfanın yüklediği GraphQL katalog yanıtından çıkarır; kart render'ı beklenmez.
+    payloads_folder verilirse yanıt --payloads ile yeniden oynatılmak üzere kaydedilir.
+    """
+    start = time.perf_counter()
+    payload = wait_for_catalog(driver)
+    timings["wait"] = time.perf_counter() - start
+    if payload is None:
+        print("[ERROR] Katalog yanıtı yakalanamadı.")
+        return None
+    if payloads_folder:
+        save_payload(payloads_folder, url, payload)
+
+    start = time.perf_counter()
+    games = games_from_cards(parse_catalog_payload(payload))
+    timings["extract"] = time.perf_counter() - start
+    return games
+
+def scrape_page(driver, url, timings, extract="js", payloads_folder=None, fixture_base=None, record_folder=None,
+                lean=False):
+    """
+    Tek bir sayfayı yükler ve oyunları döndürür; havuz işçilerinde de bu fonksiyon çalışır.
+    Sayfalar arası bekleme browser_pool'un hız sınırındadır. fixture_base verilirse sayfa yerel
+    kayıt sunucusundan yüklenir; record_folder verilirse render edilmiş HTML o arşive yazılır.
+    lean (headless) ise CAPTCHA çözülemeyeceği için sayfa yüklenemedi sayılır (None).
+    """
+    print(f"[INFO] Sayfa yükleniyor: {url}")
+    if extract == "network":
+        drain_network_log(driver)
+    start = time.perf_counter()
+    driver.get(fixtures.target_url(fixture_base, url))
+    timings["load"] = time.perf_counter() - start
+
+    if not fixture_base and is_captcha_present(driver):
+        if lean:
+            # Headless tarayıcıda CAPTCHA görünmez; sayfa yüklenemedi sayılır ve devam kaydı bu sayfada kalır
+            print("[ERROR] CAPTCHA algılandı; çözmek için --lean olmadan --resume ile devam edin.")
+            return None
+        # Havuz işçilerinde giriş yapılamaz; CAPTCHA çıkarsa --workers 1 ile çalıştırın
+        print("[INFO] CAPTCHA algılandı. Lütfen CAPTCHA'yı manuel olarak çözün.")
+        solve_recaptcha_manually()
+
+    if extract == "network":
+        # Kaydırma ve insan benzeri hareketler yalnızca DOM'un doldurulması için gerekiyordu
+        return fetch_epic_catalog_data(driver, url, timings, payloads_folder)
+
+    games = fetch_epic_games_data(driver, timings, extract)
+    if games and record_folder:
+        fixtures.save_rendered(record_folder, url, driver.page_source)
+    # Kayıttan oynatmada bot tespiti yok; rastgele beklemeler yalnızca ölçümleri bozardı
+    if games and not fixture_base:
+        human_like_actions(driver)
+    return games
+
+def scrape_epic(csv_path=CSV_FILE, workers=1, rate=0.1, burst=1, pages=100, metrics="epic_page_metrics.csv",
+                extract="js", save_payloads=None, payloads=None, parquet=False, fixtures_folder=None, record=False,
+                resume=False, lean=False, keep_browser=False):
+    """
+    Epic Games Store sayfalarını tarar ve oyunları DataFrame olarak döndürür.
+    csv_path verilirse satırlar sayfa sayfa CSV'ye de yazılır (None: yalnızca bellekte);
+    parquet ise fiyatları çözülmüş tipli ara dosya da yazılır.
+    payloads verilirse tarayıcı açılmaz, kaydedilmiş katalog yanıtları okunur.
+    fixtures_folder verilirse sayfalar o kayıt arşivinden hız sınırı olmadan oynatılır (network
+    modunda arşivdeki katalog yanıtları okunur); record ise canlı sayfalar arşive kaydedilir.
+    resume ise CSV'nin devam kaydındaki son tamamlanan sayfadan devam edilir; kayıttaki başlıklar
+    (sıralama kaydığı için yeniden görünenler) tekrar yazılmaz. Boş gelen sayfada tarama durur ve
+    RuntimeError verilir; --resume o sayfayı yeniden dener.
+    lean ise hafif tarayıcı modu (lean_browser.py) kullanılır; keep_browser ise tek tarayıcılı
+    çalıştırmanın tarayıcısı bu süreçteki sonraki çağrılar için açık bırakılır.
+    """
     all_games = []
+    checkpoint = None
+    seen_titles = set()
 
-    clear_csv_file(CSV_FILE)
-    save_to_csv([], CSV_FILE, write_header=True)
+    if csv_path:
+        config = {"url": BASE_URL_TEMPLATE}
+        checkpoint = checkpoints.resume_checkpoint(csv_path, config) if resume else None
+        if checkpoint is None:
+            clear_csv_file(csv_path)
+            save_to_csv([], csv_path, write_header=True)
+            checkpoint = checkpoints.new_checkpoint(csv_path, config)
+        else:
+            all_games = pd.read_csv(csv_path, dtype=str, keep_default_na=False).to_dict("records")
+            seen_titles = set(checkpoint["seen"])
 
     print("[INFO] Veri çekme işlemi başlatılıyor...")
 
-    page_urls = generate_page_urls(total_pages=100)
+    first_page = checkpoint["pages"] if checkpoint else 0
+    all_urls = generate_page_urls(total_pages=pages)
+    # Sayfa numaraları 1'den başlar; oynatmada atlanan sayfalar olsa da her URL kendi numarasıyla kalır
+    page_numbers = [] if checkpoint and checkpoint["finished"] else list(range(first_page + 1, pages + 1))
+    replay = fixtures_folder and not record
+    if fixtures_folder:
+        catalog_folder = os.path.join(fixtures_folder, fixtures.EPIC_PAYLOADS_FOLDER)
+        if record:
+            save_payloads = save_payloads or catalog_folder
+        elif extract == "network":
+            payloads = catalog_folder
+        else:
+            # Kaydedilmemiş sayfalar boş yüklenip kart beklemesinde zaman aşımına uğrardı
+            page_numbers = [page_number for page_number in page_numbers
+                            if fixtures.has_response(fixtures_folder, all_urls[page_number - 1])]
+            rate = 0
+    page_urls = [all_urls[page_number - 1] for page_number in page_numbers]
 
-    try:
-        for idx, url in enumerate(page_urls):
-            print(f"[INFO] {idx + 1}. sayfa yükleniyor: {url}")
-            driver.get(url)
+    stopped = []
 
-            # Daha uzun rastgele bekleme süresi
-            time.sleep(random.uniform(8, 15))
+    def on_page(index, url, games):
+        # Sayfalar paralel çekilse de burada sırayla gelir
+        page_number = page_numbers[index]
+        print(f"[INFO] {page_number}. sayfa işlendi: {url}")
+        if games is None:
+            # Devam kaydı bu sayfadan önce kalır; --resume sayfayı yeniden dener
+            print(f"[ERROR] {page_number}. sayfa yüklenemedi.")
+            stopped.append(page_number)
+            return False
+        if not games:
+            print("[INFO] Sayfada oyun yok; katalog sonuna ulaşıldı.")
+            return False
 
-            if is_captcha_present(driver):
-                print("[INFO] CAPTCHA algılandı. Lütfen CAPTCHA'yı manuel olarak çözün.")
-                solve_recaptcha_manually()
+        games = [game for game in games if game["Oyun Adı"] not in seen_titles]
+        if csv_path:
+            save_to_csv(games, csv_path)
+            checkpoints.commit_page(checkpoint, page_number, [game["Oyun Adı"] for game in games])
+        all_games.extend(games)
+        print(f"[INFO] Toplam {len(all_games)} oyun kaydedildi.\n")
+        return True
 
-            games = fetch_epic_games_data(driver)
-            if not games:
-                print("[INFO] Veri bulunamadı veya işlem tamamlandı.")
+    if payloads:
+        # Kaydedilmiş yanıtlar üzerinde aynı ayrıştırma ve CSV yazımı (fixture ile deneme için)
+        saved = load_payloads(payloads)[first_page:] if page_numbers else []
+        page_numbers = list(range(first_page + 1, first_page + len(saved) + 1))
+        for index, (path, payload) in enumerate(saved):
+            if on_page(index, path, games_from_cards(parse_catalog_payload(payload))) is False:
                 break
+    else:
+        stub = fixtures.start_server(fixtures_folder) if replay else None
+        setup = partial(setup_driver, offline=bool(replay), lean=lean)
+        scrape = partial(scrape_page, extract=extract, payloads_folder=save_payloads,
+                         fixture_base=stub["base"] if stub else None,
+                         record_folder=fixtures_folder if record else None, lean=lean)
+        try:
+            run_pages(setup, scrape, page_urls, on_page, workers, rate, burst, metrics, keep_browser)
+        finally:
+            if stub:
+                fixtures.stop_server(stub)
+    if checkpoint and not stopped and not checkpoint["finished"]:
+        checkpoints.finish_checkpoint(checkpoint)
+    if stopped:
+        # Boru hattı aşamayı başarısız sayıp --resume ile yeniden denesin
+        raise RuntimeError(f"Epic taraması {stopped[0]}. sayfada yarıda kaldı.")
+    games = pd.DataFrame(all_games, columns=CSV_COLUMNS)
+    if parquet:
+        print(f"[INFO] Tipli ara dosya yazıldı -> {write_source(games, 'epic')}")
+    return games
 
-            save_to_csv(games, CSV_FILE)
-            all_games.extend(games)
-            print(f"[INFO] Toplam {len(all_games)} oyun kaydedildi.\n")
-
-            human_like_actions(driver)
+def main():
+    parser = argparse.ArgumentParser(description="Epic Games Store oyunlarını epic_games_results.csv'ye çeker")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel tarayıcı (süreç) sayısı")
+    parser.add_argument("--rate", type=float, default=0.1,
+                        help="Tarayıcı başına saniyede en fazla yüklenecek sayfa; havuzun toplamı workers x rate (0: sınırsız)")
+    parser.add_argument("--burst", type=int, default=1,
+                        help="Tarayıcı başına art arda beklemeden yüklenebilecek sayfa sayısı")
+    parser.add_argument("--pages", type=int, default=100, help="Taranacak sayfa sayısı")
+    parser.add_argument("--metrics", default="epic_page_metrics.csv",
+                        help="Sayfa başına süre ölçümlerinin yazılacağı CSV")
+    parser.add_argument("--extract", choices=EXTRACT_MODES, default="js",
+                        help="js: kartlar tek execute_script çağrısıyla okunur, elements: kart kart WebDriver çağrıları, "
+                             "network: mağazanın GraphQL katalog yanıtı okunur")
+    parser.add_argument("--save-payloads", default=None,
+                        help="network modunda yakalanan katalog yanıtlarının kaydedileceği klasör")
+    parser.add_argument("--payloads", default=None,
+                        help="Tarayıcı açmadan, kaydedilmiş catalog_*.json yanıtlarından CSV üretir")
+    parser.add_argument("--parquet", action="store_true", help="Fiyatları çözülmüş Parquet ara dosyası da yazar")
+    fixture_mode = parser.add_mutually_exclusive_group()
+    fixture_mode.add_argument("--record", metavar="ARŞİV", default=None,
+                              help="Render edilmiş sayfaları (network modunda katalog yanıtlarını) bu kayıt arşivine de yazar")
+    fixture_mode.add_argument("--replay", metavar="ARŞİV", default=None,
+                              help="Sayfaları siteye gitmeden bu kayıt arşivinden yükler")
+    parser.add_argument("--resume", action="store_true",
+                        help="Yarıda kalan çalıştırmaya epic_games_results.csv'nin devam kaydından devam eder")
+    parser.add_argument("--lean", action="store_true",
+                        help="Headless tarayıcı; görsel, yazı tipi, medya ve takip istekleri engellenir")
+    args = parser.parse_args()
 
+    try:
+        scrape_epic(CSV_FILE, args.workers, args.rate, args.burst, args.pages, args.metrics, args.extract,
+                    args.save_payloads, args.payloads, args.parquet, args.record or args.replay, bool(args.record),
+                    args.resume, args.lean)
     except Exception as e:
         print(f"[ERROR] Genel hata: {e}")
-    finally:
-        driver.quit()
-        print(f"[INFO] Tüm oyunlar kaydedildi -> {CSV_FILE}")
+        print(f"[INFO] O ana kadar çekilen oyunlar kaydedildi -> {CSV_FILE}; --resume ile devam edilebilir.")
+        sys.exit(1)
+    print(f"[INFO] Tüm oyunlar kaydedildi -> {CSV_FILE}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+import csv
+
+# Tarayıcıyla çekilen her sayfanın süresini aşamalara ayırıp CSV'ye yazar:
+# throttle (hız sınırı beklemesi), load (driver.get), wait (hazır olma koşulları),
+# extract (veri çıkarma), other (CAPTCHA, insan benzeri hareketler vb.). Yanına tarayıcının kendi
+# ölçtüğü değerler (lean_browser.read_page_stats) eklenir: page_load (load olayına kadar geçen süre),
+# requests (istek sayısı) ve kilobytes (ağdan aktarılan); --lean ile kazancı göstermek için.
+
+PHASES = ["throttle", "load", "wait", "extract", "other"]
+BROWSER_STATS = ["page_load", "requests", "kilobytes"]
+METRICS_HEADERS = ["page", "url", "worker", "items"] + PHASES + ["total"] + BROWSER_STATS
+
+
+def open_metrics(path):
+    """
+    Ölçüm dosyasını baştan oluşturur; path None ise ölçüm yazılmaz.
+    """
+    metrics = {
+        "path": path,
+        "totals": dict.fromkeys(PHASES + ["total"], 0.0),
+        "pages": 0,
+        "browser_totals": dict.fromkeys(BROWSER_STATS, 0.0),
+        "browser_pages": 0,
+    }
+    if path:
+        with open(path, mode="w", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerow(METRICS_HEADERS)
+    return metrics
+
+
+def record(metrics, index, url, timings, items):
+    """
+    Bir sayfanın süreleri; scrape fonksiyonunun ölçmediği süre "other" aşamasına yazılır.
+    """
+    total = timings.get("throttle", 0.0) + timings.get("elapsed", 0.0)
+    measured = sum(timings.get(phase, 0.0) for phase in PHASES if phase != "other")
+    values = {phase: timings.get(phase, 0.0) for phase in PHASES}
+    values["other"] = max(0.0, total - measured)
+    values["total"] = total
+
+    metrics["pages"] += 1
+    for name, value in values.items():
+        metrics["totals"][name] += value
+
+    # Tarayıcıdan okunamayan (hata veren) sayfalarda boş bırakılır
+    browser = ["", "", ""]
+    if timings.get("page_load") is not None and "bytes" in timings:
+        stats = {"page_load": timings["page_load"], "requests": timings["requests"], "kilobytes": timings["bytes"] / 1024}
+        metrics["browser_pages"] += 1
+        for name in BROWSER_STATS:
+            metrics["browser_totals"][name] += stats[name]
+        browser = [f"{stats['page_load']:.3f}", stats["requests"], f"{stats['kilobytes']:.1f}"]
+
+    if metrics["path"]:
+        with open(metrics["path"], mode="a", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerow(
+                [index + 1, url, timings.get("worker", 0), items] + [f"{values[name]:.3f}" for name in PHASES + ["total"]]
+                + browser
+            )
+
+
+def print_summary(metrics):
+    if not metrics["pages"]:
+        return
+    averages = ", ".join(
+        f"{name} {metrics['totals'][name] / metrics['pages']:.2f} s" for name in PHASES + ["total"]
+    )
+    print(f"[INFO] Sayfa başına ortalama ({metrics['pages']} sayfa): {averages}")
+    if metrics["browser_pages"]:
+        pages, totals = metrics["browser_pages"], metrics["browser_totals"]
+        print(
+            f"[INFO] Tarayıcı ölçümü ({pages} sayfa): yükleme {totals['page_load'] / pages:.2f} s, "
+            f"{totals['requests'] / pages:.0f} istek, {totals['kilobytes'] / pages:.0f} KB sayfa başına; "
+            f"toplam {totals['kilobytes'] / 1024:.1f} MB aktarıldı"
+        )
+    if metrics["path"]:
+        print(f"[INFO] Sayfa ölçümleri -> {metrics['path']}")
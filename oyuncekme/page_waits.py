@@ -0,0 +1,73 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Sabit time.sleep beklemeleri yerine sayfanın gerçekten hazır olduğunu gösteren koşullar.
+
+# Kart sayısının değişmeden kalması gereken süre; sonsuz kaydırma/geç render edilen kartlar için
+CARD_SETTLE = 0.75
+# Yeni kaynak isteği başlamadan geçmesi gereken süre
+NETWORK_IDLE = 0.5
+POLL_FREQUENCY = 0.25
+
+_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+_NETWORK_SCRIPT = (
+    "return [document.readyState, window.performance.getEntriesByType('resource').length];"
+)
+
+
+def _unchanged_for(state, value, settle):
+    """
+    value son değerle aynıysa ve settle saniyedir değişmediyse True döner.
+    """
+    now = time.monotonic()
+    if value != state.get("value"):
+        state["value"], state["since"] = value, now
+        return False
+    return now - state["since"] >= settle
+
+
+def wait_for_cards(driver, selector, timeout=15, settle=CARD_SETTLE):
+    """
+    selector ile eşleşen öğeler görünüp sayıları settle saniye sabit kalana kadar bekler ve sayıyı döndürür.
+    Süre dolarsa TimeoutException fırlatır.
+    """
+    state = {}
+
+    def settled(driver):
+        count = driver.execute_script(_COUNT_SCRIPT, selector)
+        return _unchanged_for(state, count, settle) and count > 0
+
+    WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(settled)
+    return state["value"]
+
+
+def loaded_without_cards(driver, selector):
+    """
+    Belge tamamen yüklendiği halde selector ile eşleşen hiç öğe yoksa True döner. wait_for_cards zaman
+    aşımından sonra listenin sonunu (boş sayfa) yüklenemeyen sayfadan ayırmak için kullanılır.
+    """
+    try:
+        ready_state = driver.execute_script("return document.readyState;")
+        return ready_state == "complete" and driver.execute_script(_COUNT_SCRIPT, selector) == 0
+    except Exception:
+        return False
+
+
+def wait_for_network_idle(driver, timeout=5, idle=NETWORK_IDLE):
+    """
+    Belge yüklenip yeni kaynak isteği (fiyat, görsel, API çağrısı) idle saniye başlamayana kadar bekler.
+    Reklam ve takip istekleri hiç durmayabileceğinden süre dolması hata sayılmaz; False döner.
+    """
+    state = {}
+
+    def idle_now(driver):
+        ready_state, resources = driver.execute_script(_NETWORK_SCRIPT)
+        return _unchanged_for(state, resources, idle) and ready_state == "complete"
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(idle_now)
+        return True
+    except TimeoutException:
+        return False
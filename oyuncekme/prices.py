@@ -0,0 +1,61 @@
+import re
+
+# Mağazalardan gelen fiyat metinlerini ("$27.99", "₺1.039,99", "Ücretsiz") sayıya çevirir
+
+FREE_PRICES = {"free", "ücretsiz"}
+CURRENCY_SYMBOLS = {"$": "USD", "₺": "TRY", "€": "EUR", "£": "GBP"}
+_NUMBER_PATTERN = re.compile(r"\d[\d.,]*\d|\d")
+_NON_DIGIT = re.compile(r"\D")
+
+
+def _parse_number(number):
+    """
+    Binlik ve ondalık ayırıcıları ayırt ederek sayıyı float'a çevirir.
+    Her iki ayırıcı varsa sondaki ondalıktır; tek ayırıcı tam 3 hane ayırıyorsa binliktir.
+    """
+    has_dot, has_comma = "." in number, "," in number
+    if has_dot and has_comma:
+        decimal = "." if number.rfind(".") > number.rfind(",") else ","
+    elif has_dot or has_comma:
+        separator = "." if has_dot else ","
+        groups = number.split(separator)
+        # "1.039" veya "1.234.567" binlik, "27.99" ve "67,00" ondalık
+        decimal = None if len(groups) > 2 or len(groups[-1]) == 3 else separator
+    else:
+        decimal = None
+
+    if decimal is None:
+        return float(_NON_DIGIT.sub("", number))
+    whole, fraction = number.rsplit(decimal, 1)
+    return float(f"{_NON_DIGIT.sub('', whole) or 0}.{fraction}")
+
+
+def parse_price(text):
+    """
+    Fiyat metnini (tutar, para birimi kodu) olarak döndürür.
+    Ücretsiz oyunlarda tutar 0'dır; çözümlenemeyen metinlerde tutar None döner.
+    """
+    if not isinstance(text, str):
+        return None, None
+    text = text.strip()
+    if text.lower() in FREE_PRICES:
+        return 0.0, None
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    match = _NUMBER_PATTERN.search(text)
+    if not match:
+        return None, currency
+    return _parse_number(match.group()), currency
+
+
+def price_amount(text):
+    """
+    Yalnızca tutarı döndürür (SQLite fonksiyonu ve vektörel kullanım için).
+    """
+    return parse_price(text)[0]
+
+
+def price_currency(text):
+    """
+    Yalnızca para birimi kodunu döndürür (SQLite fonksiyonu ve vektörel kullanım için).
+    """
+    return parse_price(text)[1]
@@ -0,0 +1,46 @@
+import multiprocessing
+import time
+
+# Tüm tarayıcıların sayfa yüklemelerini tek bir hız sınırından geçiren token bucket.
+# browser_pool, havuz kovasını işçi sayısıyla ölçekleyerek oluşturur (tarayıcı başına rate).
+# Jeton sayısı ve son güncelleme zamanı paylaşılan bellekte tutulur; böylece havuzdaki
+# süreçlerin toplamı rate (sayfa/saniye) değerini aşmaz, burst kadar sayfa art arda yüklenebilir.
+
+
+def create_bucket(rate, burst=1, context=None):
+    """
+    Saniyede rate jeton dolan, en fazla burst jeton tutan kova oluşturur. rate <= 0 ise sınır yoktur.
+    Havuz süreçleriyle paylaşılacaksa süreçleri başlatan context verilmelidir.
+    """
+    if rate <= 0:
+        return None
+    context = context or multiprocessing
+    burst = max(1, burst)
+    return {
+        "rate": rate,
+        "burst": burst,
+        "tokens": context.Value('d', float(burst)),
+        "updated": context.Value('d', time.monotonic()),
+    }
+
+
+def take(bucket):
+    """
+    Bir jeton alır, gerekirse dolmasını bekler; beklenen süreyi (saniye) döndürür.
+    """
+    if bucket is None:
+        return 0.0
+    tokens, updated = bucket["tokens"], bucket["updated"]
+    start = time.perf_counter()
+    while True:
+        with tokens.get_lock():
+            now = time.monotonic()
+            available = min(bucket["burst"], tokens.value + (now - updated.value) * bucket["rate"])
+            updated.value = now
+            if available >= 1:
+                tokens.value = available - 1
+                return time.perf_counter() - start
+            tokens.value = available
+            delay = (1 - available) / bucket["rate"]
+        # Kilit bırakıldıktan sonra uyunur; diğer süreçler de kendi sıralarını hesaplayabilir
+        time.sleep(delay)
@@ -1,5 +1,11 @@
+import argparse
+import time
+
 import pandas as pd
-from rapidfuzz import fuzz
+from intermediates import read_parquet, write_merged
+from match_cache import cached_fuzzy_match, config_hash, open_match_cache
+from matcher import build_match_index, find_best_match
+from normalization import normalize_title, normalize_titles
 
 # Dosya isimleri
 steam_file = "steamverisi.csv"
@@ -7,83 +13,222 @@ metacritic_file = "metacritic_games.csv"
 epic_file = "epic_games_results.csv"
 output_file = "merged_game_data.csv"
 
-# CSV'leri yükleme
-steam_data = pd.read_csv(steam_file)
-metacritic_data = pd.read_csv(metacritic_file)
-epic_data = pd.read_csv(epic_file)
-
-# Sütun isimlerini normalize etme
-steam_data.columns = ["oyun_adi", "steam_fiyati", "steam_url"]
-metacritic_data.columns = ["oyun_adi", "metascore", "metacritic_url"]
-epic_data.columns = ["oyun_adi", "epic_fiyati", "epic_url"]
-
-# Oyun adlarını normalize eden fonksiyon
-def normalize_name(name):
-    return name.strip().lower()
-
-steam_data["oyun_adi_norm"] = steam_data["oyun_adi"].apply(normalize_name)
-metacritic_data["oyun_adi_norm"] = metacritic_data["oyun_adi"].apply(normalize_name)
-epic_data["oyun_adi_norm"] = epic_data["oyun_adi"].apply(normalize_name)
-
-# RapidFuzz eşleşmesi için fonksiyon
-def find_best_match(target_name, candidates, threshold=90):
-    best_match = None
-    best_score = 0
-    for candidate in candidates:
-        score = fuzz.token_set_ratio(target_name, candidate)
-        if score > best_score:
-            best_score = score
-            best_match = candidate
-    return best_match if best_score >= threshold else None
-
-merged_data = []
-
-for _, steam_row in steam_data.iterrows():
-    steam_name = steam_row["oyun_adi_norm"]
-
-    # Metacritic eşleşmesi
-    metacritic_row = metacritic_data[metacritic_data["oyun_adi_norm"] == steam_name]
-    if not metacritic_row.empty:
-        metacritic_row = metacritic_row.iloc[0]
-    else:
-        # RapidFuzz devreye giriyor
-        metacritic_match_name = find_best_match(steam_name, metacritic_data["oyun_adi_norm"], threshold=90)
-        if metacritic_match_name:
-            metacritic_row = metacritic_data[metacritic_data["oyun_adi_norm"] == metacritic_match_name].iloc[0]
-        else:
-            metacritic_row = {"metascore": None, "metacritic_url": None}
-
-    # Epic Games eşleşmesi
-    epic_row = epic_data[epic_data["oyun_adi_norm"] == steam_name]
-    if not epic_row.empty:
-        epic_row = epic_row.iloc[0]
-    else:
-        # RapidFuzz devreye giriyor
-        epic_match_name = find_best_match(steam_name, epic_data["oyun_adi_norm"], threshold=90)
-        if epic_match_name:
-            epic_row = epic_data[epic_data["oyun_adi_norm"] == epic_match_name].iloc[0]
-        else:
-            epic_row = {"epic_fiyati": None, "epic_url": None}
-
-    # Fiyat ve URL ayarlamaları
-    steam_fiyat = steam_row["steam_fiyati"]
-    epic_fiyat = epic_row.get("epic_fiyati")
-
-    steam_url = steam_row["steam_url"] if steam_fiyat not in ["Free", "Ücretsiz", None] else None
-    epic_url = epic_row.get("epic_url") if epic_fiyat not in ["Free", "Ücretsiz", None] else None
-
-    # Birleştirilmiş veri
-    merged_data.append({
-        "oyun_adi": steam_row["oyun_adi"],
-        "steam_fiyati": None if steam_fiyat in ["Free", "Ücretsiz", None] else steam_fiyat,
-        "epic_fiyati": None if epic_fiyat in ["Free", "Ücretsiz", None] else epic_fiyat,
-        "metascore": metacritic_row.get("metascore"),
-        "steam_url": steam_url,
-        "epic_url": epic_url,
+# Ücretsiz oyunlarda fiyat ve URL boş bırakılır
+FREE_PRICES = ["Free", "Ücretsiz"]
+FUZZY_THRESHOLD = 90
+# Birleşik CSV'nin sütunları; Parquet'te bunlara fiyat tutarları ve para birimleri eklenir
+CSV_COLUMNS = ["oyun_adi", "steam_fiyati", "epic_fiyati", "metascore", "steam_url", "epic_url"]
+
+
+def like_csv(data):
+    """
+    Bellekteki kazıyıcı çıktısının sütun tiplerini CSV'den okunmuş haline eşitler ("85" -> 85);
+    böylece birleştirme ve veritabanı yüklemesi iki yolda da aynı değerleri görür.
+    """
+    data = data.copy()
+    for column in data.columns:
+        if data[column].dtype == object or pd.api.types.is_string_dtype(data[column]):
+            try:
+                data[column] = pd.to_numeric(data[column])
+            except (ValueError, TypeError):
+                pass
+    return data
+
+
+def read_parquet_source(source, prefix, csv_path=None):
+    """
+    Kazıyıcının Parquet ara dosyasından yalnızca birleştirmenin kullandığı sütunları okur;
+    fiyat tutarı ve para birimi kazıyıcıda çözüldüğü için yeniden ayrıştırılmaz.
+    Dosya yoksa veya kazıyıcının CSV'si (csv_path) ondan yeniyse None döner.
+    """
+    if source == "metacritic":
+        return read_parquet(source, ["oyun_adi", "metascore"], csv_path=csv_path)
+    data = read_parquet(source, ["oyun_adi", "fiyat", "url", "fiyat_tutar", "para_birimi"], csv_path=csv_path)
+    if data is None:
+        return None
+    return data.rename(columns={
+        "fiyat": f"{prefix}_fiyati", "url": f"{prefix}_url", "fiyat_tutar": f"{prefix}_fiyati_tutar",
+        "para_birimi": f"{prefix}_para_birimi",
     })
 
-# Sonuçları CSV'ye kaydet
-merged_df = pd.DataFrame(merged_data)
-merged_df.to_csv(output_file, index=False, na_rep="null")
 
-print(f"[INFO] Birleştirilmiş veriler {output_file} dosyasına kaydedildi.")
+def load_sources(steam_data=None, metacritic_data=None, epic_data=None, parquet=False):
+    """
+    Kazıyıcıların DataFrame'lerini (verilmeyenler için parquet ise Parquet, yoksa ya da CSV'den eskiyse
+    CSV dosyalarını) yükler ve sütun isimlerini normalize eder.
+    """
+    if parquet:
+        if steam_data is None:
+            steam_data = read_parquet_source("steam", "steam", steam_file)
+        if metacritic_data is None:
+            metacritic_data = read_parquet_source("metacritic", None, metacritic_file)
+        if epic_data is None:
+            epic_data = read_parquet_source("epic", "epic", epic_file)
+    loaded = []
+    for data, path, columns in (
+        (steam_data, steam_file, ["oyun_adi", "steam_fiyati", "steam_url"]),
+        (metacritic_data, metacritic_file, ["oyun_adi", "metascore", "metacritic_url"]),
+        (epic_data, epic_file, ["oyun_adi", "epic_fiyati", "epic_url"]),
+    ):
+        if data is None:
+            # oyuncekme.py --mode json dördüncü sütun olarak AppID yazar; birleştirme ilk üçünü kullanır
+            data = pd.read_csv(path, usecols=[0, 1, 2])
+        elif "oyun_adi" in data.columns:
+            # Parquet'ten okunan tipli veri zaten normalize isimlerle gelir
+            loaded.append(data)
+            continue
+        else:
+            data = like_csv(data.iloc[:, :3])
+        data.columns = columns
+        loaded.append(data)
+    return tuple(loaded)
+
+
+def scale_catalog(data, factor):
+    """
+    Benchmark için kataloğu isimlere ek getirerek factor katına büyütür.
+    """
+    if factor <= 1:
+        return data
+    copies = [data]
+    for copy_no in range(1, factor):
+        copy = data.copy()
+        copy["oyun_adi"] = copy["oyun_adi"] + f" {copy_no}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def timed_stage(stats, stage, rows, func, *args):
+    """
+    Bir aşamayı çalıştırır ve süresini stats listesine ekler.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    stats.append((stage, rows, time.perf_counter() - start))
+    return result
+
+
+def match_source(steam_names, source_data, value_columns, stats, label, cache=None):
+    """
+    Steam isimlerini kaynakla eşleştirir ve kaynak sütunlarını Steam sırasıyla döndürür.
+    Önce normalize isim üzerinden hash join yapılır, yalnızca eşleşmeyenler RapidFuzz'a gider.
+    cache verilirse bulanık eşleşmeler önceki çalıştırmadan yeniden kullanılır.
+    """
+    # Aynı isim birden fazla kez geçiyorsa ilk satır kullanılır
+    lookup = source_data.drop_duplicates("oyun_adi_norm").set_index("oyun_adi_norm")[value_columns]
+
+    exact_mask = timed_stage(stats, f"{label} birebir", len(steam_names), steam_names.isin, lookup.index)
+
+    # RapidFuzz devreye giriyor
+    unmatched = steam_names[~exact_mask]
+
+    def fuzzy_stage():
+        candidates = source_data["oyun_adi_norm"]
+        if cache is not None:
+            config_key = config_hash(FUZZY_THRESHOLD, normalize_title)
+            matches = cached_fuzzy_match(cache, label, unmatched, candidates, FUZZY_THRESHOLD, config_key)
+            return unmatched.map(matches)
+        index = build_match_index(candidates, threshold=FUZZY_THRESHOLD)
+        return unmatched.map(lambda name: find_best_match(name, index))
+
+    fuzzy_names = timed_stage(stats, f"{label} bulanık", len(unmatched), fuzzy_stage)
+
+    partner_names = steam_names.where(exact_mask, fuzzy_names)
+    return lookup.reindex(partner_names).reset_index(drop=True)
+
+
+def merge_sources(steam_data, metacritic_data, epic_data, stats, cache=None):
+    """
+    Steam satırlarına Metacritic puanını ve Epic fiyatını ekleyerek birleşik tabloyu üretir.
+    """
+    for data in (steam_data, metacritic_data, epic_data):
+        data["oyun_adi_norm"] = normalize_titles(data["oyun_adi"])
+
+    steam_names = steam_data["oyun_adi_norm"]
+    metacritic_match = match_source(steam_names, metacritic_data, ["metascore"], stats, "Metacritic", cache)
+    # Parquet kaynaklarında fiyat tutarı ve para birimi hazır gelir ve birleşik tabloya taşınır
+    epic_columns = [column for column in ["epic_fiyati", "epic_url", "epic_fiyati_tutar", "epic_para_birimi"]
+                    if column in epic_data.columns]
+    epic_match = match_source(steam_names, epic_data, epic_columns, stats, "Epic", cache)
+
+    def combine():
+        # Fiyat ve URL ayarlamaları
+        steam_free = steam_data["steam_fiyati"].isin(FREE_PRICES)
+        epic_free = epic_match["epic_fiyati"].isin(FREE_PRICES)
+        merged = pd.DataFrame({
+            "oyun_adi": steam_data["oyun_adi"],
+            "steam_fiyati": steam_data["steam_fiyati"].mask(steam_free),
+            "epic_fiyati": epic_match["epic_fiyati"].mask(epic_free),
+            "metascore": metacritic_match["metascore"],
+            "steam_url": steam_data["steam_url"].mask(steam_free),
+            "epic_url": epic_match["epic_url"].mask(epic_free),
+        })
+        if "steam_fiyati_tutar" in steam_data.columns:
+            merged["steam_fiyati_tutar"] = steam_data["steam_fiyati_tutar"].mask(steam_free)
+        if "epic_fiyati_tutar" in epic_match.columns:
+            merged["epic_fiyati_tutar"] = epic_match["epic_fiyati_tutar"].mask(epic_free)
+        if "steam_para_birimi" in steam_data.columns:
+            merged["steam_para_birimi"] = steam_data["steam_para_birimi"].astype(object).mask(steam_free)
+        if "epic_para_birimi" in epic_match.columns:
+            merged["epic_para_birimi"] = epic_match["epic_para_birimi"].astype(object).mask(epic_free)
+        return merged
+
+    return timed_stage(stats, "Birleştirme", len(steam_data), combine)
+
+
+def print_stats(stats):
+    """
+    Aşama başına satır/saniye raporunu yazdırır.
+    """
+    print("[BENCH] Aşama                 Satır     Süre (s)   Satır/s")
+    for stage, rows, elapsed in stats:
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        print(f"[BENCH] {stage:<20} {rows:>8} {elapsed:>10.3f} {rate:>11,.0f}")
+
+
+def merge_games(steam_data=None, metacritic_data=None, epic_data=None, output_path=output_file, use_cache=True,
+                parquet=False):
+    """
+    Birleştirme aşaması: kaynakları eşleştirip birleşik tabloyu döndürür.
+    output_path verilirse sonuç CSV'ye de yazılır (None: yalnızca bellekte). parquet ise kaynaklar
+    Parquet ara dosyalarından okunur ve sonuç merged_game_data.parquet olarak da yazılır.
+    """
+    sources = load_sources(steam_data, metacritic_data, epic_data, parquet)
+    cache = open_match_cache() if use_cache else None
+    try:
+        merged_df = merge_sources(*sources, [], cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if output_path:
+        # Sonuçları CSV'ye kaydet
+        merged_df[CSV_COLUMNS].to_csv(output_path, index=False, na_rep="null")
+        print(f"[INFO] Birleştirilmiş veriler {output_path} dosyasına kaydedildi.")
+    if parquet:
+        print(f"[INFO] Birleştirilmiş veriler {write_merged(merged_df)} dosyasına kaydedildi.")
+    return merged_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Steam, Metacritic ve Epic verilerini birleştirir")
+    parser.add_argument("--benchmark", action="store_true", help="Aşama başına satır/saniye raporu yazdırır, CSV yazmaz")
+    parser.add_argument("--scale", type=int, default=1, help="Benchmark için katalogları bu kat büyütür")
+    parser.add_argument("--no-cache", action="store_true", help="Eşleşme önbelleğini kullanmadan tüm isimleri yeniden eşleştirir")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Kaynakları Parquet ara dosyalarından okur, sonucu Parquet olarak da yazar")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        merge_games(use_cache=not args.no_cache, parquet=args.parquet)
+        return
+
+    # CSV'leri yükleme; benchmark ölçeklenmiş sahte isimlerle çalıştığı için önbelleğe dokunmaz
+    sources = [scale_catalog(data, args.scale) for data in load_sources(parquet=args.parquet)]
+    stats = []
+    merge_sources(*sources, stats)
+    print_stats(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from dlc_cache import app_id_from_url
+
+try:
+    import lxml.html
+except ImportError:  # lxml yoksa yalnızca ilgili etiketleri ayrıştıran BeautifulSoup yolu kullanılır
+    lxml = None
+
+# Steam arama ve oyun sayfaları için ayrıştırıcılar.
+# Varsayılan yol lxml ile yalnızca sonuç satırlarına ve satın alma alanına bakar; *_bs4 fonksiyonları
+# eski tam BeautifulSoup yaklaşımıdır ve karşılaştırma (benchmark_parsing.py) için tutulur.
+
+DLC_MARKER = "game_area_dlc_bubble"
+DLC_BUBBLE_CLASS = "game_area_bubble game_area_dlc_bubble"
+
+
+def _class_pattern(name):
+    # Ayrıştırma sırasında class özniteliği bölünmemiş metin olarak gelir ("search_result_row ds_collapse_flag")
+    return re.compile(rf"(^|\s){name}(\s|$)")
+
+
+_SEARCH_ROWS = SoupStrainer('a', class_=_class_pattern('search_result_row'))
+_PURCHASE_AREA = SoupStrainer('div', class_=_class_pattern('game_area_purchase'))
+
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+_ROWS_XPATH = f'//a[{_has_class("search_result_row")}]'
+_TITLE_XPATH = f'.//span[{_has_class("title")}]'
+_PRICE_XPATH = f'.//div[{_has_class("discount_final_price")}]'
+_DLC_XPATH = (
+    f'(//div[{_has_class("game_area_purchase")}])[1]'
+    f'//div[normalize-space(@class) = "{DLC_BUBBLE_CLASS}"]'
+)
+
+
+def _row(title, price, url, ds_app_id, with_app_id):
+    """
+    Tek bir sonuç satırını filtreler: ücretsiz ve fiyatı olmayan oyunlarda None döner.
+    with_app_id verilirse satıra uygulama kimliği eklenir (paket/bundle satırlarında boş).
+    """
+    # Ücretsiz Oyunları Hariç Tutma
+    if price.lower() == "ücretsiz":
+        return None
+    # Fiyatın Geçerli Olduğunu Kontrol Etme
+    if price == "Fiyat Bilgisi Yok":
+        return None
+    if not with_app_id:
+        return [title, price, url]
+    # Paketlerde data-ds-appid virgülle ayrılmış birden fazla kimlik içerir
+    app_id = ds_app_id if ds_app_id and ds_app_id.isdigit() else app_id_from_url(url)
+    return [title, price, url, app_id or ""]
+
+
+def _html_tree(content):
+    try:
+        return lxml.html.fromstring(content)
+    except ValueError:
+        # XML kodlama bildirimi içeren metinler bayt olarak ayrıştırılmalı
+        return lxml.html.fromstring(content.encode('utf-8'))
+
+
+def parse_search_page_bs4(content, strainer=None, with_app_id=False):
+    """
+    Arama sayfasındaki sonuç sayısını ve oyunları (başlık, fiyat, URL) sayfa sırasıyla döndürür.
+    Ücretsiz ve fiyatı olmayan oyunlar atlanır; yinelenen kontrolü çağırana bırakılır.
+    """
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+    search_results = soup.find_all('a', class_='search_result_row')
+    rows = []
+    for game in search_results:
+        # Başlık
+        title_tag = game.find('span', class_='title')
+        title = title_tag.text.strip() if title_tag else "Başlık Bulunamadı"
+
+        # Güncel Fiyat
+        price_tag = game.find('div', class_='discount_final_price')
+        price = price_tag.text.strip() if price_tag else "Fiyat Bilgisi Yok"
+
+        # URL
+        url = game['href'] if game.has_attr('href') else "URL Bulunamadı"
+        row = _row(title, price, url, game.get('data-ds-appid'), with_app_id)
+        if row:
+            rows.append(row)
+    return len(search_results), rows
+
+
+def is_dlc_page_bs4(content, strainer=None):
+    """Oyun sayfası HTML'inde DLC etiketi olup olmadığını döndürür."""
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+    purchase_area = soup.find('div', class_='game_area_purchase')
+    return bool(purchase_area and purchase_area.find('div', class_=DLC_BUBBLE_CLASS))
+
+
+def parse_search_page(content, with_app_id=False):
+    """
+    parse_search_page_bs4 ile aynı sonucu lxml ile, yalnızca sonuç satırlarını gezerek üretir.
+    """
+    if lxml is None:
+        return parse_search_page_bs4(content, _SEARCH_ROWS, with_app_id)
+    if not content.strip():
+        # Liste sonunda JSON modu boş results_html döner; lxml boş belgede hata verir
+        return 0, []
+    search_results = _html_tree(content).xpath(_ROWS_XPATH)
+    rows = []
+    for game in search_results:
+        title_tags = game.xpath(_TITLE_XPATH)
+        title = title_tags[0].text_content().strip() if title_tags else "Başlık Bulunamadı"
+        price_tags = game.xpath(_PRICE_XPATH)
+        price = price_tags[0].text_content().strip() if price_tags else "Fiyat Bilgisi Yok"
+        row = _row(title, price, game.get('href', "URL Bulunamadı"), game.get('data-ds-appid'), with_app_id)
+        if row:
+            rows.append(row)
+    return len(search_results), rows
+
+
+def is_dlc_page(content):
+    """
+    is_dlc_page_bs4 ile aynı sonucu verir. DLC etiketinin sınıf adı sayfada hiç geçmiyorsa
+    (oyunların çoğu) ayrıştırma yapılmaz; geçiyorsa yalnızca satın alma alanı aranır.
+    """
+    if DLC_MARKER not in content:
+        return False
+    if lxml is None:
+        return is_dlc_page_bs4(content, _PURCHASE_AREA)
+    return bool(_html_tree(content).xpath(_DLC_XPATH))
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+
+import catalog_snapshots
+
+# Statik katalog dosyaları: yalnızca değişen sayfalar yeniden yazılır, önceki manifestin dosyaları korunur.
+
+GAMES = [
+    ("Halo 3", "$27.99", "₺1.039,99", 94, "s1", "e1", 27.99, 1039.99),
+    ("Portal", "$9.99", None, 90, "s2", None, 9.99, None),
+    ("Celeste", "$19.99", "₺199,99", 92, "s3", "e3", 19.99, 199.99),
+    ("Hades", None, "₺249,99", 93, None, "e4", None, 249.99),
+    ("Tetris", "$4.99", None, None, "s5", None, 4.99, None),
+]
+
+
+def _connect(games=GAMES, metascore_type="INTEGER"):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        f"CREATE TABLE games (oyun_adi TEXT PRIMARY KEY, steam_fiyati TEXT, epic_fiyati TEXT, "
+        f"metascore {metascore_type}, steam_url TEXT, epic_url TEXT, steam_fiyati_tutar REAL, epic_fiyati_tutar REAL)"
+    )
+    conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", games)
+    return conn
+
+
+def _files(folder):
+    return set(os.listdir(folder)) - {catalog_snapshots.MANIFEST_FILE}
+
+
+def test_second_export_rewrites_only_changed_pages(tmp_path):
+    folder = str(tmp_path / "catalog")
+    conn = _connect()
+    first = catalog_snapshots.export_snapshots(conn, folder, page_size=2)
+    # Katalog + 3 görünüm x 3 sayfa
+    assert (first["written"], first["unchanged"]) == (10, 0)
+    first_manifest = catalog_snapshots.load_manifest(folder)
+    first_files = _files(folder)
+
+    # Yalnızca Tetris'in Steam fiyatı değişir: Steam'de ilk, metascore ve Epic görünümlerinde son sayfada
+    conn.execute("UPDATE games SET steam_fiyati = '$5.99', steam_fiyati_tutar = 5.99 WHERE oyun_adi = 'Tetris'")
+    second = catalog_snapshots.export_snapshots(conn, folder, page_size=2)
+    second_manifest = catalog_snapshots.load_manifest(folder)
+    changed = [
+        (view, page)
+        for view in catalog_snapshots.VIEWS
+        for page, name in enumerate(second_manifest["views"][view]["pages"])
+        if name != first_manifest["views"][view]["pages"][page]
+    ]
+    assert changed == [("metascore", 2), ("steam_price", 0), ("epic_price", 2)]
+    assert second["written"] == 1 + len(changed)
+    assert second["unchanged"] == 10 - second["written"]
+    assert second_manifest["catalog"]["hash"] != first_manifest["catalog"]["hash"]
+    # Eski manifesti okumuş istemciler için önceki kuşak silinmez
+    assert second["removed"] == 0
+    assert first_files <= _files(folder)
+
+    # Üçüncü yükleme: değişiklik yok, ilk kuşağın artık kimsenin göstermediği dosyaları silinir
+    third = catalog_snapshots.export_snapshots(conn, folder, page_size=2)
+    assert (third["written"], third["unchanged"]) == (0, 10)
+    assert catalog_snapshots.load_manifest(folder) == second_manifest
+    assert _files(folder) <= catalog_snapshots.manifest_files(second_manifest)
+    assert third["removed"] == len(first_files - _files(folder)) > 0
+
+
+def test_remove_stale_keeps_listed_and_foreign_files(tmp_path):
+    folder = tmp_path / "catalog"
+    folder.mkdir()
+    for name in ["catalog.aaa.json", "catalog.aaa.json.gz", "catalog.bbb.json", "catalog.bbb.json.br",
+                 catalog_snapshots.MANIFEST_FILE, "README.txt"]:
+        (folder / name).write_text("{}")
+    removed = catalog_snapshots._remove_stale(str(folder), {"catalog.aaa.json", "catalog.aaa.json.gz"})
+    assert removed == 2
+    assert set(os.listdir(folder)) == {"catalog.aaa.json", "catalog.aaa.json.gz",
+                                       catalog_snapshots.MANIFEST_FILE, "README.txt"}
+
+
+def test_real_and_integer_metascore_export_the_same_files(tmp_path):
+    # CSV yolu metascore'u REAL (94.0), Parquet yolu INTEGER (94) olarak yükler
+    real_games = [game[:3] + (float(game[3]) if game[3] is not None else None,) + game[4:] for game in GAMES]
+    real = catalog_snapshots.export_snapshots(_connect(real_games, "REAL"), str(tmp_path / "csv"), page_size=2)
+    integer = catalog_snapshots.export_snapshots(_connect(), str(tmp_path / "parquet"), page_size=2)
+    assert real["bytes"] == integer["bytes"]
+    manifests = [catalog_snapshots.load_manifest(str(tmp_path / name)) for name in ("csv", "parquet")]
+    assert manifests[0]["catalog"] == manifests[1]["catalog"]
+    assert manifests[0]["views"] == manifests[1]["views"]
+    with open(tmp_path / "csv" / manifests[0]["catalog"]["path"], encoding="utf-8") as file:
+        assert json.load(file)[0]["Metascore"] == 94
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+import checkpoints
+import fixtures
+
+# Devam kaydı (checkpoints.py) ve kazıyıcıların --resume davranışı; Selenium kazıyıcılarında tarayıcı
+# yerine sayfa sonuçlarını doğrudan veren sahte run_pages kullanılır.
+
+CONFIG = {"url": "https://example.com/?page={page_number}"}
+
+
+def _csv(tmp_path, text="ad,fiyat\n"):
+    path = tmp_path / "games.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_resume_truncates_to_last_committed_page(tmp_path):
+    path = _csv(tmp_path)
+    checkpoint = checkpoints.new_checkpoint(path, CONFIG, cursor=0)
+    _append(path, "A,1\nB,2\n")
+    checkpoints.commit_page(checkpoint, 1, ["A", "B"], cursor=40)
+    # Çökme anında yarım yazılmış sonraki sayfa
+    _append(path, "C,3\nD,")
+
+    resumed = checkpoints.resume_checkpoint(path, CONFIG)
+    assert (resumed["pages"], resumed["seen"], resumed["cursor"]) == (1, ["A", "B"], 40)
+    assert not resumed["finished"]
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == "ad,fiyat\nA,1\nB,2\n"
+
+
+def test_resume_rejects_changed_config_or_short_csv(tmp_path):
+    path = _csv(tmp_path)
+    checkpoint = checkpoints.new_checkpoint(path, CONFIG)
+    _append(path, "A,1\n")
+    checkpoints.commit_page(checkpoint, 1, ["A"])
+    assert checkpoints.resume_checkpoint(path, {"url": "https://example.com/other"}) is None
+
+    # CSV devam kaydından sonra başka bir çalıştırmayla yeniden yazılmış
+    _csv(tmp_path)
+    assert checkpoints.resume_checkpoint(path, CONFIG) is None
+
+
+def test_finished_checkpoint_is_kept_on_resume(tmp_path):
+    path = _csv(tmp_path)
+    checkpoint = checkpoints.new_checkpoint(path, CONFIG)
+    _append(path, "A,1\n")
+    checkpoints.commit_page(checkpoint, 1, ["A"])
+    checkpoints.finish_checkpoint(checkpoint)
+
+    resumed = checkpoints.resume_checkpoint(path, CONFIG)
+    assert resumed["finished"] and resumed["pages"] == 1
+    with open(checkpoints.checkpoint_path(path), encoding="utf-8") as file:
+        assert json.load(file)["finished"]
+
+
+def _fake_run_pages(results):
+    # results: sayfa URL'si -> oyun listesi (None: sayfa yüklenemedi)
+    def run_pages(setup, scrape, urls, on_page, *args, **kwargs):
+        for index, url in enumerate(urls):
+            if on_page(index, url, results(url)) is False:
+                return
+    return run_pages
+
+
+def _metacritic_games(url):
+    page = url.rsplit("=", 1)[1]
+    return [{"Game Name": f"Oyun {page}-{n}", "Metascore": "80", "Image URL": "x"} for n in range(2)]
+
+
+def test_metacritic_retries_failed_pages_on_resume(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    import metacritic
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(metacritic, "chromedriver_path", __file__)
+    kwargs = {"images_folder": None, "pages": 3, "metrics": None}
+
+    failing = {metacritic.base_url.format(page_number=2)}
+    monkeypatch.setattr(metacritic, "run_pages",
+                        _fake_run_pages(lambda url: None if url in failing else _metacritic_games(url)))
+    with pytest.raises(RuntimeError):
+        metacritic.scrape_metacritic(**kwargs)
+    checkpoint = checkpoints.resume_checkpoint(metacritic.file_name, {"url": metacritic.base_url})
+    assert (checkpoint["pages"], checkpoint["failed_pages"], checkpoint["finished"]) == (3, [2], False)
+
+    # Yeniden denemede de alınamayan sayfa listede kalır
+    with pytest.raises(RuntimeError):
+        metacritic.scrape_metacritic(resume=True, **kwargs)
+
+    failing.clear()
+    games = metacritic.scrape_metacritic(resume=True, **kwargs)
+    assert sorted(games["Game Name"]) == [f"Oyun {page}-{n}" for page in (1, 2, 3) for n in range(2)]
+    checkpoint = checkpoints.resume_checkpoint(metacritic.file_name, {"url": metacritic.base_url})
+    assert (checkpoint["failed_pages"], checkpoint["finished"]) == ([], True)
+
+
+def test_epic_replay_keeps_page_numbers_of_recorded_pages(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    import oyuncekmeepic
+
+    monkeypatch.chdir(tmp_path)
+    archive = str(tmp_path / "archive")
+    urls = oyuncekmeepic.generate_page_urls(total_pages=4)
+    # 2. sayfa kaydedilmemiş; oynatmada atlanır
+    for url in (urls[0], urls[2]):
+        fixtures.save_rendered(archive, url, "<html></html>")
+    committed = []
+    monkeypatch.setattr(oyuncekmeepic, "run_pages", _fake_run_pages(
+        lambda url: [{"Oyun Adı": f"Oyun {urls.index(url) + 1}", "Fiyat": "₺1,00", "URL": url}]))
+    monkeypatch.setattr(oyuncekmeepic.checkpoints, "commit_page",
+                        lambda checkpoint, pages, *args, **kwargs: committed.append(pages))
+
+    games = oyuncekmeepic.scrape_epic(pages=4, metrics=None, fixtures_folder=archive)
+    assert games["Oyun Adı"].tolist() == ["Oyun 1", "Oyun 3"]
+    assert committed == [1, 3]
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import databasecreater
+from intermediates import PARQUET_FILES, write_merged
+
+# Birleşik tablonun yüklenmesi: fiyat metninden türetilen tutar ve para birimi sütunları.
+
+MERGED = pd.DataFrame({
+    "oyun_adi": ["Halo 3", "Only Steam", "Free Game"],
+    "steam_fiyati": ["$27.99", "$9.99", None],
+    "epic_fiyati": ["₺1.039,99", None, None],
+    "metascore": [94, None, 80],
+    "steam_url": ["s1", "s2", None],
+    "epic_url": ["e1", None, None],
+})
+
+
+def _games(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT oyun_adi, steam_fiyati_tutar, steam_para_birimi, epic_fiyati_tutar, epic_para_birimi "
+            "FROM games ORDER BY oyun_adi"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_currency_is_stored_next_to_the_amount(tmp_path):
+    db_path = str(tmp_path / "game_data.db")
+    counts = databasecreater.load_database(MERGED, db_path, snapshots=None)
+    # İki fiyatı da boş olan oyun yüklenmez
+    assert counts["inserted"] == 2
+    assert _games(db_path) == [
+        ("Halo 3", 27.99, "USD", 1039.99, "TRY"),
+        ("Only Steam", 9.99, "USD", None, None),
+    ]
+
+
+def test_old_schema_gets_currency_columns(tmp_path):
+    db_path = str(tmp_path / "game_data.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE games (oyun_adi TEXT PRIMARY KEY, steam_fiyati TEXT, epic_fiyati TEXT, metascore REAL, "
+        "steam_url TEXT, epic_url TEXT, steam_fiyati_tutar REAL, epic_fiyati_tutar REAL)"
+    )
+    conn.execute("INSERT INTO games VALUES ('Halo 3', '$27.99', '₺1.039,99', 94, 's1', 'e1', 27.99, 1039.99)")
+    conn.commit()
+    conn.close()
+
+    conn = databasecreater.connect(db_path)
+    databasecreater.ensure_schema(conn)
+    conn.close()
+    assert _games(db_path) == [("Halo 3", 27.99, "USD", 1039.99, "TRY")]
+
+
+def test_stale_parquet_falls_back_to_csv(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    # Birleştirme --parquet olmadan yeniden çalıştırıldı: Parquet eski fiyatı taşıyor
+    monkeypatch.chdir(tmp_path)
+    write_merged(MERGED.assign(steam_fiyati=["$1.00", "$1.00", None]))
+    MERGED.to_csv(databasecreater.csv_file, index=False)
+    parquet_time = os.path.getmtime(PARQUET_FILES["merged"])
+    os.utime(databasecreater.csv_file, (parquet_time + 10, parquet_time + 10))
+    databasecreater.load_database(db_path="game_data.db", parquet=True, snapshots=None)
+    assert _games("game_data.db")[0] == ("Halo 3", 27.99, "USD", 1039.99, "TRY")
+
+    # Parquet yeniyse o okunur
+    os.utime(databasecreater.csv_file, (parquet_time - 10, parquet_time - 10))
+    databasecreater.load_database(db_path="game_data.db", parquet=True, snapshots=None)
+    assert _games("game_data.db")[0] == ("Halo 3", 1.0, "USD", 1039.99, "TRY")
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import fixtures
+import http_client
+
+# Uyarlanır eşzamanlılık sınırı (AIMD), Retry-After ve yeniden deneme yolu; istekler kayıt arşivinin
+# yerel sunucusuna (fixtures.py) gider.
+
+URL = "https://store.steampowered.com/api/test"
+
+
+def _with_client(coroutine, **kwargs):
+    async def run():
+        client = http_client.create_client(**kwargs)
+        try:
+            return await coroutine(client)
+        finally:
+            await http_client.close_client(client)
+    return asyncio.run(run())
+
+
+async def _request(client, congested, latency=0.1):
+    await http_client._acquire(client)
+    await http_client._release(client, congested, latency)
+    return client
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(http_client, "MAX_RETRIES", 1)
+
+
+@pytest.fixture
+def stub(tmp_path):
+    folder = str(tmp_path / "archive")
+    server = fixtures.start_server(folder)
+    yield {"folder": folder, "url": fixtures.target_url(server["base"], URL)}
+    fixtures.stop_server(server)
+
+
+def test_slow_start_then_additive_increase():
+    async def run(client):
+        await _request(client, False)
+        # Yavaş başlangıçta her başarı sınırı bir artırır
+        assert client["limit"] == 5
+        await _request(client, True)
+        assert client["limit"] == 2.5 and not client["slow_start"]
+        # Sonrasında her "sınır" kadar başarıda bir
+        await _request(client, False)
+        assert client["limit"] == pytest.approx(2.5 + 1 / 2.5)
+        # En iyi yanıt süresinin SLOW_FACTOR katından yavaş yanıt sınırı artırmaz
+        await _request(client, False, latency=0.1 * http_client.SLOW_FACTOR + 1)
+        assert client["limit"] == pytest.approx(2.5 + 1 / 2.5)
+        return client
+
+    client = _with_client(run, initial=4)
+    assert client["in_flight"] == 0
+    assert len(client["completed"]) == 4
+
+
+def test_congestion_halves_once_per_interval():
+    async def run(client):
+        await _request(client, True)
+        await _request(client, True)
+        assert client["limit"] == 8
+        client["last_decrease"] -= http_client.DECREASE_INTERVAL + 0.1
+        await _request(client, True)
+        assert client["limit"] == 4
+        for _ in range(5):
+            client["last_decrease"] -= http_client.DECREASE_INTERVAL + 0.1
+            await _request(client, True)
+        return client
+
+    assert _with_client(run, initial=16)["limit"] == http_client.MIN_CONCURRENCY
+
+
+def test_cancelled_release_only_frees_the_slot():
+    async def run(client):
+        await _request(client, None)
+        return client
+
+    client = _with_client(run, initial=4)
+    assert client["in_flight"] == 0
+    assert client["limit"] == 4 and client["slow_start"]
+    assert not client["completed"]
+
+
+def test_retry_after_seconds_and_http_date():
+    assert http_client.retry_delay({"Retry-After": "5"}, 0) == 5
+    assert http_client.retry_delay({"Retry-After": "-3"}, 0) == 0
+    assert http_client.retry_delay({"Retry-After": "3600"}, 0) == http_client.MAX_BACKOFF
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+    assert 18 <= http_client.retry_delay({"Retry-After": date}, 0) <= 20
+
+
+def test_retry_delay_without_retry_after_backs_off(monkeypatch):
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    assert http_client.retry_delay({}, 0) == http_client.BACKOFF_BASE
+    assert http_client.retry_delay({"Retry-After": "yarın"}, 2) == http_client.BACKOFF_BASE * 4
+    assert http_client.retry_delay(None, 10) == http_client.MAX_BACKOFF
+
+
+def test_fetch_retries_until_success(stub, fast_retries, monkeypatch):
+    fixtures.save_response(stub["folder"], URL, 503, "text/html", "Service Unavailable")
+
+    def recover(headers, attempt):
+        # Sunucu ilk denemeden sonra düzelir
+        fixtures.save_response(stub["folder"], URL, 200, "application/json", '{"ok": 1}')
+        return 0
+
+    monkeypatch.setattr(http_client, "retry_delay", recover)
+
+    async def run(client):
+        return await http_client.fetch(client, stub["url"]), client
+
+    (status, _, body), client = _with_client(run)
+    assert (status, body) == (200, '{"ok": 1}')
+    assert client["stats"] == {"requests": 2, "throttled": 0, "errors": 1, "retries": 1, "failed": 0}
+    assert client["in_flight"] == 0
+
+
+def test_throttled_fetch_pauses_all_requests(stub, fast_retries):
+    fixtures.save_response(stub["folder"], URL, 429, "text/html", "Too Many Requests")
+
+    async def run(client):
+        started = time.monotonic()
+        return await http_client.fetch(client, stub["url"]), client, started
+
+    (status, _, body), client, started = _with_client(run)
+    # Denemeler tükenince son durum kodu döner; bekleme süresince yeni istek açılmaz
+    assert (status, body) == (429, None)
+    assert client["paused_until"] > started
+    assert client["stats"] == {"requests": 2, "throttled": 2, "errors": 0, "retries": 1, "failed": 1}
+    assert client["limit"] == http_client.INITIAL_CONCURRENCY * http_client.DECREASE_FACTOR
+
+
+def test_cancelled_fetch_releases_its_slot():
+    async def run(client):
+        # Bağlantıyı kabul edip hiç yanıt vermeyen sunucu
+        server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        task = asyncio.create_task(http_client.fetch(client, f"http://127.0.0.1:{port}/"))
+        await asyncio.sleep(0.2)
+        assert client["in_flight"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        server.close()
+        return client
+
+    client = _with_client(run, initial=4)
+    assert client["in_flight"] == 0
+    assert client["limit"] == 4
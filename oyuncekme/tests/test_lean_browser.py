@@ -0,0 +1,59 @@
+import json
+
+from lean_browser import read_network_log, read_page_stats
+
+# Sayfa baytlarının performans günlüğünden sayılması; tarayıcı yerine günlük kayıtlarını veren sahte sürücü.
+
+
+def _entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeDriver:
+    def __init__(self, logs, page_stats):
+        self.logs = logs
+        self.page_stats = page_stats
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries, self.logs = self.logs, []
+        return entries
+
+    def execute_script(self, script):
+        return dict(self.page_stats)
+
+
+class NoLogDriver(FakeDriver):
+    def get_log(self, log_type):
+        raise RuntimeError("log type 'performance' not found")
+
+
+RESOURCE_TIMING = {"bytes": 300, "requests": 3, "page_load": 1.5}
+
+
+def test_bytes_come_from_encoded_data_length():
+    driver = FakeDriver([
+        _entry("Network.responseReceived", requestId="1"),
+        _entry("Network.loadingFinished", requestId="1", encodedDataLength=1000),
+        # Resource Timing'de 0 görünen farklı kökenli CDN yanıtı
+        _entry("Network.loadingFinished", requestId="2", encodedDataLength=5000),
+    ], RESOURCE_TIMING)
+    assert read_page_stats(driver) == {"bytes": 6000, "requests": 3, "page_load": 1.5}
+    # Sonraki sayfa yalnızca kendi baytlarını sayar
+    driver.logs = [_entry("Network.loadingFinished", requestId="3", encodedDataLength=10)]
+    assert read_page_stats(driver)["bytes"] == 10
+
+
+def test_events_read_by_other_consumers_are_still_counted():
+    driver = FakeDriver([
+        _entry("Network.responseReceived", requestId="1"),
+        _entry("Network.loadingFinished", requestId="1", encodedDataLength=2048),
+    ], RESOURCE_TIMING)
+    # Epic network modu günlüğü sayfa ölçümünden önce okur
+    methods = [method for method, _ in read_network_log(driver)]
+    assert methods == ["Network.responseReceived", "Network.loadingFinished"]
+    assert read_page_stats(driver)["bytes"] == 2048
+
+
+def test_without_performance_log_resource_timing_is_kept():
+    assert read_page_stats(NoLogDriver([], RESOURCE_TIMING)) == RESOURCE_TIMING
@@ -0,0 +1,62 @@
+import os
+import subprocess
+
+import main
+
+# Aşama çalıştırıcısının başarısız denemeleri nasıl saydığı.
+
+
+def _stage(resumable=True):
+    return {"name": "epic", "script": "oyuncekmeepic.py", "resumable": resumable}
+
+
+def test_nonzero_exit_is_retried_with_resume(monkeypatch):
+    monkeypatch.setattr(main, "RETRY_DELAY", 0)
+    calls = []
+
+    def call(stage, resume):
+        calls.append(resume)
+        if len(calls) == 1:
+            # Kazıyıcı tarama yarıda kaldığında sıfırdan farklı kodla çıkar
+            raise subprocess.CalledProcessError(1, [stage["script"]])
+        return "ok"
+
+    ok, result, attempts, _ = main.run_stage(_stage(), retries=2, call=call)
+    assert (ok, result, attempts) == (True, "ok", 2)
+    assert calls == [False, True]
+
+
+def test_unfinished_scrape_in_process_fails_the_stage(monkeypatch):
+    monkeypatch.setattr(main, "RETRY_DELAY", 0)
+
+    def call(stage, resume):
+        raise RuntimeError("Epic taraması 3. sayfada yarıda kaldı.")
+
+    ok, result, attempts, _ = main.run_stage(_stage(), retries=1, call=call)
+    assert (ok, result, attempts) == (False, None, 2)
+
+
+def test_stage_inputs_include_every_local_module():
+    metacritic = next(stage for stage in main.STAGES if stage["name"] == "metacritic")
+    inputs, outputs = main.stage_files(metacritic, parquet=True)
+    # Dolaylı içe aktarılanlar da (browser_pool -> rate_limit) sayılır; kurulu paketler sayılmaz
+    assert {"metacritic.py", "browser_pool.py", "rate_limit.py", "thumbnails.py", "image_store.py"} <= set(inputs)
+    assert "pandas.py" not in inputs
+    assert outputs == ["metacritic_games.csv", "metacritic_games.parquet"]
+
+
+def test_changed_helper_module_makes_stage_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "base_dir", str(tmp_path))
+    (tmp_path / "scraper.py").write_text("import os\nfrom helper import run\n")
+    (tmp_path / "helper.py").write_text("def run():\n    pass\n")
+    (tmp_path / "out.csv").write_text("a\n")
+    stage = {"name": "scraper", "script": "scraper.py", "inputs": [], "outputs": ["out.csv"],
+             "parquet_inputs": [], "parquet_outputs": ["out.parquet"], "max_age_hours": None}
+    state = {"scraper": {"ok": True, "finished_at": 0}}
+    os.utime(tmp_path / "helper.py", (1000, 1000))
+    os.utime(tmp_path / "scraper.py", (1000, 1000))
+    assert main.is_fresh(stage, state)
+    # --parquet ile ara dosya da çıktıdır; yoksa aşama taze sayılmaz
+    assert not main.is_fresh(stage, state, parquet=True)
+    os.utime(tmp_path / "helper.py")
+    assert not main.is_fresh(stage, state)
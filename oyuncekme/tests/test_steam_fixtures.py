@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+from urllib.parse import urlencode
+
+import pytest
+
+import benchmark_pipeline
+import dlc_cache
+import fixtures
+import http_client
+import oyuncekme
+from steam_parsing import parse_search_page
+
+# Steam JSON modu, kayıt arşivine (fixtures.py) elle yazılmış yanıtlar ve yerel sunucu üzerinden sınanır.
+
+SEARCH_HTML = """
+<a href="https://store.steampowered.com/app/10/Game/" class="search_result_row ds_collapse_flag" data-ds-appid="10">
+  <span class="title">Game</span><div class="discount_final_price">$9.99</div></a>
+<a href="https://store.steampowered.com/app/20/Game_Soundtrack/" class="search_result_row" data-ds-appid="20">
+  <span class="title">Game Soundtrack</span><div class="discount_final_price">$1.99</div></a>
+<a href="https://store.steampowered.com/app/30/Unreachable/" class="search_result_row" data-ds-appid="30">
+  <span class="title">Unreachable</span><div class="discount_final_price">$4.99</div></a>
+<a href="https://store.steampowered.com/app/40/Free/" class="search_result_row" data-ds-appid="40">
+  <span class="title">Free</span><div class="discount_final_price">Ücretsiz</div></a>
+<a href="https://store.steampowered.com/bundle/50/Game_Bundle/" class="search_result_row" data-ds-appid="10,20">
+  <span class="title">Game Bundle</span><div class="discount_final_price">$10.99</div></a>
+"""
+
+GAME_ROW = ["Game", "$9.99", "https://store.steampowered.com/app/10/Game/", "10"]
+DLC_ROW = ["Game Soundtrack", "$1.99", "https://store.steampowered.com/app/20/Game_Soundtrack/", "20"]
+UNREACHABLE_ROW = ["Unreachable", "$4.99", "https://store.steampowered.com/app/30/Unreachable/", "30"]
+BUNDLE_ROW = ["Game Bundle", "$10.99", "https://store.steampowered.com/bundle/50/Game_Bundle/", ""]
+
+
+def _search_url(start):
+    query = {**oyuncekme.params, "start": start, "infinite": 1}
+    return f"{oyuncekme.json_search_url}?{urlencode(query)}"
+
+
+def _appdetails_url(app_id):
+    query = {"appids": app_id, "filters": "basic", "cc": oyuncekme.params["cc"]}
+    return f"{oyuncekme.appdetails_url}?{urlencode(query)}"
+
+
+def _save_json(folder, url, data, status=200):
+    fixtures.save_response(folder, url, status, "application/json", json.dumps(data))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    folder = str(tmp_path / "archive")
+    _save_json(folder, _search_url(0), {"success": 1, "results_html": SEARCH_HTML, "total_count": 5})
+    _save_json(folder, _search_url(oyuncekme.params["count"]), {"success": 1, "results_html": "", "total_count": 5})
+    _save_json(folder, _appdetails_url("10"), {"10": {"success": True, "data": {"type": "game"}}})
+    _save_json(folder, _appdetails_url("20"), {"20": {"success": True, "data": {"type": "dlc"}}})
+    # Yeniden denemelere rağmen alınamayan appdetails
+    fixtures.save_response(folder, _appdetails_url("30"), 503, "text/html", "Service Unavailable")
+    return folder
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(http_client, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(http_client, "MAX_RETRIES", 1)
+
+
+@pytest.fixture
+def stub(archive, monkeypatch, fast_retries):
+    server = fixtures.start_server(archive)
+    monkeypatch.setattr(oyuncekme, "fixture_base", server["base"])
+    monkeypatch.setattr(oyuncekme, "fetch_mode", "json")
+    yield server
+    fixtures.stop_server(server)
+
+
+def _with_client(coroutine):
+    async def run():
+        client = http_client.create_client()
+        try:
+            return await coroutine(client)
+        finally:
+            await http_client.close_client(client)
+    return asyncio.run(run())
+
+
+def test_search_results_html_is_parsed(stub):
+    status, content = _with_client(lambda client: oyuncekme.fetch_page(client, 0))
+    assert status == 200
+    result_count, rows = parse_search_page(content, with_app_id=True)
+    # Ücretsiz oyun sayılır ama satır olarak dönmez; paketin uygulama kimliği boş kalır
+    assert result_count == 5
+    assert rows == [GAME_ROW, DLC_ROW, UNREACHABLE_ROW, BUNDLE_ROW]
+
+
+def test_appdetails_type_filters_dlc(stub):
+    cache = dlc_cache.open_dlc_cache(":memory:")
+    stats = dlc_cache.new_stats()
+
+    async def check(client):
+        return [await oyuncekme.check_dlc_json(client, row, cache, stats) for row in (GAME_ROW, DLC_ROW, BUNDLE_ROW)]
+
+    assert _with_client(check) == [False, True, False]
+    assert dlc_cache.get_entry(cache, "20")["is_dlc"]
+    assert stats["misses"] == 2 and stats["uncached"] == 1
+
+
+def test_failed_appdetails_is_unverified_and_not_cached(stub):
+    cache = dlc_cache.open_dlc_cache(":memory:")
+    stats = dlc_cache.new_stats()
+    result = _with_client(lambda client: oyuncekme.check_dlc_json(client, UNREACHABLE_ROW, cache, stats))
+    assert result is None
+    assert dlc_cache.get_entry(cache, "30") is None
+
+
+def test_json_replay_writes_only_verified_games(archive, fast_retries, capsys):
+    games = oyuncekme.scrape_steam(mode="json", csv_path=None, fixtures_folder=archive)
+    assert games.values.tolist() == [GAME_ROW, BUNDLE_ROW]
+    assert "1 satırın DLC olup olmadığı doğrulanamadı" in capsys.readouterr().out
+
+
+def test_unreachable_search_page_fails_the_run(archive, fast_retries):
+    # Listenin sonu yerine alınamayan sayfa: tarama yarıda kalır, boru hattı aşamayı yeniden dener
+    fixtures.save_response(archive, _search_url(oyuncekme.params["count"]), 503, "text/html", "Service Unavailable")
+    with pytest.raises(RuntimeError):
+        oyuncekme.scrape_steam(mode="json", csv_path=None, fixtures_folder=archive)
+
+
+def test_replay_uses_recorded_game_count(archive, fast_retries, monkeypatch):
+    # Kayıt --games 1 ile yapıldıysa sonraki arama sayfası arşivde yoktur; oynatma oraya gitmemeli
+    monkeypatch.setattr(oyuncekme, "total_games", oyuncekme.total_games)
+    os.remove(fixtures.fixture_path(archive, _search_url(oyuncekme.params["count"])))
+    fixtures.save_run_settings(archive, "steam", {"games": 1, "mode": "json"})
+    kwargs = benchmark_pipeline.scrape_kwargs("steam", archive)
+    assert kwargs == {"fixtures_folder": archive, "games": 1, "mode": "json"}
+    games = oyuncekme.scrape_steam(csv_path=None, **kwargs)
+    assert games.values.tolist() == [GAME_ROW]
@@ -0,0 +1,156 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+from image_store import load_manifest, save_manifest
+
+# İndirilen kapaklardan sabit genişlikte küçük resimler ve WebP sürümleri üretir.
+# Türevler kaynak nesnenin özetine göre adlandırılır; yalnızca yeni veya değişen görseller işlenir.
+
+images_folder = "gorseller"
+THUMBNAILS_DIR = "thumbs"
+THUMBNAIL_WIDTHS = [160, 320, 640]
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+# Türev üretim ayarları değişirse tüm görseller yeniden işlenir
+VARIANTS_VERSION = 1
+
+
+def variant_path(digest, width, fmt):
+    """
+    Türevin görsel klasörüne göre yolunu döndürür (ör. thumbs/ab/ab12...ef-320.webp).
+    width None ise orijinal boyuttaki sürümdür.
+    """
+    suffix = "" if width is None else f"-{width}"
+    ext = "webp" if fmt == "WEBP" else "jpg"
+    return f"{THUMBNAILS_DIR}/{digest[:2]}/{digest}{suffix}.{ext}"
+
+
+def _save_atomic(image, folder_path, relative_path, fmt):
+    """
+    Türevi geçici dosyaya kaydedip yerine taşır ve bayt boyutunu döndürür.
+    """
+    final_path = os.path.join(folder_path, relative_path)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(final_path), suffix=".part")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if fmt == "WEBP":
+                image.save(f, "WEBP", quality=WEBP_QUALITY, method=6)
+            else:
+                image.save(f, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        # mkstemp dosyayı yalnızca sahibine açar; mağazayı sunan kullanıcı da okuyabilmeli
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return os.path.getsize(final_path)
+
+
+def render_variants(folder_path, relative_path, digest):
+    """
+    Tek bir kaynak görselin türevlerini üretir (işçi süreçte çalışır).
+    (genişlik, yükseklik, türev listesi) döndürür. Kaynaktan geniş küçük resim üretilmez.
+    """
+    with Image.open(os.path.join(folder_path, relative_path)) as source:
+        image = ImageOps.exif_transpose(source)
+        # WebP/JPEG için tek tip renk modu; saydamlık beyaz zemine oturtulur
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        width, height = image.size
+
+        variants = []
+        size = _save_atomic(image, folder_path, variant_path(digest, None, "WEBP"), "WEBP")
+        variants.append({"width": width, "height": height, "format": "webp",
+                         "path": variant_path(digest, None, "WEBP"), "size": size})
+        for target_width in THUMBNAIL_WIDTHS:
+            if target_width >= width:
+                break
+            target_height = max(1, round(height * target_width / width))
+            thumbnail = image.resize((target_width, target_height), Image.LANCZOS)
+            for fmt in ("WEBP", "JPEG"):
+                path = variant_path(digest, target_width, fmt)
+                variants.append({"width": target_width, "height": target_height, "format": fmt.lower(),
+                                 "path": path, "size": _save_atomic(thumbnail, folder_path, path, fmt)})
+    return width, height, variants
+
+
+def _is_current(folder_path, entry):
+    variants = entry.get("variants")
+    return (
+        entry.get("variants_version") == VARIANTS_VERSION
+        and entry.get("variants_source") == entry["hash"]
+        and variants is not None
+        and all(os.path.exists(os.path.join(folder_path, variant["path"])) for variant in variants)
+    )
+
+
+def generate_thumbnails(folder_path, max_workers=None):
+    """
+    Manifestteki görsellerden türevleri eksik olanları süreç havuzunda işler.
+    Aynı içeriği paylaşan görseller tek kez işlenir. Sayaçları sözlük olarak döndürür.
+    """
+    manifest = load_manifest(folder_path)
+    pending = {}
+    counts = {"processed": 0, "skipped": 0, "failed": 0, "source_bytes": 0, "webp_bytes": 0}
+    for name, entry in manifest["images"].items():
+        if _is_current(folder_path, entry):
+            counts["skipped"] += 1
+        else:
+            pending.setdefault(entry["hash"], (entry["path"], []))[1].append(name)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            digest: executor.submit(render_variants, folder_path, relative_path, digest)
+            for digest, (relative_path, _) in pending.items()
+        }
+        for digest, future in futures.items():
+            relative_path, names = pending[digest]
+            try:
+                width, height, variants = future.result()
+            except Exception as e:
+                print(f"Küçük resim üretilemedi ({relative_path}): {e}")
+                counts["failed"] += len(names)
+                continue
+            for name in names:
+                manifest["images"][name].update({
+                    "width": width, "height": height, "variants": variants,
+                    "variants_source": digest, "variants_version": VARIANTS_VERSION,
+                })
+            counts["processed"] += len(names)
+            counts["source_bytes"] += manifest["images"][names[0]]["size"]
+            counts["webp_bytes"] += variants[0]["size"]
+
+    save_manifest(folder_path, manifest)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kapak görsellerinden küçük resim ve WebP sürümleri üretir")
+    parser.add_argument("--folder", default=images_folder, help="Görsel klasörü")
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate_thumbnails(args.folder, args.workers)
+    elapsed = time.perf_counter() - start
+    saved = counts["source_bytes"] - counts["webp_bytes"]
+    print(
+        f"[INFO] {counts['processed']} görsel işlendi, {counts['skipped']} zaten güncel, "
+        f"{counts['failed']} başarısız - {elapsed:.1f} s. Tam boy WebP kazancı: {saved / 1024:.0f} KB."
+    )
+
+
+if __name__ == "__main__":
+    main()